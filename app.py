@@ -1,10 +1,19 @@
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
 import streamlit as st
 from azure_config import azure_config
-from document_uploader import document_uploader, get_blob_files
 
-# DocumentUploader import
+# DocumentUploader import (업로드는 백그라운드 작업 큐로 처리)
 try:
+    from content_store import load_processing_results
     from document_uploader import document_uploader, get_blob_files
+    from job_queue import (
+        FINISHED_STATES,
+        JOB_STAGES,
+        ensure_worker_running,
+        job_queue,
+    )
 
     UPLOADER_AVAILABLE = True
 except ImportError:
@@ -12,7 +21,13 @@ except ImportError:
 
 # DocumentProcessor import
 try:
+    from conversation import Conversation
     from document_processor import document_processor
+    from faq_store import faq_store
+    from keyword_index import keyword_index
+    from prompts import prompt_cache_stats
+    from rate_limiter import openai_rate_limiter
+    from search_schema import build_search_filter, chunk_count
 
     PROCESSOR_AVAILABLE = True
 except ImportError:
@@ -123,6 +138,92 @@ if "processed_files" not in st.session_state:
     st.session_state.processed_files = []
 if "integrated_tech_guide" not in st.session_state:
     st.session_state.integrated_tech_guide = None
+if "guide_engine" not in st.session_state and PROCESSOR_AVAILABLE:
+    from tech_guide import IncrementalTechGuide
+
+    st.session_state.guide_engine = IncrementalTechGuide(document_processor)
+
+
+def new_chat_log():
+    """화면 표시용 최근 대화 (프롬프트에는 요약 + 최근 대화만 사용, 오래된 항목은 밀려남)"""
+    return deque(maxlen=azure_config.chat_log_limit)
+
+
+def new_conversation():
+    """멀티턴 대화 상태 생성"""
+    return Conversation(
+        history_token_budget=azure_config.chat_history_token_budget,
+        recent_turns=azure_config.chat_recent_turns,
+    )
+
+
+if PROCESSOR_AVAILABLE and "conversation" not in st.session_state:
+    st.session_state.conversation = new_conversation()
+    st.session_state.chat_log = new_chat_log()
+
+
+def add_processed_result(result):
+    """완료된 작업 결과를 세션 처리 목록과 가이드 대기 목록에 반영"""
+    if any(
+        f.document_id == result.document_id
+        for f in st.session_state.processed_files
+    ):
+        return
+    st.session_state.processed_files.append(result)
+    # 가이드는 초기화하지 않고 다음 갱신 때 병합
+    if PROCESSOR_AVAILABLE:
+        st.session_state.guide_engine.add_document(result)
+
+
+def render_job_status():
+    """작업 진행 상태 표시 (완료된 작업은 처리 결과로 옮김)"""
+    jobs = job_queue.get_jobs(st.session_state.job_ids)
+    if not jobs:
+        return
+
+    st.markdown("**⏳ 처리 현황**")
+    completed = False
+    for job in jobs:
+        if job["status"] == "done":
+            add_processed_result(job["result"])
+            st.session_state.job_ids.remove(job["id"])
+            completed = True
+        elif job["status"] == "failed":
+            st.markdown(
+                f"""
+            <div class="warning-info">
+                <strong>⚠️ {job['file_name']} 처리 실패</strong><br>
+                {job['error']}
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+        else:
+            stage = JOB_STAGES.index(job["status"])
+            st.progress(
+                stage / (len(JOB_STAGES) - 1),
+                text=f"📄 {job['file_name']}: {job['message']}",
+            )
+
+    if completed:
+        st.rerun(scope="app")
+
+
+# 새로고침 후에도 작업을 이어서 볼 수 있도록 세션 ID를 URL에 보관
+if "session_id" not in st.session_state:
+    st.session_state.session_id = st.query_params.get("session") or uuid.uuid4().hex
+    st.query_params["session"] = st.session_state.session_id
+    st.session_state.job_ids = []
+    session_jobs = (
+        job_queue.get_session_jobs(st.session_state.session_id)
+        if UPLOADER_AVAILABLE
+        else []
+    )
+    for job in session_jobs:
+        if job["status"] == "done":
+            add_processed_result(job["result"])
+        else:
+            st.session_state.job_ids.append(job["id"])
 
 # 메인 헤더
 st.markdown(
@@ -164,39 +265,27 @@ with col1:
 
                 if UPLOADER_AVAILABLE:
                     if st.button(f"처리하기", key=f"upload_{i}"):
-                        with st.spinner("파일 처리 중..."):
-                            result = document_uploader.process_single_file(file)
-
-                            if result["success"]:
-                                st.session_state.processed_files.append(result)
-
-                                st.markdown(
-                                    f"""
-                                <div class="success-info">
-                                    <strong>✅ 처리 완료</strong><br>
-                                    문서 ID: <code>{result['document_id']}</code><br>
-                                    텍스트 길이: {len(result['extracted_text'])}자<br>
-                                    <a href="{result['blob_url']}" target="_blank">🔗 파일 보기</a>
-                                </div>
-                                """,
-                                    unsafe_allow_html=True,
-                                )
-
-                                st.session_state.integrated_tech_guide = None
-                                st.rerun()
-                            else:
-                                st.markdown(
-                                    f"""
-                                <div class="warning-info">
-                                    <strong>⚠️ 처리 실패</strong><br>
-                                    {result['error']}
-                                </div>
-                                """,
-                                    unsafe_allow_html=True,
-                                )
+                        # 백그라운드 작업으로 등록하고 즉시 반환
+                        job_id = job_queue.enqueue(file, st.session_state.session_id)
+                        st.session_state.job_ids.append(job_id)
+                        ensure_worker_running()
+                        st.rerun()
                 else:
                     st.warning("DocumentUploader 모듈이 필요합니다.")
 
+    # 처리 현황 (백그라운드 작업 진행 상태 폴링)
+    if UPLOADER_AVAILABLE:
+        active_jobs = [
+            job
+            for job in job_queue.get_jobs(st.session_state.job_ids)
+            if job["status"] not in FINISHED_STATES
+        ]
+        if active_jobs:
+            ensure_worker_running()
+            st.fragment(run_every=2)(render_job_status)()
+        elif st.session_state.job_ids:
+            render_job_status()
+
 with col2:
     st.markdown(
         '<div class="section-header">📊 문서 요약 & 통합 기술 가이드</div>',
@@ -208,10 +297,12 @@ with col2:
         st.subheader("📄 개별 문서 요약")
 
         for file_result in st.session_state.processed_files:
-            if file_result.get("success") and "processing_results" in file_result:
-                with st.expander(f"📄 {file_result['file_name']} 요약", expanded=False):
-                    if "summary" in file_result["processing_results"]:
-                        summary_result = file_result["processing_results"]["summary"]
+            if file_result.success and file_result.analysis_key:
+                with st.expander(f"📄 {file_result.file_name} 요약", expanded=False):
+                    # 분석 결과는 세션이 아닌 저장소에서 필요할 때만 읽음
+                    processing_results = load_processing_results(file_result)
+                    if "summary" in processing_results:
+                        summary_result = processing_results["summary"]
                         if summary_result.get("success"):
                             # Streamlit 기본 컨테이너 사용
                             with st.container():
@@ -223,33 +314,44 @@ with col2:
                                 f"요약 생성 실패: {summary_result.get('error', '알 수 없는 오류')}"
                             )
 
-                    if "indexing" in file_result["processing_results"]:
-                        index_result = file_result["processing_results"]["indexing"]
+                    if "indexing" in processing_results:
+                        index_result = processing_results["indexing"]
                         if index_result.get("success"):
+                            duplicate_info = (
+                                f", 다른 문서와 중복 {index_result['duplicate_chunks']}개"
+                                if index_result.get("duplicate_chunks")
+                                else ""
+                            )
                             st.success(
-                                f"✅ AI Search 인덱싱 완료 ({index_result['indexed_chunks']}개 청크)"
+                                f"✅ AI Search 인덱싱 완료 ({index_result['indexed_chunks']}개 청크{duplicate_info})"
                             )
                         else:
                             st.error(
                                 f"인덱싱 실패: {index_result.get('error', '알 수 없는 오류')}"
                             )
 
-            elif file_result.get("processing_error"):
-                st.warning(f"⚠️ {file_result['file_name']}: 분석 중 오류 발생")
+            elif file_result.processing_error:
+                st.warning(f"⚠️ {file_result.file_name}: 분석 중 오류 발생")
 
         # 통합 기술 가이드 섹션
         #    st.subheader("🚀 통합 기술 학습 가이드")
 
+        pending_count = (
+            st.session_state.guide_engine.pending_count if PROCESSOR_AVAILABLE else 0
+        )
+        if st.session_state.integrated_tech_guide and pending_count:
+            guide_btn_label = f"통합 기술 가이드 업데이트 (새 문서 {pending_count}개)"
+        else:
+            guide_btn_label = "통합 기술 가이드 생성"
+
         generate_guide_btn = st.button(
-            "통합 기술 가이드 생성", type="primary", use_container_width=True
+            guide_btn_label, type="primary", use_container_width=True
         )
 
         if generate_guide_btn and PROCESSOR_AVAILABLE:
             with st.spinner("통합 기술 가이드를 생성하고 있습니다..."):
                 try:
-                    guide_result = document_processor.generate_integrated_tech_guide(
-                        st.session_state.processed_files
-                    )
+                    guide_result = st.session_state.guide_engine.update()
 
                     if guide_result["success"]:
                         st.session_state.integrated_tech_guide = guide_result
@@ -278,6 +380,27 @@ with col2:
                 )
                 st.write(f"• 발견된 기술 키워드: **{guide_data['total_keywords']}**")
 
+        if PROCESSOR_AVAILABLE:
+            # 기술별 문서 찾기 (LLM 호출 없이 키워드 인덱스 조회)
+            with st.expander("🔎 기술별 문서 찾기"):
+                keyword_query = st.text_input(
+                    "기술명을 입력하세요:", placeholder="예: Kafka", key="keyword_query"
+                )
+                if keyword_query:
+                    matches = keyword_index.lookup(keyword_query)
+                    if matches:
+                        for match in matches:
+                            chunk_info = (
+                                f", 청크 {', '.join(str(c) for c in match['chunks'])}"
+                                if match["chunks"]
+                                else ""
+                            )
+                            st.write(
+                                f"• **{match['file_name']}** ({match['mentions']}회 언급{chunk_info})"
+                            )
+                    else:
+                        st.info("해당 기술을 언급한 문서가 없습니다.")
+
     else:
         st.info("먼저 왼쪽에서 문서를 업로드하고 처리해주세요.")
 
@@ -289,7 +412,57 @@ with col3:
     elif not st.session_state.processed_files:
         st.info("먼저 문서를 업로드하고 처리해주세요.")
     else:
-        # 질문 입력
+        # 이전 대화
+        for exchange in st.session_state.chat_log:
+            with st.chat_message("user"):
+                st.write(exchange["question"])
+            with st.chat_message("assistant"):
+                st.markdown(exchange["answer"])
+
+        if st.session_state.chat_log and st.button(
+            "🧹 대화 초기화", use_container_width=True
+        ):
+            st.session_state.conversation = new_conversation()
+            st.session_state.chat_log = new_chat_log()
+            st.rerun()
+
+        # 검색 범위 (선택한 문서/파일 형식/업로드 기간으로 한정)
+        scoped_files = [f for f in st.session_state.processed_files if f.success]
+        with st.expander("🎯 검색 범위"):
+            selected_ids = st.multiselect(
+                "문서",
+                options=[f.document_id for f in scoped_files],
+                format_func=lambda document_id: next(
+                    f.file_name for f in scoped_files if f.document_id == document_id
+                ),
+                placeholder="전체 문서",
+                key="scope_documents",
+            )
+            selected_types = st.multiselect(
+                "파일 형식",
+                options=sorted({f.file_type for f in scoped_files}),
+                placeholder="전체 형식",
+                key="scope_file_types",
+            )
+            upload_window = st.selectbox(
+                "업로드 기간",
+                options=[None, 1, 7, 30],
+                format_func=lambda days: "전체 기간" if days is None else f"최근 {days}일",
+                key="scope_days",
+            )
+
+        selected_files = [f for f in scoped_files if f.document_id in selected_ids]
+        search_filter = build_search_filter(
+            azure_config.search_schema,
+            document_ids=[f.document_id for f in selected_files],
+            chunk_counts=[chunk_count(f.text_length) for f in selected_files],
+            file_types=selected_types,
+            modified_after=datetime.now(timezone.utc) - timedelta(days=upload_window)
+            if upload_window
+            else None,
+        )
+
+        # 질문 입력 (이전 대화를 참고하는 후속 질문 가능)
         user_question = st.text_input(
             "질문을 입력하세요:",
             placeholder="예: 서버 아키텍처 구조는?",
@@ -298,14 +471,50 @@ with col3:
 
         ask_button = st.button("질문하기", type="primary", use_container_width=True)
 
+        # 수집 시 미리 생성한 프로젝트 FAQ
+        faq_answers = faq_store.list_answers(azure_config.project_name)
+        if faq_answers:
+            with st.expander(f"❓ 자주 묻는 질문 ({len(faq_answers)}개)"):
+                for entry in faq_answers:
+                    st.markdown(f"**Q. {entry['question']}**")
+                    st.markdown(entry["answer"])
+                    st.divider()
+
         # 질문 처리
         if ask_button and user_question:
             with st.spinner("AI가 답변을 생성하고 있습니다..."):
                 try:
-                    answer_result = document_processor.answer_question(user_question)
+                    # 미리 생성한 FAQ에 같은 질문이 있으면 바로 답변 (검색 범위를 정하면 제외)
+                    faq_answer = None
+                    if search_filter is None:
+                        faq_answer = faq_store.lookup(
+                            azure_config.project_name, user_question
+                        )
+                    if faq_answer:
+                        answer_result = dict(
+                            faq_answer, success=True, search_results=[]
+                        )
+                        st.session_state.conversation.add_turn(
+                            user_question, faq_answer["answer"]
+                        )
+                    else:
+                        answer_result = document_processor.chat(
+                            st.session_state.conversation,
+                            user_question,
+                            search_filter=search_filter,
+                        )
 
                     if answer_result["success"]:
+                        st.session_state.chat_log.append(
+                            {"question": user_question, "answer": answer_result["answer"]}
+                        )
                         st.subheader("🤖 AI 답변")
+                        if faq_answer:
+                            st.caption(
+                                f"⚡ 미리 생성된 FAQ 답변 (질문: {faq_answer['question']})"
+                            )
+                        elif answer_result.get("standalone_query", user_question) != user_question:
+                            st.caption(f"🔎 검색 질의: {answer_result['standalone_query']}")
                         # Streamlit 기본 컨테이너 사용
                         with st.container():
                             # st.markdown("---")  # 구분선
@@ -325,13 +534,18 @@ with col3:
                                     answer_result["search_results"]
                                 ):
                                     st.write(
-                                        f"**{i+1}. {result['file_name']} (점수: {result['score']:.2f})**"
-                                    )
-                                    st.write(
-                                        result["content"][:300] + "..."
-                                        if len(result["content"]) > 300
-                                        else result["content"]
+                                        f"**{i+1}. {result.file_name} (점수: {result.score:.2f})**"
                                     )
+                                    # 스니펫 모드면 하이라이트, 아니면 본문 앞부분 표시
+                                    preview = result.snippet
+                                    if preview is None:
+                                        content = result.content or ""
+                                        preview = (
+                                            content[:300] + "..."
+                                            if len(content) > 300
+                                            else content
+                                        )
+                                    st.write(preview or "(미리보기 없음)")
                                     st.divider()
                     else:
                         st.error(f"답변 생성 실패: {answer_result['error']}")
@@ -342,6 +556,28 @@ with col3:
         elif ask_button and not user_question:
             st.warning("질문을 입력해주세요!")
 
+# Azure OpenAI 호출 제한 현황 (이 프로세스의 질의응답/가이드 호출 기준)
+if PROCESSOR_AVAILABLE:
+    with st.expander("⚙️ Azure OpenAI 호출 현황"):
+        metrics = openai_rate_limiter.get_metrics()
+        metric_cols = st.columns(4)
+        metric_cols[0].metric("대기열", f"{metrics['queue_depth']}개")
+        metric_cols[1].metric("평균 대기", f"{metrics['avg_wait_seconds']:.2f}초")
+        metric_cols[2].metric("p95 대기", f"{metrics['p95_wait_seconds']:.2f}초")
+        metric_cols[3].metric("429 응답", f"{metrics['throttled_429']}회")
+        st.caption(
+            f"할당량: {azure_config.openai_tokens_per_minute:,} TPM / "
+            f"{azure_config.openai_requests_per_minute:,} RPM · "
+            f"호출 {metrics['acquired']}회, 재시도 {metrics['retries']}회"
+        )
+        cache_metrics = prompt_cache_stats.get_metrics()
+        if cache_metrics["calls"]:
+            st.caption(
+                f"프롬프트 캐시: 입력 토큰 {cache_metrics['prompt_tokens']:,}개 중 "
+                f"{cache_metrics['cached_tokens']:,}개 캐시 적중 "
+                f"({cache_metrics['cached_ratio']:.0%})"
+            )
+
 # 푸터
 st.markdown("<br>", unsafe_allow_html=True)
 st.markdown(
@@ -0,0 +1,775 @@
+# async_document_processor.py
+import asyncio
+import json
+from azure.core.exceptions import HttpResponseError
+from azure_config import azure_config
+from chunk_dedup import DEDUP_OFF, DEDUP_SKIP, chunk_deduplicator
+from context_builder import build_context, estimate_tokens
+from faq_store import DEFAULT_FAQ_QUESTIONS, faq_store, group_similar_questions
+from keyword_index import keyword_index
+from prompts import (
+    analysis_messages,
+    answer_messages,
+    faq_question_messages,
+    history_summary_messages,
+    keyword_messages,
+    prompt_cache_stats,
+    rewrite_messages,
+    summary_messages,
+)
+from rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    call_with_rate_limit_async,
+    openai_rate_limiter,
+)
+from records import SearchHit
+from reranker import default_reranker, rerank_results
+from search_schema import (
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    SNIPPET_SELECT_FIELDS,
+    build_index_documents,
+    content_fields,
+    select_fields,
+)
+
+# 스니펫 결과 본문을 한 번에 동시 조회할 청크 수
+HYDRATE_BATCH_SIZE = 3
+
+
+class AsyncDocumentProcessor:
+    """비동기 Azure 클라이언트(OpenAI, AI Search) 기반 문서 처리기
+
+    하나의 이벤트 루프에서 수백 개의 LLM/검색 호출을 동시에 처리할 수 있다.
+    클라이언트는 처음 사용하는 이벤트 루프에서 생성되므로 인스턴스는 루프별로 만든다.
+    """
+
+    def __init__(self):
+        self._search_client = None
+        self._openai_client = None
+        self.deployment_name = azure_config.openai_deployment_name
+        self.combined_analysis_enabled = azure_config.combined_analysis_enabled
+        self.context_token_budget = azure_config.answer_context_token_budget
+        self.search_schema = azure_config.search_schema
+        self.project_name = azure_config.project_name
+        self.dedup_mode = azure_config.dedup_mode
+
+        # 검색 후 로컬 리랭킹 + MMR 다양화 (reranker는 교체 가능)
+        self.rerank_enabled = azure_config.rerank_enabled
+        self.snippets_enabled = azure_config.search_snippets_enabled
+        self.rerank_candidates = azure_config.rerank_candidates
+        self.mmr_lambda = azure_config.mmr_lambda
+        self.reranker = default_reranker
+
+    @property
+    def search_client(self):
+        if self._search_client is None:
+            self._search_client = azure_config.get_async_search_client()
+        return self._search_client
+
+    @property
+    def openai_client(self):
+        if self._openai_client is None:
+            self._openai_client = azure_config.get_async_openai_client()
+        return self._openai_client
+
+    async def close(self):
+        """비동기 클라이언트 연결 종료"""
+        if self._search_client is not None:
+            await self._search_client.close()
+            self._search_client = None
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
+
+    def chunk_text(self, text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+        """텍스트를 청크로 분할"""
+        chunks = []
+        start = 0
+
+        while start < len(text):
+            end = start + chunk_size
+            if end > len(text):
+                end = len(text)
+
+            chunk = text[start:end]
+            chunks.append(chunk)
+
+            if end == len(text):
+                break
+
+            start = end - overlap
+
+        return chunks
+
+    async def index_document(self, document_result):
+        """문서를 AI Search에 인덱싱 (legacy: onboarding-index 스키마, compact: 본문 1회 저장)"""
+        try:
+            # 문서 텍스트를 청크로 분할
+            chunks = self.chunk_text(document_result["extracted_text"])
+
+            # 각 청크를 개별 문서로 인덱싱 (AZURE_SEARCH_SCHEMA에 맞는 레이아웃)
+            documents = build_index_documents(
+                document_result, chunks, self.search_schema
+            )
+
+            # 다른 문서(이전 개정판 등)와 거의 같은 청크 검출 (MinHash/LSH)
+            duplicates = {}
+            if self.dedup_mode != DEDUP_OFF:
+                duplicates = await asyncio.to_thread(
+                    chunk_deduplicator.register_document,
+                    document_result["document_id"],
+                    [d["metadata_storage_path"] for d in documents],
+                    chunks,
+                )
+                if self.dedup_mode == DEDUP_SKIP:
+                    documents = [
+                        d for d in documents if d["metadata_storage_path"] not in duplicates
+                    ]
+
+            # AI Search에 문서들 업로드
+            if documents:
+                result = await self.search_client.upload_documents(documents)
+
+            return {
+                "success": True,
+                "indexed_chunks": len(documents),
+                "duplicate_chunks": len(duplicates),
+                "document_id": document_result["document_id"],
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def generate_document_summary(self, document_result):
+        """문서 요약 생성"""
+        try:
+            # 문서가 너무 길면 일부만 처리
+            text = document_result["extracted_text"]
+
+            response = await self._create_completion(
+                messages=summary_messages(
+                    document_result["file_name"], document_result["file_type"], text
+                ),
+                max_completion_tokens=7000,
+                prompt_name="summary",
+            )
+
+            summary = response.choices[0].message.content
+
+            return {
+                "success": True,
+                "summary": summary,
+                "document_id": document_result["document_id"],
+                "file_name": document_result["file_name"],
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def extract_technical_info(self, document_result):
+        """기술 정보 추출 (간단한 버전)"""
+        try:
+            text = document_result["extracted_text"]
+            if len(text) > 4000:
+                text = text[:4000] + "..."
+
+            response = await self._create_completion(
+                messages=keyword_messages(text),
+                max_completion_tokens=7000,
+                prompt_name="keywords",
+            )
+
+            tech_keywords = response.choices[0].message.content
+
+            return {
+                "success": True,
+                "technical_keywords": tech_keywords,
+                "document_id": document_result["document_id"],
+                "file_name": document_result["file_name"],
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def analyze_document(self, document_result):
+        """요약 + 기술 키워드를 단일 JSON 응답으로 생성"""
+        try:
+            text = document_result["extracted_text"]
+
+            response = await self._create_completion(
+                messages=analysis_messages(
+                    document_result["file_name"], document_result["file_type"], text
+                ),
+                response_format={"type": "json_object"},
+                max_completion_tokens=7000,
+                prompt_name="analysis",
+            )
+
+            analysis = self._validate_analysis(
+                json.loads(response.choices[0].message.content)
+            )
+            keywords = self.normalize_keywords(analysis["keywords"])
+
+            return {
+                "success": True,
+                "summary": {
+                    "success": True,
+                    "summary": self._format_analysis_summary(analysis),
+                    "document_id": document_result["document_id"],
+                    "file_name": document_result["file_name"],
+                },
+                "technical_info": {
+                    "success": True,
+                    "technical_keywords": ", ".join(keywords),
+                    "keywords": keywords,
+                    "document_id": document_result["document_id"],
+                    "file_name": document_result["file_name"],
+                },
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def _create_completion(
+        self,
+        messages,
+        max_completion_tokens,
+        priority=PRIORITY_BACKGROUND,
+        prompt_name=None,
+        **kwargs,
+    ):
+        """공유 호출 제한(TPM/RPM, 우선순위, 429 재시도)을 거쳐 채팅 완성 호출
+
+        prompt_name별로 캐시된 프롬프트 토큰 수를 prompt_cache_stats에 기록한다.
+        """
+        # 할당량은 프롬프트 토큰 + 최대 완성 토큰 기준으로 차감됨
+        estimated_tokens = (
+            sum(estimate_tokens(m["content"]) for m in messages) + max_completion_tokens
+        )
+
+        response = await call_with_rate_limit_async(
+            lambda: self.openai_client.chat.completions.create(
+                model=self.deployment_name,
+                messages=messages,
+                max_completion_tokens=max_completion_tokens,
+                **kwargs,
+            ),
+            estimated_tokens,
+            priority=priority,
+        )
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens:
+            openai_rate_limiter.release_unused(estimated_tokens - usage.total_tokens)
+        prompt_cache_stats.record(prompt_name, usage)
+        return response
+
+    def _validate_analysis(self, analysis):
+        """단일 분석 응답의 JSON 스키마 검증"""
+        if not isinstance(analysis, dict):
+            raise ValueError("분석 응답이 JSON 객체가 아닙니다.")
+
+        overview = analysis.get("overview")
+        if not isinstance(overview, str) or not overview.strip():
+            raise ValueError("분석 응답에 overview가 없습니다.")
+
+        validated = {"overview": overview.strip()}
+        for key in ("key_points", "technologies", "notes", "keywords"):
+            value = analysis.get(key, [])
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(
+                isinstance(item, str) for item in value
+            ):
+                raise ValueError(f"분석 응답의 {key} 형식이 올바르지 않습니다.")
+            validated[key] = [item.strip() for item in value if item.strip()]
+
+        if not validated["key_points"]:
+            raise ValueError("분석 응답에 key_points가 없습니다.")
+
+        return validated
+
+    def _format_analysis_summary(self, analysis):
+        """분석 결과를 기존 요약 형식(마크다운)으로 변환"""
+        sections = [
+            f"**1. 문서 개요**\n{analysis['overview']}",
+            "**2. 주요 내용**\n"
+            + "\n".join(f"- {point}" for point in analysis["key_points"]),
+        ]
+        if analysis["technologies"]:
+            sections.append(
+                "**3. 핵심 기술/시스템**\n"
+                + "\n".join(f"- {tech}" for tech in analysis["technologies"])
+            )
+        if analysis["notes"]:
+            sections.append(
+                "**4. 중요 참고사항**\n"
+                + "\n".join(f"- {note}" for note in analysis["notes"])
+            )
+        return "\n\n".join(sections)
+
+    def normalize_keywords(self, keywords):
+        """기술 키워드 정리 (공백 제거, 대소문자 무시 중복 제거)"""
+        if isinstance(keywords, str):
+            keywords = keywords.replace("\n", ",").split(",")
+
+        normalized = []
+        seen = set()
+        for keyword in keywords:
+            keyword = keyword.strip().strip("-*•`'\".").strip()
+            if not keyword or keyword.lower() in seen:
+                continue
+            seen.add(keyword.lower())
+            normalized.append(keyword)
+        return normalized
+
+    def _to_search_result(self, result, snippets=False):
+        """검색 응답 한 건을 SearchHit으로 변환"""
+        storage_path = result.get("metadata_storage_path", "")
+
+        # 실제 파일명 우선 사용, 없으면 기존 방식 사용
+        file_name = result.get("metadata_storage_name")
+        if not file_name:
+            # 기존 방식: metadata_storage_path에서 추출
+            file_name = "업로드된 문서"  # 기본값
+
+            if storage_path and "doc_" in storage_path and "_chunk_" in storage_path:
+                try:
+                    # doc_UUID_chunk_N 형식에서 파일명 추출
+                    parts = storage_path.split("_")
+                    if len(parts) >= 3:
+                        uuid_part = parts[1][:8]  # UUID 앞 8자리
+                        file_name = f"문서_{uuid_part}"
+                except:
+                    file_name = "업로드된 문서"
+
+        if snippets:
+            # 본문 대신 하이라이트만 받음 (본문은 프롬프트에 들어갈 때 조회)
+            highlights = (result.get("@search.highlights") or {}).get("content") or []
+            return SearchHit(
+                storage_path,
+                file_name,
+                result["@search.score"],
+                snippet=" … ".join(highlights),
+            )
+        # 안전하게 필드 접근
+        content = result.get("content") or result.get("merged_content", "")
+        return SearchHit(storage_path, file_name, result["@search.score"], content=content)
+
+    async def _search(self, query, top, search_mode, snippets, search_filter=None):
+        """AI Search 질의 (스니펫 모드는 본문 없이 하이라이트만 요청, 필터로 검색 범위 한정)"""
+        if snippets:
+            options = {
+                "select": SNIPPET_SELECT_FIELDS,
+                "highlight_fields": "content",
+                "highlight_pre_tag": "**",
+                "highlight_post_tag": "**",
+            }
+        else:
+            # retrievable=true인 필드들만 select에 사용
+            options = {"select": select_fields(self.search_schema)}
+
+        try:
+            search_results = await self.search_client.search(
+                search_text=query,
+                top=top,
+                include_total_count=True,
+                query_type="simple",
+                search_mode=search_mode,
+                filter=search_filter,
+                **options,
+            )
+            return [
+                self._to_search_result(result, snippets)
+                async for result in search_results
+            ]
+        except HttpResponseError as e:
+            # 검색 범위 필드가 filterable이 아닌 인덱스는 범위를 무시하지 않고 명확히 실패
+            if search_filter and "filterable" in str(e):
+                raise Exception(
+                    f"검색 범위를 적용할 수 없습니다: '{azure_config.search_index_name}' 인덱스"
+                    f"({self.search_schema} 스키마)의 필터 필드가 filterable이 아닙니다. "
+                    f"인덱스 필드 설정을 확인하세요. ({e.message})"
+                ) from e
+            raise
+
+    async def search_documents(
+        self, query, top_k=5, rerank=None, snippets=None, search_filter=None
+    ):
+        """문서 검색 - 인덱스 스키마에 맞게 수정된 버전
+
+        snippets=True면 본문 대신 하이라이트(snippet)만 받고, 본문은 hydrate_results로 필요할 때 조회한다.
+        search_filter는 검색 범위를 한정하는 OData 필터 (search_schema.build_search_filter)이다.
+        """
+        try:
+            # 리랭킹 시 후보를 넉넉히 가져온 뒤 로컬에서 재정렬
+            if rerank is None:
+                rerank = self.rerank_enabled
+            fetch_k = max(top_k, self.rerank_candidates) if rerank else top_k
+            # 중복 청크를 접으면 결과가 줄어드므로 여유 있게 조회
+            dedup = self.dedup_mode != DEDUP_OFF
+            if dedup and not rerank:
+                fetch_k = top_k * 2
+
+            # 리랭킹은 본문 전체가 필요하므로 스니펫 모드를 사용하지 않음
+            if snippets is None:
+                snippets = self.snippets_enabled
+            snippets = snippets and not rerank
+
+            results = await self._search(
+                query, fetch_k, "all", snippets, search_filter
+            )
+
+            # 결과가 부족하면 부분 검색도 시도
+            if len(results) < 2:
+                existing_paths = {r.storage_path for r in results}
+                for result in await self._search(
+                    query, fetch_k, "any", snippets, search_filter
+                ):
+                    if result.storage_path not in existing_paths:
+                        results.append(result)
+
+                        if len(results) >= fetch_k:
+                            break
+
+            # 같은 대표 청크를 가리키는 거의 같은 결과는 하나만 남김
+            if dedup:
+                results = await asyncio.to_thread(
+                    chunk_deduplicator.collapse_results, results
+                )
+                if not rerank:
+                    results = results[:top_k]
+
+            if rerank:
+                results = rerank_results(
+                    query,
+                    results,
+                    top_n=top_k,
+                    reranker=self.reranker,
+                    mmr_lambda=self.mmr_lambda,
+                )
+
+            return {"success": True, "results": results, "total_count": len(results)}
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_chunk_content(self, storage_path):
+        """청크 키로 본문 전체 조회"""
+        document = await self.search_client.get_document(
+            storage_path, selected_fields=content_fields(self.search_schema)
+        )
+        return document.get("content") or document.get("merged_content", "")
+
+    async def hydrate_results(self, search_results, token_budget=None):
+        """스니펫 결과 중 프롬프트에 들어갈 청크만 순위 순으로 본문 조회 (토큰 예산이 차면 중단)"""
+        token_budget = token_budget or self.context_token_budget
+        hydrated = []
+        used_tokens = 0
+        pending = list(search_results)
+
+        while pending and used_tokens < token_budget:
+            batch, pending = pending[:HYDRATE_BATCH_SIZE], pending[HYDRATE_BATCH_SIZE:]
+            missing = [r for r in batch if not r.has_content]
+            contents = await asyncio.gather(
+                *(self.get_chunk_content(r.storage_path) for r in missing)
+            )
+            # 결과 객체에 본문을 채움 (복사하지 않음)
+            for result, content in zip(missing, contents):
+                result.content = content
+
+            for result in batch:
+                used_tokens += estimate_tokens(result.content)
+                hydrated.append(result)
+
+        return hydrated
+
+    async def answer_question(
+        self,
+        question,
+        search_results=None,
+        token_budget=None,
+        history=None,
+        search_filter=None,
+        priority=PRIORITY_INTERACTIVE,
+    ):
+        """질문에 대한 답변 생성 (RAG + 일반 지식, history는 이전 대화 메시지)"""
+        try:
+            # 검색 결과가 없으면 검색 수행
+            if search_results is None:
+                search_result = await self.search_documents(
+                    question, search_filter=search_filter
+                )
+                if not search_result["success"]:
+                    raise Exception(f"검색 실패: {search_result['error']}")
+                search_results = search_result["results"]
+
+            # 검색 결과를 토큰 예산 내 컨텍스트로 구성 (인접 청크 병합, 중복 제거)
+            context = ""
+            sources = []
+            context_tokens = 0
+            if search_results:
+                # 스니펫 모드 결과는 컨텍스트에 들어갈 청크만 본문 조회
+                context_results = search_results
+                if not all(r.has_content for r in search_results):
+                    context_results = await self.hydrate_results(
+                        search_results, token_budget
+                    )
+                context_result = build_context(
+                    context_results,
+                    token_budget=token_budget or self.context_token_budget,
+                )
+                context = context_result["context"]
+                sources = context_result["sources"]
+                context_tokens = context_result["token_count"]
+
+            # 답변 생성 프롬프트 - 문서 기반 + 일반 지식
+            answer_type = "document_based" if context.strip() else "general_knowledge"
+            response = await self._create_completion(
+                messages=answer_messages(question, context.strip(), history),
+                max_completion_tokens=1500,
+                priority=priority,
+                prompt_name="answer",
+            )
+
+            answer = response.choices[0].message.content
+
+            return {
+                "success": True,
+                "answer": answer,
+                "answer_type": answer_type,
+                "sources": sources,
+                "search_results": search_results,
+                "search_result_count": len(search_results) if search_results else 0,
+                "context_tokens": context_tokens,
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def rewrite_query(self, conversation, question):
+        """후속 질문을 대화 맥락 없이도 검색 가능한 독립 질의로 재작성 (대화가 없으면 그대로)"""
+        if not conversation.turns and not conversation.summary:
+            return question
+
+        try:
+            response = await self._create_completion(
+                messages=rewrite_messages(conversation.transcript(), question),
+                max_completion_tokens=100,
+                priority=PRIORITY_INTERACTIVE,
+                prompt_name="rewrite",
+            )
+            rewritten = (response.choices[0].message.content or "").strip()
+            return rewritten.splitlines()[0] if rewritten else question
+        except Exception as e:
+            print(f"질의 재작성 실패, 원래 질문으로 검색: {str(e)}")
+            return question
+
+    async def summarize_history(self, summary, turns):
+        """기존 누적 요약과 오래된 대화 턴을 하나의 요약으로 압축"""
+        dialogue = "\n".join(
+            f"사용자: {turn['question']}\n답변: {turn['answer']}" for turn in turns
+        )
+        try:
+            response = await self._create_completion(
+                messages=history_summary_messages(summary, dialogue),
+                max_completion_tokens=500,
+                priority=PRIORITY_INTERACTIVE,
+                prompt_name="history_summary",
+            )
+            return {"success": True, "summary": response.choices[0].message.content}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def chat(self, conversation, question, search_filter=None):
+        """멀티턴 질의응답: 후속 질문을 독립 질의로 바꿔 검색하고 요약 + 최근 대화와 함께 답변"""
+        try:
+            # 오래된 턴 요약은 질의 재작성/검색과 동시에 실행 (턴이 늘어도 지연 시간 유지)
+            older_turns = conversation.turns_to_compress()
+
+            async def retrieve():
+                query = await self.rewrite_query(conversation, question)
+                return query, await self.search_documents(
+                    query, search_filter=search_filter
+                )
+
+            async def compress():
+                if not older_turns:
+                    return None
+                return await self.summarize_history(conversation.summary, older_turns)
+
+            (query, search_result), summary_result = await asyncio.gather(
+                retrieve(), compress()
+            )
+
+            if older_turns:
+                if summary_result["success"]:
+                    summary = summary_result["summary"]
+                else:
+                    # 요약 실패 시 이전 질문 목록만 남김
+                    print(f"대화 요약 실패: {summary_result['error']}")
+                    summary = "\n".join(
+                        [conversation.summary]
+                        + [f"- 이전 질문: {turn['question']}" for turn in older_turns]
+                    ).strip()
+                conversation.apply_summary(summary, len(older_turns))
+
+            if not search_result["success"]:
+                raise Exception(f"검색 실패: {search_result['error']}")
+
+            answer_result = await self.answer_question(
+                question,
+                search_result["results"],
+                history=conversation.history_messages(),
+            )
+            if answer_result["success"]:
+                answer_result["standalone_query"] = query
+                answer_result["history_tokens"] = conversation.history_tokens()
+                conversation.add_turn(question, answer_result["answer"])
+            return answer_result
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def answer_questions(
+        self, questions, token_budget=None, max_concurrency=8, priority=PRIORITY_INTERACTIVE
+    ):
+        """여러 질문에 동시에 답변 (비슷한 질문은 묶어서 검색과 답변을 한 번만 수행)"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        representatives, groups = group_similar_questions(
+            questions, faq_store.match_threshold
+        )
+
+        async def answer(question):
+            async with semaphore:
+                return await self.answer_question(
+                    question, token_budget=token_budget, priority=priority
+                )
+
+        answers = await asyncio.gather(
+            *(answer(question) for question in representatives)
+        )
+        return [
+            dict(answers[group], question=question)
+            for question, group in zip(questions, groups)
+        ]
+
+    async def generate_faq_questions(self, documents, limit=10):
+        """문서 요약을 바탕으로 신규 투입자가 물어볼 만한 질문 생성"""
+        try:
+            digests = "\n\n".join(
+                f"[{document['file_name']}]\n{document['summary'][:800]}"
+                for document in documents
+            )
+
+            response = await self._create_completion(
+                messages=faq_question_messages(digests, limit),
+                response_format={"type": "json_object"},
+                max_completion_tokens=2000,
+                prompt_name="faq_questions",
+            )
+
+            questions = json.loads(response.choices[0].message.content).get(
+                "questions", []
+            )
+            if not isinstance(questions, list):
+                raise ValueError("질문 응답 형식이 올바르지 않습니다.")
+            questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
+
+            return {"success": True, "questions": questions[:limit]}
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def build_faq(self, documents, project=None, max_concurrency=8):
+        """프로젝트 FAQ 생성: 공통 질문 + 문서 기반 질문에 일괄 답변 후 저장 (백그라운드 우선순위)"""
+        project = project or self.project_name
+        questions = list(DEFAULT_FAQ_QUESTIONS)
+
+        if documents:
+            generated = await self.generate_faq_questions(documents)
+            if generated["success"]:
+                questions.extend(generated["questions"])
+            else:
+                print(f"FAQ 질문 생성 실패, 공통 질문만 사용: {generated['error']}")
+
+        answers = await self.answer_questions(
+            questions, max_concurrency=max_concurrency, priority=PRIORITY_BACKGROUND
+        )
+        succeeded = [answer for answer in answers if answer["success"]]
+        await asyncio.to_thread(faq_store.save_answers, project, succeeded)
+
+        return {
+            "success": bool(succeeded),
+            "project": project,
+            "question_count": len(questions),
+            "saved_count": len(succeeded),
+            "errors": [answer["error"] for answer in answers if not answer["success"]],
+        }
+
+    async def process_document_complete(self, document_result):
+        """문서 전체 처리 파이프라인"""
+        results = {
+            "document_id": document_result["document_id"],
+            "file_name": document_result["file_name"],
+            "processing_results": {},
+        }
+
+        # 1. AI Search 인덱싱과 2. 문서 요약 + 기술 키워드 추출을 동시에 실행
+        print("AI Search 인덱싱 및 문서 분석 중...")
+        index_result, summarize_result = await asyncio.gather(
+            self.index_document(document_result),
+            self.summarize_document(document_result),
+        )
+        results["processing_results"]["indexing"] = index_result
+        results["processing_results"].update(summarize_result)
+
+        return results
+
+    async def summarize_document(self, document_result):
+        """문서 요약 + 기술 키워드 추출 후 키워드 인덱스 반영"""
+        # 단일 호출 (실패 시 개별 호출로 대체)
+        if self.combined_analysis_enabled:
+            print("문서 요약 및 기술 키워드 분석 중...")
+            analysis_result = await self.analyze_document(document_result)
+            if analysis_result["success"]:
+                await asyncio.to_thread(
+                    self._update_keyword_index,
+                    document_result,
+                    analysis_result["technical_info"],
+                )
+                return {
+                    "summary": analysis_result["summary"],
+                    "technical_info": analysis_result["technical_info"],
+                }
+            print(f"단일 분석 실패, 개별 호출로 대체: {analysis_result['error']}")
+
+        # 문서 요약 생성 + 기술 키워드 추출 (간단화) 동시 실행
+        print("문서 요약 생성 및 기술 키워드 추출 중...")
+        summary_result, tech_result = await asyncio.gather(
+            self.generate_document_summary(document_result),
+            self.extract_technical_info(document_result),
+        )
+        if tech_result["success"]:
+            tech_result["keywords"] = self.normalize_keywords(
+                tech_result["technical_keywords"]
+            )
+        await asyncio.to_thread(self._update_keyword_index, document_result, tech_result)
+
+        return {"summary": summary_result, "technical_info": tech_result}
+
+    def _update_keyword_index(self, document_result, tech_result):
+        """추출된 기술 키워드를 키워드 인덱스에 반영"""
+        if not tech_result.get("success"):
+            return
+        try:
+            keyword_index.add_document(
+                document_result["document_id"],
+                document_result["file_name"],
+                tech_result["keywords"],
+                self.chunk_text(document_result["extracted_text"]),
+            )
+        except Exception as e:
+            print(f"키워드 인덱스 갱신 실패: {str(e)}")
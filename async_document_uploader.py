@@ -0,0 +1,163 @@
+# async_document_uploader.py
+import asyncio
+import uuid
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import ContentSettings
+from azure_config import azure_config
+from async_document_processor import AsyncDocumentProcessor
+from sidecar import decode_sidecar, encode_sidecar, sidecar_blob_name
+
+
+class AsyncDocumentUploader:
+    """비동기 Blob Storage 클라이언트 기반 업로더
+
+    텍스트 추출(CPU/OCR 폴링)은 스레드에서, 업로드와 문서 처리는 이벤트 루프에서 실행한다.
+    """
+
+    def __init__(self, extract_text=None, processor=None):
+        self._blob_service_client = None
+        self._extract_text = extract_text
+        self._processor = processor
+
+    @property
+    def blob_service_client(self):
+        if self._blob_service_client is None:
+            self._blob_service_client = azure_config.get_async_blob_service_client()
+        return self._blob_service_client
+
+    @property
+    def processor(self):
+        if self._processor is None:
+            self._processor = AsyncDocumentProcessor()
+        return self._processor
+
+    async def close(self):
+        """비동기 클라이언트 연결 종료"""
+        if self._blob_service_client is not None:
+            await self._blob_service_client.close()
+            self._blob_service_client = None
+
+    async def extract_text_from_file(self, uploaded_file):
+        """파일 형식별 텍스트 추출 (기존 추출기를 스레드에서 실행)"""
+        extract_text = self._extract_text
+        if extract_text is None:
+            from document_uploader import document_uploader
+
+            extract_text = document_uploader.extract_text_from_file
+        return await asyncio.to_thread(extract_text, uploaded_file)
+
+    async def upload_to_blob_storage(
+        self, uploaded_file, document_id=None, extracted_text=None, page_offsets=None
+    ):
+        """파일을 Azure Blob Storage에 업로드 (추출 텍스트가 있으면 사이드카도 함께 저장)"""
+        try:
+            # 고유한 문서 ID 생성
+            document_id = document_id or str(uuid.uuid4())
+            blob_name = f"{document_id}/{uploaded_file.name}"
+
+            blob_client = self.blob_service_client.get_blob_client(
+                container=azure_config.storage_container_name, blob=blob_name
+            )
+
+            # 파일 업로드
+            uploaded_file.seek(0)
+            data = uploaded_file.read()
+            uploaded_file.seek(0)
+            uploads = [blob_client.upload_blob(data, overwrite=True)]
+            if extracted_text is not None:
+                uploads.append(
+                    self.upload_extracted_text(document_id, extracted_text, page_offsets)
+                )
+            await asyncio.gather(*uploads)
+
+            return {
+                "document_id": document_id,
+                "blob_url": blob_client.url,
+                "blob_name": blob_name,
+            }
+
+        except Exception as e:
+            raise Exception(f"Blob Storage 업로드 실패: {str(e)}")
+
+    async def upload_extracted_text(self, document_id, text, page_offsets=None):
+        """추출 텍스트를 원본 옆에 gzip 사이드카(document_id/extracted.txt.gz)로 저장"""
+        data, metadata = await asyncio.to_thread(encode_sidecar, text, page_offsets)
+        blob_client = self.blob_service_client.get_blob_client(
+            container=azure_config.storage_container_name,
+            blob=sidecar_blob_name(document_id),
+        )
+        await blob_client.upload_blob(
+            data,
+            overwrite=True,
+            metadata=metadata,
+            content_settings=ContentSettings(
+                content_type="text/plain; charset=utf-8", content_encoding="gzip"
+            ),
+        )
+
+    async def read_extracted_text(self, document_id):
+        """사이드카에서 추출 텍스트 읽기 (없거나 추출기 버전이 다르면 None)"""
+        blob_client = self.blob_service_client.get_blob_client(
+            container=azure_config.storage_container_name,
+            blob=sidecar_blob_name(document_id),
+        )
+        try:
+            # Content-Encoding: gzip 자동 해제를 끄고 압축된 그대로 받음
+            downloader = await blob_client.download_blob(decompress=False)
+            data = await downloader.readall()
+        except ResourceNotFoundError:
+            return None
+        return await asyncio.to_thread(
+            decode_sidecar, data, downloader.properties.metadata
+        )
+
+    def build_document_result(self, uploaded_file, extracted_text, upload_result):
+        """추출 텍스트와 업로드 결과로 문서 처리 결과 생성"""
+        return {
+            "success": True,
+            "document_id": upload_result["document_id"],
+            "file_name": uploaded_file.name,
+            "file_type": uploaded_file.name.split(".")[-1].lower(),
+            "extracted_text": extracted_text,
+            "blob_url": upload_result["blob_url"],
+            "blob_name": upload_result["blob_name"],
+            "file_size": uploaded_file.size,
+        }
+
+    async def process_single_file(self, uploaded_file):
+        """단일 파일 처리: 텍스트 추출 + Blob Storage 업로드 + AI Search 인덱싱 + 요약"""
+        try:
+            # 추출에 실패한 파일은 업로드하지 않음
+            extracted_text = await self.extract_text_from_file(uploaded_file)
+            if not extracted_text:
+                raise Exception("텍스트를 추출할 수 없습니다.")
+
+            upload_result = await self.upload_to_blob_storage(
+                uploaded_file, extracted_text=extracted_text
+            )
+            result = self.build_document_result(
+                uploaded_file, extracted_text, upload_result
+            )
+
+            try:
+                processing_results = await self.processor.process_document_complete(
+                    result
+                )
+                result["processing_results"] = processing_results["processing_results"]
+            except Exception as e:
+                result["processing_error"] = str(e)
+
+            return result
+
+        except Exception as e:
+            return {"success": False, "file_name": uploaded_file.name, "error": str(e)}
+
+    async def process_files(self, uploaded_files, max_concurrency=16):
+        """여러 파일을 최대 max_concurrency개씩 동시에 처리"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process(uploaded_file):
+            async with semaphore:
+                return await self.process_single_file(uploaded_file)
+
+        return await asyncio.gather(*(process(f) for f in uploaded_files))
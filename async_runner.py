@@ -0,0 +1,43 @@
+# async_runner.py
+import asyncio
+import threading
+
+
+class BackgroundEventLoop:
+    """동기 코드에서 코루틴을 실행하기 위한 전용 이벤트 루프 스레드
+
+    동기 API(Streamlit, 작업 워커 스레드)의 호출이 모두 하나의 루프에서 실행되므로
+    비동기 클라이언트의 연결 풀을 공유하고 스레드 수와 무관하게 동시 호출을 처리한다.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="async-runner", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine, timeout=None):
+        """코루틴을 루프에서 실행하고 결과가 나올 때까지 대기"""
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("이벤트 루프 스레드 안에서는 동기 API를 호출할 수 없습니다.")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result(timeout)
+
+
+# 전역 백그라운드 이벤트 루프
+background_loop = BackgroundEventLoop()
+
+
+def run_sync(coroutine, timeout=None):
+    """동기 래퍼용: 코루틴을 백그라운드 이벤트 루프에서 실행"""
+    return background_loop.run(coroutine, timeout)
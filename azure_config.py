@@ -1,11 +1,18 @@
 import os
+import threading
+import time
 
 # from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import SearchIndex
 from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import ResourceNotFoundError
+from search_schema import SCHEMA_LEGACY, compact_index_fields
 
 # 환경 변수 로드
 # load_dotenv()
@@ -23,6 +30,8 @@ class AzureConfig:
         self.search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
         self.search_api_key = os.getenv("AZURE_SEARCH_API_KEY")
         self.search_index_name = os.getenv("AZURE_SEARCH_INDEX_NAME")
+        # 인덱스 문서 레이아웃 (legacy: 기존 onboarding-index, compact: 본문 1회 저장)
+        self.search_schema = os.getenv("AZURE_SEARCH_SCHEMA", SCHEMA_LEGACY).lower()
 
         # Azure Storage 설정
         self.storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
@@ -33,21 +42,92 @@ class AzureConfig:
         # Azure AI Services 설정 (OCR)
         self.ai_services_endpoint = os.getenv("AZURE_AI_SERVICES_ENDPOINT")
         self.ai_services_api_key = os.getenv("AZURE_AI_SERVICES_API_KEY")
+        # 스캔 PDF 페이지 OCR 동시 요청 수 (Read API 초당 요청 한도 고려)
+        self.ocr_max_concurrency = int(os.getenv("OCR_MAX_CONCURRENCY", "4"))
+
+        # 문서 분석 설정 (요약 + 키워드 단일 호출 여부)
+        self.combined_analysis_enabled = (
+            os.getenv("COMBINED_ANALYSIS_ENABLED", "true").lower() != "false"
+        )
+
+        # 질의응답 컨텍스트 토큰 예산
+        self.answer_context_token_budget = int(
+            os.getenv("ANSWER_CONTEXT_TOKEN_BUDGET", "4000")
+        )
+
+        # 멀티턴 대화 기록 설정 (요약 + 최근 대화 원문의 토큰 예산, 원문으로 유지할 턴 수)
+        self.chat_history_token_budget = int(
+            os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000")
+        )
+        self.chat_recent_turns = int(os.getenv("CHAT_RECENT_TURNS", "3"))
+        # 화면에 남겨둘 최근 질의응답 수 (세션 메모리 상한)
+        self.chat_log_limit = max(1, int(os.getenv("CHAT_LOG_LIMIT", "50")))
+
+        # 검색 리랭킹 설정 (후보 과다 조회 후 로컬 재정렬 + MMR)
+        self.rerank_enabled = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+        self.rerank_candidates = int(os.getenv("RERANK_CANDIDATES", "50"))
+        self.mmr_lambda = float(os.getenv("MMR_LAMBDA", "0.7"))
+
+        # 거의 같은 청크 처리 (off: 검사 안 함, link: 검색 시 하나로 접음, skip: 인덱싱 생략)
+        self.dedup_mode = os.getenv("DEDUP_MODE", "off").lower()
+
+        # 검색 결과에 본문 대신 하이라이트만 받는 스니펫 모드
+        self.search_snippets_enabled = (
+            os.getenv("SEARCH_SNIPPETS_ENABLED", "false").lower() == "true"
+        )
+
+        # 미리 생성한 FAQ를 구분하는 프로젝트 이름
+        self.project_name = os.getenv("ONBOARDING_PROJECT", "default")
+
+        # Azure OpenAI 배포 할당량 (분당 토큰/요청 수)
+        self.openai_tokens_per_minute = int(os.getenv("AZURE_OPENAI_TPM", "30000"))
+        self.openai_requests_per_minute = int(os.getenv("AZURE_OPENAI_RPM", "180"))
+        # 할당량 중 질의응답 등 대화형 호출만 쓸 수 있도록 남겨둘 비율 (0~0.9)
+        self.openai_interactive_reserve = min(
+            0.9, max(0.0, float(os.getenv("AZURE_OPENAI_INTERACTIVE_RESERVE", "0.2")))
+        )
+
+        # 연결 점검 설정 (서비스별 제한 시간, 결과 캐시 유지 시간)
+        self.health_check_timeout = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+        self.health_check_ttl = float(os.getenv("HEALTH_CHECK_TTL", "30"))
+        self._health_lock = threading.Lock()  # 캐시/진행 상태 보호용 (점검 중에는 잡지 않음)
+        self._health_cache = None  # (점검 시각, 결과)
+        self._health_refresh = None  # 진행 중인 점검 완료 이벤트 (동시에 한 번만 점검)
+        self._probe_threads = {}  # 서비스 -> 아직 끝나지 않았을 수 있는 점검 스레드
 
     def get_openai_client(self):
-        """Azure OpenAI 클라이언트 반환"""
+        """Azure OpenAI 클라이언트 반환 (재시도는 rate_limiter에서 처리)"""
         return AzureOpenAI(
             azure_endpoint=self.openai_endpoint,
             api_key=self.openai_api_key,
             api_version=self.openai_api_version,
+            max_retries=0,
         )
 
-    def get_search_client(self):
+    def get_async_openai_client(self):
+        """Azure OpenAI 비동기 클라이언트 반환"""
+        return AsyncAzureOpenAI(
+            azure_endpoint=self.openai_endpoint,
+            api_key=self.openai_api_key,
+            api_version=self.openai_api_version,
+            max_retries=0,
+        )
+
+    def get_search_client(self, index_name=None):
         """Azure AI Search 클라이언트 반환"""
         credential = AzureKeyCredential(self.search_api_key)
         return SearchClient(
             endpoint=self.search_endpoint,
-            index_name=self.search_index_name,
+            index_name=index_name or self.search_index_name,
+            credential=credential,
+        )
+
+    def get_async_search_client(self, index_name=None):
+        """Azure AI Search 비동기 클라이언트 반환"""
+        credential = AzureKeyCredential(self.search_api_key)
+        return AsyncSearchClient(
+            endpoint=self.search_endpoint,
+            index_name=index_name or self.search_index_name,
             credential=credential,
         )
 
@@ -56,19 +136,26 @@ class AzureConfig:
         credential = AzureKeyCredential(self.search_api_key)
         return SearchIndexClient(endpoint=self.search_endpoint, credential=credential)
 
+    def create_compact_index(self, index_name=None):
+        """compact 스키마 인덱스 생성 (이미 있으면 필드 정의 갱신)"""
+        index = SearchIndex(
+            name=index_name or self.search_index_name, fields=compact_index_fields()
+        )
+        return self.get_search_index_client().create_or_update_index(index)
+
     def get_blob_service_client(self):
         """Azure Blob Storage 클라이언트 반환"""
         return BlobServiceClient.from_connection_string(self.storage_connection_string)
 
-    def get_vision_client(self):
-        """Azure AI Services Computer Vision 클라이언트 반환"""
-        ai_services_endpoint = os.getenv("AZURE_AI_SERVICES_ENDPOINT")
-        ai_services_api_key = os.getenv("AZURE_AI_SERVICES_API_KEY")
-
-        print(f"🔍 AI Services endpoint: {ai_services_endpoint}")
-        print(f"🔍 AI Services key: {'있음' if ai_services_api_key else '없음'}")
+    def get_async_blob_service_client(self):
+        """Azure Blob Storage 비동기 클라이언트 반환"""
+        return AsyncBlobServiceClient.from_connection_string(
+            self.storage_connection_string
+        )
 
-        if not ai_services_endpoint or not ai_services_api_key:
+    def get_vision_client(self):
+        """Azure AI Services Computer Vision 클라이언트 반환 (설정이 없으면 None)"""
+        if not self.ai_services_endpoint or not self.ai_services_api_key:
             return None
 
         try:
@@ -78,11 +165,8 @@ class AzureConfig:
             from msrest.authentication import CognitiveServicesCredentials
 
             # AI Services는 CognitiveServicesCredentials 사용
-            credentials = CognitiveServicesCredentials(ai_services_api_key)
-            client = ComputerVisionClient(ai_services_endpoint, credentials)
-
-            print("✅ AI Services Computer Vision 클라이언트 생성 성공")
-            return client
+            credentials = CognitiveServicesCredentials(self.ai_services_api_key)
+            return ComputerVisionClient(self.ai_services_endpoint, credentials)
 
         except ImportError as e:
             print(f"❌ 패키지 import 실패: {str(e)}")
@@ -91,56 +175,127 @@ class AzureConfig:
             print(f"❌ 클라이언트 생성 실패: {str(e)}")
             return None
 
-    def test_connections(self):
-        """모든 Azure 서비스 연결 테스트"""
-        results = {}
+    def _probe_openai(self, timeout):
+        """모델 목록 조회로 OpenAI 엔드포인트/키 확인 (완성 호출 없음)"""
+        self.get_openai_client().with_options(timeout=timeout).models.list()
+        return True, "연결 성공"
 
-        # OpenAI 연결 테스트
+    def _probe_search(self, timeout):
+        """인덱스 정의 조회로 AI Search 확인"""
         try:
-            client = self.get_openai_client()
-            response = client.chat.completions.create(
-                model=self.openai_deployment_name,
-                messages=[{"role": "user", "content": "Hello"}],
+            self.get_search_index_client().get_index(
+                self.search_index_name, connection_timeout=timeout, read_timeout=timeout
             )
-            results["OpenAI"] = "연결 성공"
-        except Exception as e:
-            results["OpenAI"] = f"❌ 연결 실패: {str(e)}"
+        except ResourceNotFoundError:
+            return False, "⚠️ 연결 성공 (인덱스 생성 필요)"
+        return True, "연결 성공 (인덱스 존재)"
+
+    def _probe_blob(self, timeout):
+        """컨테이너 속성 조회로 Blob Storage 확인"""
+        container_client = self.get_blob_service_client().get_container_client(
+            self.storage_container_name
+        )
+        container_client.get_container_properties(
+            connection_timeout=timeout, read_timeout=timeout
+        )
+        return True, "연결 성공"
+
+    def _probe_vision(self, timeout):
+        """모델 목록 조회로 Vision 확인 (선택 서비스라 설정이 없어도 준비 완료로 취급)"""
+        vision_client = self.get_vision_client()
+        if vision_client is None:
+            return True, "⚠️ Vision 서비스 설정 없음"
+        vision_client.list_models(timeout=timeout)
+        return True, "연결 성공"
+
+    def _run_probes(self, timeout):
+        """서비스별 점검을 동시에 실행 (이전 점검이 아직 응답을 기다리는 서비스는 새로 띄우지 않음)"""
+        probes = {
+            "OpenAI": self._probe_openai,
+            "AI Search": self._probe_search,
+            "Blob Storage": self._probe_blob,
+            "AI Services Vision": self._probe_vision,
+        }
+        results = {}
 
-        # AI Search 연결 테스트
-        try:
-            search_index_client = self.get_search_index_client()
-            # 인덱스 존재 확인 (없으면 생성 필요)
+        def run_probe(name, probe):
+            started = time.perf_counter()
             try:
-                search_index_client.get_index(self.search_index_name)
-                results["AI Search"] = "연결 성공 (인덱스 존재)"
-            except:
-                results["AI Search"] = "⚠️ 연결 성공 (인덱스 생성 필요)"
-        except Exception as e:
-            results["AI Search"] = f"❌ 연결 실패: {str(e)}"
+                ready, message = probe(timeout)
+            except Exception as e:
+                ready, message = False, f"❌ 연결 실패: {str(e)}"
+            results[name] = {
+                "ready": ready,
+                "message": message,
+                "latency_ms": round((time.perf_counter() - started) * 1000),
+            }
+
+        # 응답 없는 서비스가 점검 전체나 프로세스 종료를 막지 않도록 데몬 스레드 사용
+        threads = []
+        for name, probe in probes.items():
+            previous = self._probe_threads.get(name)
+            if previous is not None and previous.is_alive():
+                continue
+            thread = threading.Thread(target=run_probe, args=(name, probe), daemon=True)
+            self._probe_threads[name] = thread
+            threads.append(thread)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        services = {}
+        for name in probes:
+            services[name] = results.get(name) or {
+                "ready": False,
+                "message": f"❌ 응답 없음 ({timeout:g}초 초과)",
+                "latency_ms": round(timeout * 1000),
+            }
+        return {
+            "ready": all(service["ready"] for service in services.values()),
+            "services": services,
+            "checked_at": time.time(),
+        }
+
+    def check_health(self, force=False):
+        """모든 Azure 서비스를 동시에 점검 (서비스별 제한 시간, TTL 동안 결과 캐시)
+
+        동시에 호출되면 한 호출만 점검하고 나머지는 그 결과를 기다린다.
+        """
+        while True:
+            with self._health_lock:
+                if (
+                    not force
+                    and self._health_cache
+                    and time.monotonic() - self._health_cache[0] < self.health_check_ttl
+                ):
+                    return dict(self._health_cache[1], cached=True)
+                refresh = self._health_refresh
+                if refresh is None:
+                    refresh = self._health_refresh = threading.Event()
+                    break
+
+            # 진행 중인 점검이 끝나면 그 결과를 사용 (결과 없이 끝났으면 다시 시도)
+            refresh.wait()
+            with self._health_lock:
+                if self._health_cache:
+                    return dict(self._health_cache[1], cached=True)
 
-        # Blob Storage 연결 테스트
         try:
-            blob_service_client = self.get_blob_service_client()
-            container_client = blob_service_client.get_container_client(
-                self.storage_container_name
-            )
-            container_client.get_container_properties()
-            results["Blob Storage"] = "연결 성공"
-        except Exception as e:
-            results["Blob Storage"] = f"❌ 연결 실패: {str(e)}"
-
-        # AI Services Vision 연결 테스트
-        try:
-            vision_client = self.get_vision_client()
-            if vision_client:
-                # Vision 클라이언트가 있다면 간단한 테스트 수행
-                results["AI Services Vision"] = "연결 성공"
-            else:
-                results["AI Services Vision"] = "⚠️ Vision 서비스 설정 없음"
-        except Exception as e:
-            results["AI Services Vision"] = f"❌ 연결 실패: {str(e)}"
+            health = self._run_probes(self.health_check_timeout)
+            with self._health_lock:
+                self._health_cache = (time.monotonic(), health)
+            return dict(health, cached=False)
+        finally:
+            with self._health_lock:
+                self._health_refresh = None
+            refresh.set()
 
-        return results
+    def test_connections(self, force=False):
+        """모든 Azure 서비스 연결 테스트 (서비스 -> 상태 메시지)"""
+        health = self.check_health(force=force)
+        return {name: service["message"] for name, service in health["services"].items()}
 
 
 # 전역 설정 객체
@@ -150,7 +305,7 @@ azure_config = AzureConfig()
 # 테스트 실행 함수
 def test_azure_connections():
     """Azure 연결 테스트 실행"""
-    results = azure_config.test_connections()
+    results = azure_config.test_connections(force=True)
 
     print("\n연결 테스트 결과:")
     for service, result in results.items():
@@ -0,0 +1,84 @@
+# benchmarks/bench_docx.py
+"""큰 DOCX에서 기존 python-docx 추출과 스트리밍 추출의 시간, 최대 메모리, 추출량 비교
+
+사용법: python benchmarks/bench_docx.py [--paragraphs 20000] [--tables 200]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import docx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_extractor import extract_docx_text  # noqa: E402
+
+SENTENCE = "신규 입사자는 배포 파이프라인과 온콜 절차를 확인하고 Grafana 대시보드 권한을 요청합니다."
+
+
+def make_docx(paragraphs, tables, rows=10, cols=4):
+    """문단 사이사이에 표가 들어간 DOCX 바이트"""
+    document = docx.Document()
+    every = max(1, paragraphs // max(tables, 1))
+    table_count = 0
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i}. {SENTENCE}")
+        if table_count < tables and (i + 1) % every == 0:
+            table = document.add_table(rows=rows, cols=cols)
+            for r in range(rows):
+                for c in range(cols):
+                    table.cell(r, c).text = f"설정{table_count}-{r}-{c}"
+            table_count += 1
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_extract(data):
+    """기존 경로: python-docx로 문서 전체를 읽고 문단만 이어붙임"""
+    doc = docx.Document(BytesIO(data))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def measure(extract, data):
+    """추출 결과, 소요 시간(초), 최대 메모리(바이트)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    text = extract(data)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=200)
+    args = parser.parse_args()
+
+    data = make_docx(args.paragraphs, args.tables)
+    print(
+        f"문단 {args.paragraphs}개, 표 {args.tables}개 (10x4), "
+        f"파일 크기 {len(data) / 1024 / 1024:.1f}MB"
+    )
+
+    for label, extract in [
+        ("기존 (python-docx, 문단만)", legacy_extract),
+        ("스트리밍 (iterparse, 문단+표)", lambda d: extract_docx_text(BytesIO(d))),
+    ]:
+        text, elapsed, peak = measure(extract, data)
+        print(
+            f"{label}: {elapsed:.2f}초, 최대 메모리 {peak / 1024 / 1024:.1f}MB, "
+            f"{len(text):,}자, 표 셀 {text.count('설정'):,}개"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_index_payload.py
+"""스키마별 청크당 업로드 페이로드 크기와 직렬화 시간 측정
+
+사용법: python benchmarks/bench_index_payload.py [--characters 200000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_document_processor import AsyncDocumentProcessor  # noqa: E402
+from search_schema import (  # noqa: E402
+    SCHEMA_COMPACT,
+    SCHEMA_LEGACY,
+    build_index_documents,
+)
+
+SENTENCES = [
+    "배포 파이프라인은 Jenkins와 ArgoCD를 사용하여 쿠버네티스 클러스터에 배포합니다.",
+    "Kafka 토픽은 주문 이벤트와 결제 이벤트로 나뉘며 컨슈머 그룹을 운영합니다.",
+    "PostgreSQL 백업은 매일 새벽 pg_dump로 수행하고 복구 절차는 운영 매뉴얼을 따릅니다.",
+    "Redis cache stores sessions and product lookups with a 10 minute TTL.",
+    "On-call engineers check the Grafana dashboard and the alert channel first.",
+]
+
+
+def make_text(characters, seed=0):
+    """한국어/영어가 섞인 온보딩 문서 텍스트 생성"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < characters:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:characters]
+
+
+def payload_bytes(documents):
+    """SDK와 같은 방식(json.dumps 기본값)으로 직렬화한 업로드 본문 크기"""
+    body = {"value": [dict(d, **{"@search.action": "upload"}) for d in documents]}
+    return len(json.dumps(body).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--characters", type=int, default=200000)
+    args = parser.parse_args()
+
+    document_result = {
+        "document_id": str(uuid.uuid4()),
+        "file_name": "onboarding_manual.docx",
+        "file_type": "docx",
+    }
+    chunks = AsyncDocumentProcessor().chunk_text(make_text(args.characters))
+    print(f"문서 {args.characters:,}자, 청크 {len(chunks)}개")
+
+    sizes = {}
+    for schema in (SCHEMA_LEGACY, SCHEMA_COMPACT):
+        start = time.perf_counter()
+        documents = build_index_documents(document_result, chunks, schema)
+        size = payload_bytes(documents)
+        elapsed = (time.perf_counter() - start) * 1000
+        sizes[schema] = size
+        print(
+            f"{schema:8s}: 청크당 {size // len(chunks):,}B, "
+            f"전체 {size / 1024:,.1f}KB, 생성+직렬화 {elapsed:.1f}ms"
+        )
+
+    print(f"compact / legacy: {sizes[SCHEMA_COMPACT] / sizes[SCHEMA_LEGACY]:.2f}배")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_records.py
+"""검색 결과/처리 결과를 dict로 보관할 때와 slots 레코드로 보관할 때의 메모리와 직렬화 시간 비교
+
+사용법: python benchmarks/bench_records.py [--count 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import ProcessedFile, SearchHit  # noqa: E402
+
+
+def hit_dict(i, content):
+    return {
+        "file_name": f"manual_{i % 50}.docx",
+        "score": 10.0 - i * 1e-5,
+        "storage_path": f"doc_{i:032x}_chunk_{i % 30}",
+        "content": content,
+    }
+
+
+def file_dict(i):
+    return {
+        "success": True,
+        "document_id": f"{i:08x}-0000-0000-0000-000000000000",
+        "file_name": f"manual_{i}.docx",
+        "file_type": "docx",
+        "file_size": 123456,
+        "blob_url": f"https://account.blob.core.windows.net/documents/{i}/manual_{i}.docx",
+        "blob_name": f"{i}/manual_{i}.docx",
+        "text_length": 45678,
+        "text_key": f"{i:064x}",
+        "analysis_key": f"{i + 1:064x}",
+        "status": "done",
+    }
+
+
+def measure(build):
+    """객체 생성 후 최대 메모리(바이트)와 소요 시간(초)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    # 본문 문자열은 공유해 레코드 자체 크기만 비교
+    content = "청크 본문 " * 100
+    cases = [
+        (
+            "검색 결과",
+            lambda: [hit_dict(i, content) for i in range(args.count)],
+            lambda: [SearchHit(**hit_dict(i, content)) for i in range(args.count)],
+            SearchHit,
+        ),
+        (
+            "처리 결과",
+            lambda: [file_dict(i) for i in range(args.count)],
+            lambda: [ProcessedFile.from_dict(file_dict(i)) for i in range(args.count)],
+            ProcessedFile,
+        ),
+    ]
+
+    print(f"레코드 {args.count:,}개")
+    for label, build_dicts, build_records, record_class in cases:
+        dicts, dict_bytes, _ = measure(build_dicts)
+        records, record_bytes, _ = measure(build_records)
+        print(
+            f"{label}: dict {dict_bytes / args.count:.0f}B/개 → "
+            f"레코드 {record_bytes / args.count:.0f}B/개 "
+            f"({1 - record_bytes / dict_bytes:.0%} 감소)"
+        )
+
+        started = time.perf_counter()
+        payload = json.dumps([r.to_dict() for r in records], ensure_ascii=False)
+        restored = [record_class.from_dict(d) for d in json.loads(payload)]
+        elapsed = time.perf_counter() - started
+        assert restored == records
+        print(f"  JSON 왕복: {elapsed / args.count * 1e6:.2f}µs/개")
+        del dicts, records, restored
+
+
+if __name__ == "__main__":
+    main()
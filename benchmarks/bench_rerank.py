@@ -0,0 +1,102 @@
+# benchmarks/bench_rerank.py
+"""리랭킹 + MMR 단계의 지연 시간과 상위 컨텍스트 다양성 측정
+
+사용법: python benchmarks/bench_rerank.py [--candidates 50] [--runs 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import SearchHit  # noqa: E402
+from reranker import default_reranker, rerank_results  # noqa: E402
+
+TOPICS = [
+    "배포 파이프라인은 Jenkins와 ArgoCD를 사용하여 쿠버네티스 클러스터에 배포합니다",
+    "Kafka 토픽은 주문 이벤트와 결제 이벤트로 나뉘며 컨슈머 그룹을 운영합니다",
+    "PostgreSQL 백업은 매일 새벽 pg_dump로 수행하고 복구 절차는 운영 매뉴얼을 따릅니다",
+    "Redis 캐시는 세션과 상품 조회 결과를 저장하며 TTL은 10분입니다",
+    "장애 발생 시 온콜 담당자는 Grafana 대시보드와 알림 채널을 확인합니다",
+    "서버 아키텍처는 API 게이트웨이, 인증 서버, 주문 서버로 구성됩니다",
+]
+
+
+def make_candidates(n, seed=0):
+    """문서 몇 개의 인접 청크가 상위를 차지하는 검색 후보 생성"""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        document = i % 5 if i < 10 else rng.randrange(12)
+        index = i // 5 if i < 10 else rng.randrange(30)
+        topic = TOPICS[(document + index // 3) % len(TOPICS)]
+        words = (topic + " ") * 8 + " ".join(
+            rng.choice(TOPICS).split()[rng.randrange(5)] for _ in range(120)
+        )
+        candidates.append(
+            {
+                "content": words[:1500],
+                "file_name": f"manual_{document}.docx",
+                "score": 20.0 - i * 0.3 + rng.random(),
+                "storage_path": f"doc_{document:032x}_chunk_{index}",
+            }
+        )
+    # 상위 후보를 같은 문서의 인접 청크로 채움
+    for rank, index in enumerate(range(3)):
+        candidates[rank]["storage_path"] = f"doc_{0:032x}_chunk_{index}"
+        candidates[rank]["file_name"] = "manual_0.docx"
+    return [SearchHit(**candidate) for candidate in candidates]
+
+
+def diversity(results, k=3):
+    """상위 k개의 서로 다른 문서 수와 같은 문서 인접 청크 쌍 수"""
+    top = results[:k]
+    positions = [(r.document_key, r.chunk_index) for r in top]
+    documents = {d for d, _ in positions}
+    adjacent_pairs = sum(
+        1
+        for i in range(len(positions))
+        for j in range(i + 1, len(positions))
+        if positions[i][0] == positions[j][0]
+        and abs(positions[i][1] - positions[j][1]) <= 1
+    )
+    return len(documents), adjacent_pairs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    query = "Kafka 컨슈머 그룹 운영 방법"
+    candidates = make_candidates(args.candidates)
+
+    # 워밍업
+    rerank_results(query, candidates, top_n=5, reranker=default_reranker)
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        reranked = rerank_results(query, candidates, top_n=5)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"후보 {args.candidates}개, {args.runs}회 실행")
+    print(
+        f"지연 시간: 평균 {statistics.mean(timings):.2f}ms, "
+        f"p50 {timings[len(timings) // 2]:.2f}ms, "
+        f"p95 {timings[int(len(timings) * 0.95)]:.2f}ms"
+    )
+
+    raw_documents, raw_adjacent = diversity(candidates)
+    new_documents, new_adjacent = diversity(reranked)
+    print(f"검색 점수 순 상위 3개: 문서 {raw_documents}개, 인접 청크 쌍 {raw_adjacent}개")
+    print(f"리랭킹 + MMR 상위 3개: 문서 {new_documents}개, 인접 청크 쌍 {new_adjacent}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+# benchmarks/load_test.py
+"""동시 사용자 부하 테스트 - 세션별 업로드/질의응답을 지연 시간이 있는 로컬 대체 백엔드로 실행
+
+Streamlit 세션처럼 사용자마다 스레드 하나가 모듈 전역 document_processor, job_queue,
+keyword_index, faq_store를 동기 호출한다. 업로드는 같은 프로세스의 작업 워커가 처리한다.
+동시 사용자 수 단계별로 처리량, 꼬리 지연, 메모리 증가, 공유 자원 대기 시간을 출력한다.
+
+사용법: python benchmarks/load_test.py [--users 1,5,10,25] [--duration 30] [--llm-tps 80]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 부하 테스트 전용 로컬 저장소와 가짜 Azure 설정 (실제 클라이언트는 아래에서 대체)
+_data_dir = tempfile.mkdtemp(prefix="onboarding-load-")
+for _name, _value in {
+    "JOB_DB_PATH": os.path.join(_data_dir, "jobs.sqlite3"),
+    "JOB_SPOOL_DIR": os.path.join(_data_dir, "spool"),
+    "CONTENT_STORE_DIR": os.path.join(_data_dir, "content"),
+    "KEYWORD_INDEX_PATH": os.path.join(_data_dir, "keyword_index.sqlite3"),
+    "FAQ_STORE_PATH": os.path.join(_data_dir, "faq.json"),
+    "CHUNK_SIGNATURE_DB_PATH": os.path.join(_data_dir, "chunk_signatures.sqlite3"),
+}.items():
+    os.environ[_name] = _value
+for _name, _value in {
+    "AZURE_OPENAI_ENDPOINT": "https://load-test.openai.azure.com",
+    "AZURE_OPENAI_API_KEY": "load-test",
+    "AZURE_OPENAI_API_VERSION": "2024-10-21",
+    "AZURE_OPENAI_DEPLOYMENT_NAME": "load-test",
+    "AZURE_SEARCH_ENDPOINT": "https://load-test.search.windows.net",
+    "AZURE_SEARCH_API_KEY": "load-test",
+    "AZURE_SEARCH_INDEX_NAME": "onboarding-index",
+    "AZURE_STORAGE_CONNECTION_STRING": (
+        "DefaultEndpointsProtocol=https;AccountName=loadtest;"
+        "AccountKey=bG9hZHRlc3Q=;EndpointSuffix=core.windows.net"
+    ),
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from async_runner import run_sync  # noqa: E402
+from azure_config import azure_config  # noqa: E402
+from conversation import Conversation  # noqa: E402
+from document_processor import document_processor  # noqa: E402
+from document_uploader import LocalFile  # noqa: E402
+from faq_store import faq_store  # noqa: E402
+from job_queue import FINISHED_STATES, JobWorker, job_queue  # noqa: E402
+from keyword_index import keyword_index  # noqa: E402
+from rate_limiter import openai_rate_limiter  # noqa: E402
+
+WORDS = (
+    "배포 파이프라인 Jenkins ArgoCD 쿠버네티스 클러스터 Kafka 토픽 주문 결제 이벤트 "
+    "컨슈머 그룹 PostgreSQL 백업 복구 절차 Redis 캐시 세션 TTL 온콜 Grafana 대시보드 "
+    "알림 채널 API 게이트웨이 인증 서버 설정 환경 변수 로그 모니터링 장애 대응"
+).split()
+
+QUESTIONS = [
+    "배포는 어떻게 하나요?",
+    "그건 누가 승인하나요?",
+    "Kafka 컨슈머 그룹은 어떻게 운영하나요?",
+    "장애가 나면 어디부터 확인하나요?",
+    "로컬 개발 환경 설정 방법을 알려주세요",
+]
+
+
+def jittered(mean, sigma=0.35):
+    """평균이 mean인 로그정규 분포 지연 시간"""
+    return random.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+
+
+class StubBackends:
+    """지연 시간만 흉내 내는 OpenAI / AI Search / Blob Storage 대체 클라이언트"""
+
+    def __init__(self, llm_base, llm_tps, search_latency, blob_latency):
+        self.llm_base = llm_base
+        self.llm_tps = llm_tps
+        self.search_latency = search_latency
+        self.blob_latency = blob_latency
+        self.chunks = []  # 인덱싱된 청크 (검색 대상)
+
+    def openai_client(self):
+        backends = self
+
+        async def create(messages, max_completion_tokens, **kwargs):
+            completion_tokens = min(max_completion_tokens, 400)
+            await asyncio.sleep(
+                jittered(backends.llm_base + completion_tokens / backends.llm_tps)
+            )
+            if kwargs.get("response_format"):
+                content = json.dumps(
+                    {
+                        "overview": "부하 테스트 문서 개요",
+                        "key_points": ["배포", "모니터링"],
+                        "technologies": [],
+                        "notes": [],
+                        "keywords": random.sample(WORDS[:12], 4),
+                        "questions": ["배포는 어떻게 하나요?"],
+                    },
+                    ensure_ascii=False,
+                )
+            else:
+                content = "부하 테스트 답변 " * (completion_tokens // 4)
+            prompt_tokens = sum(len(m["content"]) for m in messages) // 2
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                usage=SimpleNamespace(
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=prompt_tokens + completion_tokens,
+                    prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+                ),
+            )
+
+        async def close():
+            pass
+
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+            close=close,
+        )
+
+    def search_client(self, index_name=None):
+        backends = self
+
+        async def upload_documents(documents):
+            await asyncio.sleep(jittered(backends.search_latency))
+            backends.chunks.extend(documents)
+            return [SimpleNamespace(succeeded=True) for _ in documents]
+
+        async def search(search_text, top=5, **kwargs):
+            await asyncio.sleep(jittered(backends.search_latency))
+            sample = random.sample(backends.chunks, min(top, len(backends.chunks)))
+
+            async def results():
+                for rank, document in enumerate(sample):
+                    yield dict(document, **{"@search.score": 10.0 - rank})
+
+            return results()
+
+        async def get_document(key, selected_fields=None):
+            await asyncio.sleep(jittered(backends.search_latency / 2))
+            return next(d for d in backends.chunks if d["metadata_storage_path"] == key)
+
+        async def close():
+            pass
+
+        return SimpleNamespace(
+            upload_documents=upload_documents,
+            search=search,
+            get_document=get_document,
+            close=close,
+        )
+
+    def blob_service_client(self):
+        backends = self
+
+        async def upload_blob(data, overwrite=False, **kwargs):
+            await asyncio.sleep(jittered(backends.blob_latency))
+
+        async def close():
+            pass
+
+        return SimpleNamespace(
+            get_blob_client=lambda container, blob: SimpleNamespace(
+                url=f"https://loadtest.blob.core.windows.net/{container}/{blob}",
+                upload_blob=upload_blob,
+            ),
+            close=close,
+        )
+
+    def install(self):
+        azure_config.get_async_openai_client = self.openai_client
+        azure_config.get_async_search_client = self.search_client
+        azure_config.get_async_blob_service_client = self.blob_service_client
+        azure_config.get_vision_client = lambda: None
+
+
+class TimedLock:
+    """획득 대기 시간을 기록하는 threading.Lock 래퍼 (공유 자원 경합 측정)"""
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.waits = []
+
+    def acquire(self, blocking=True, timeout=-1):
+        started = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self.waits.append(time.perf_counter() - started)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def rss_mb():
+    """현재 프로세스 RSS (MB)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_document(rng, characters):
+    """무작위 단어로 만든 업로드용 텍스트 문서"""
+    words = []
+    while sum(len(w) + 1 for w in words) < characters:
+        words.append(rng.choice(WORDS))
+    return " ".join(words).encode("utf-8")
+
+
+class Stage:
+    """동시 사용자 수 한 단계의 측정값"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ask_latencies = []
+        self.upload_latencies = []
+        self.errors = 0
+        self.loop_lags = []
+        self.job_ids = []
+
+    def add(self, kind, latency):
+        with self.lock:
+            getattr(self, f"{kind}_latencies").append(latency)
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+
+def simulate_user(stage, user_index, deadline, args):
+    """세션 하나: 문서 업로드 후 처리를 기다리는 동안 질문 (종료 시각까지 반복)
+
+    앱처럼 rerun마다 작업 상태와 키워드 목록을 조회하고, 질문 전에 FAQ를 먼저 찾는다.
+    """
+    rng = random.Random(user_index)
+    session_id = uuid.uuid4().hex
+
+    def poll(job_id, started):
+        """작업 상태 조회 (끝났으면 True)"""
+        keyword_index.top_keywords(limit=20)
+        job = job_queue.get_jobs([job_id])[0]
+        if job["status"] not in FINISHED_STATES:
+            return False
+        if job["status"] == "done":
+            stage.add("upload", time.perf_counter() - started)
+        else:
+            stage.error()
+        return True
+
+    while time.time() < deadline:
+        upload_started = time.perf_counter()
+        file_name = f"user{user_index}_{uuid.uuid4().hex[:6]}.txt"
+        job_id = job_queue.enqueue(
+            LocalFile(file_name, make_document(rng, args.document_chars)),
+            session_id=session_id,
+        )
+        stage.job_ids.append(job_id)
+        finished = False
+
+        conversation = Conversation(
+            history_token_budget=azure_config.chat_history_token_budget,
+            recent_turns=azure_config.chat_recent_turns,
+        )
+        for question in rng.sample(QUESTIONS, min(args.questions, len(QUESTIONS))):
+            time.sleep(jittered(args.think_time))
+            if time.time() >= deadline:
+                return
+            if not finished:
+                finished = poll(job_id, upload_started)
+            started = time.perf_counter()
+            if faq_store.lookup(azure_config.project_name, question) is None:
+                result = document_processor.chat(conversation, question)
+                if not result["success"]:
+                    stage.error()
+                    continue
+            stage.add("ask", time.perf_counter() - started)
+
+        # 다음 문서는 이전 업로드가 끝난 뒤에 올림
+        while not finished and time.time() < deadline:
+            time.sleep(args.poll_interval)
+            finished = poll(job_id, upload_started)
+
+
+def drain(stage, timeout):
+    """단계가 끝난 뒤 남은 업로드 작업이 끝날 때까지 대기 (다음 단계 측정에 섞이지 않도록)"""
+    started = time.time()
+    while time.time() - started < timeout:
+        jobs = job_queue.get_jobs(stage.job_ids)
+        remaining = sum(1 for job in jobs if job["status"] not in FINISHED_STATES)
+        if not remaining:
+            return 0
+        time.sleep(0.5)
+    return remaining
+
+
+def probe_event_loop(stage, stop):
+    """공유 백그라운드 이벤트 루프가 코루틴을 시작하기까지의 지연 측정"""
+
+    async def started_at():
+        return time.perf_counter()
+
+    while not stop.is_set():
+        submitted = time.perf_counter()
+        stage.loop_lags.append(run_sync(started_at()) - submitted)
+        time.sleep(0.05)
+
+
+def run_stage(users, args, locks):
+    stage = Stage()
+    openai_rate_limiter.reset_metrics()
+    for lock in locks.values():
+        lock.waits.clear()
+
+    rss_before = rss_mb()
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_event_loop, args=(stage, stop), daemon=True)
+    prober.start()
+
+    started = time.time()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=simulate_user, args=(stage, i, deadline, args))
+        for i in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+    stop.set()
+    prober.join()
+
+    completed_uploads = len(stage.upload_latencies)
+    unfinished_uploads = len(stage.job_ids) - completed_uploads
+    remaining = drain(stage, args.drain_timeout)
+
+    metrics = openai_rate_limiter.get_metrics()
+    return {
+        "users": users,
+        "elapsed": elapsed,
+        "questions_per_second": len(stage.ask_latencies) / elapsed,
+        "uploads_per_minute": len(stage.upload_latencies) / elapsed * 60,
+        "ask_p50": percentile(stage.ask_latencies, 0.5),
+        "ask_p95": percentile(stage.ask_latencies, 0.95),
+        "ask_p99": percentile(stage.ask_latencies, 0.99),
+        "upload_p50": percentile(stage.upload_latencies, 0.5),
+        "upload_p95": percentile(stage.upload_latencies, 0.95),
+        "errors": stage.errors,
+        "unfinished_uploads": unfinished_uploads,
+        "undrained_uploads": remaining,
+        "rss_growth_mb": rss_mb() - rss_before,
+        "loop_lag_p95_ms": percentile(stage.loop_lags, 0.95) * 1000,
+        "rate_limit_wait_p95": metrics["p95_wait_seconds"],
+        "rate_limit_max_queue": metrics["max_queue_depth"],
+        "lock_wait_p95_ms": {
+            name: percentile(lock.waits, 0.95) * 1000 for name, lock in locks.items()
+        },
+    }
+
+
+def print_stage(result, out):
+    locks = ", ".join(
+        f"{name} {wait:.2f}ms" for name, wait in result["lock_wait_p95_ms"].items()
+    )
+    print(
+        f"👥 동시 사용자 {result['users']}명 ({result['elapsed']:.0f}초, 오류 {result['errors']}건, "
+        f"시간 내 미완료 업로드 {result['unfinished_uploads']}건)\n"
+        f"  처리량: 질문 {result['questions_per_second']:.2f}개/초, "
+        f"업로드 {result['uploads_per_minute']:.1f}개/분\n"
+        f"  질문 지연: p50 {result['ask_p50']:.2f}초, p95 {result['ask_p95']:.2f}초, "
+        f"p99 {result['ask_p99']:.2f}초\n"
+        f"  업로드 완료까지: p50 {result['upload_p50']:.2f}초, p95 {result['upload_p95']:.2f}초\n"
+        f"  메모리 증가: {result['rss_growth_mb']:+.1f}MB, "
+        f"이벤트 루프 지연 p95 {result['loop_lag_p95_ms']:.1f}ms\n"
+        f"  OpenAI 호출 제한 대기 p95 {result['rate_limit_wait_p95']:.2f}초 "
+        f"(최대 대기열 {result['rate_limit_max_queue']}), 락 대기 p95: {locks}",
+        file=out,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", default="1,5,10,25", help="단계별 동시 사용자 수")
+    parser.add_argument("--duration", type=float, default=30, help="단계별 실행 시간(초)")
+    parser.add_argument("--questions", type=int, default=3, help="업로드당 질문 수")
+    parser.add_argument("--think-time", type=float, default=1.0, help="질문 간 평균 대기(초)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="업로드 상태 조회 간격(초)")
+    parser.add_argument("--document-chars", type=int, default=20000)
+    parser.add_argument("--worker-concurrency", type=int, default=4)
+    parser.add_argument("--drain-timeout", type=float, default=300, help="단계 사이 남은 업로드 대기(초)")
+    parser.add_argument("--tpm", type=int, help="OpenAI 분당 토큰 할당량 (기본: AZURE_OPENAI_TPM)")
+    parser.add_argument("--rpm", type=int, help="OpenAI 분당 요청 할당량 (기본: AZURE_OPENAI_RPM)")
+    parser.add_argument(
+        "--interactive-reserve",
+        type=float,
+        help="대화형 호출 전용 할당량 비율 (기본: AZURE_OPENAI_INTERACTIVE_RESERVE)",
+    )
+    parser.add_argument("--llm-base", type=float, default=0.5, help="LLM 첫 토큰까지 평균 지연(초)")
+    parser.add_argument("--llm-tps", type=float, default=80, help="LLM 초당 출력 토큰 수")
+    parser.add_argument("--search-latency", type=float, default=0.08)
+    parser.add_argument("--blob-latency", type=float, default=0.05)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="워커/처리 로그 출력")
+    args = parser.parse_args()
+
+    StubBackends(
+        args.llm_base, args.llm_tps, args.search_latency, args.blob_latency
+    ).install()
+
+    if args.tpm:
+        openai_rate_limiter.tokens_per_minute = args.tpm
+    if args.rpm:
+        openai_rate_limiter.requests_per_minute = args.rpm
+    if args.interactive_reserve is not None:
+        openai_rate_limiter.interactive_reserve = args.interactive_reserve
+
+    # 세션 간 공유 자원의 락 대기 시간 측정
+    locks = {"faq_store": TimedLock(faq_store._lock)}
+    faq_store._lock = locks["faq_store"]
+
+    # 앱이 띄우는 별도 워커 프로세스 대신 같은 프로세스에서 워커 실행
+    worker = JobWorker(job_queue, concurrency=args.worker_concurrency, poll_interval=0.2)
+    threading.Thread(target=worker.run_forever, daemon=True).start()
+
+    # 처리 로그는 버리고 측정 결과만 출력
+    out = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, "w")
+
+    print(
+        f"로컬 데이터 디렉터리: {_data_dir}, OpenAI 할당량 "
+        f"{openai_rate_limiter.tokens_per_minute:,} TPM / "
+        f"{openai_rate_limiter.requests_per_minute:,} RPM",
+        file=out,
+    )
+    results = []
+    for users in [int(u) for u in args.users.split(",")]:
+        result = run_stage(users, args, locks)
+        results.append(result)
+        if not args.json:
+            print_stage(result, out)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2), file=out)
+    else:
+        baseline = results[0]
+        print("\n📈 단계별 요약 (질문 처리량 / p95 지연)", file=out)
+        for result in results:
+            scaling = (
+                result["questions_per_second"] / baseline["questions_per_second"]
+                if baseline["questions_per_second"]
+                else 0.0
+            )
+            print(
+                f"  {result['users']:>4}명: {result['questions_per_second']:6.2f}개/초 "
+                f"(x{scaling:.1f}), p95 {result['ask_p95']:.2f}초, "
+                f"메모리 {result['rss_growth_mb']:+.1f}MB",
+                file=out,
+            )
+
+
+if __name__ == "__main__":
+    main()
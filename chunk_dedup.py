@@ -0,0 +1,316 @@
+# chunk_dedup.py
+import hashlib
+import os
+import re
+import sqlite3
+
+import numpy as np
+
+# 중복 청크 처리 방식
+DEDUP_OFF = "off"  # 검사하지 않음
+DEDUP_LINK = "link"  # 인덱싱은 하되 대표 청크와 연결, 검색 시 같은 대표의 결과는 하나만 남김
+DEDUP_SKIP = "skip"  # 다른 문서와 거의 같은 청크는 인덱싱하지 않음
+
+SHINGLE_SIZE = 5  # 글자 단위 shingle 길이
+NUM_PERM = 128  # MinHash 서명 길이
+BANDS = 16  # LSH 밴드 수 (밴드당 8행, 약 0.7 이상 유사도에서 후보로 잡힘)
+ROWS = NUM_PERM // BANDS
+
+_SHINGLE_PRIME = np.uint64(1000003)
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """공백/대소문자를 정규화한 텍스트의 글자 shingle 해시 (uint64, 중복 제거)"""
+    normalized = re.sub(r"\s+", " ", text.lower()).strip()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(
+        np.uint64
+    )
+    if len(codes) == 0:
+        return codes
+    if len(codes) < size:
+        size = len(codes)
+
+    # 다항식 롤링 해시 (uint64 오버플로는 mod 2^64로 동작)
+    count = len(codes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_PRIME + codes[offset : offset + count]
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """multiply-shift 해시 NUM_PERM개로 MinHash 서명 계산 (시드 고정이라 프로세스 간 서명 호환)"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=20240601):
+        rng = np.random.default_rng(seed)
+        self.seeds = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        # multiply-shift 해시의 곱수는 홀수
+        self.multipliers = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) * 2 + 1
+
+    def signature(self, text):
+        """텍스트의 MinHash 서명 (uint32 배열, 빈 텍스트는 None)"""
+        hashes = shingle_hashes(text)
+        if len(hashes) == 0:
+            return None
+        mixed = (hashes[None, :] ^ self.seeds[:, None]) * self.multipliers[:, None]
+        return (mixed >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def band_buckets(signature):
+    """LSH 밴드별 버킷 값 (SQLite INTEGER 범위의 부호 있는 64비트)"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                signature[band * ROWS : (band + 1) * ROWS].tobytes(), digest_size=8
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def estimated_similarity(left, right):
+    """두 서명의 일치 비율 (Jaccard 유사도 추정치)"""
+    return float(np.mean(left == right))
+
+
+class ChunkDeduplicator:
+    """청크 MinHash 서명과 LSH 버킷을 SQLite에 보관하며 다른 문서의 거의 같은 청크를 찾음"""
+
+    def __init__(self, db_path, threshold=0.85):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.hasher = MinHasher()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_key TEXT PRIMARY KEY,
+                    document_id TEXT NOT NULL,
+                    canonical_key TEXT,
+                    signature BLOB NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS chunks_document ON chunks (document_id)"
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    chunk_key TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS buckets_chunk ON buckets (chunk_key)"
+            )
+        finally:
+            conn.close()
+
+    def _remove_document(self, conn, document_id):
+        """잠금을 잡은 상태에서 문서의 청크 서명 제거"""
+        conn.execute(
+            "DELETE FROM buckets WHERE chunk_key IN "
+            "(SELECT chunk_key FROM chunks WHERE document_id = ?)",
+            (document_id,),
+        )
+        conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+
+    def _find_canonical(self, conn, document_id, signature, buckets, own_keys=()):
+        """다른 문서에서 임계값 이상 유사한 청크의 대표 키 (없으면 None)
+
+        own_keys(다시 등록하는 문서의 이전/현재 청크 키)를 대표로 가리키는 청크는 이 문서 청크의
+        사본이므로 후보에서 제외한다 (자기 자신과 연결되거나 인덱싱되지 않은 사본과 연결되지 않도록).
+        """
+        candidates = set()
+        for band, bucket in enumerate(buckets):
+            rows = conn.execute(
+                "SELECT chunk_key FROM buckets WHERE band = ? AND bucket = ?",
+                (band, bucket),
+            ).fetchall()
+            candidates.update(row["chunk_key"] for row in rows)
+        if not candidates:
+            return None
+
+        best_key, best_score = None, self.threshold
+        placeholders = ",".join("?" * len(candidates))
+        rows = conn.execute(
+            f"SELECT chunk_key, document_id, canonical_key, signature FROM chunks "
+            f"WHERE chunk_key IN ({placeholders})",
+            list(candidates),
+        ).fetchall()
+        for row in rows:
+            if row["document_id"] == document_id or row["canonical_key"] in own_keys:
+                continue
+            score = estimated_similarity(
+                signature, np.frombuffer(row["signature"], dtype=np.uint32)
+            )
+            if score >= best_score:
+                best_key = row["canonical_key"] or row["chunk_key"]
+                best_score = score
+        return best_key
+
+    def register_document(self, document_id, chunk_keys, chunks):
+        """문서 청크 서명을 저장하고 다른 문서의 거의 같은 청크와 연결 ({청크 키: 대표 키} 반환)
+
+        같은 문서를 다시 등록하면 이전 서명을 교체한다.
+        """
+        signatures = [self.hasher.signature(chunk) for chunk in chunks]
+
+        duplicates = {}
+        conn = self._connect()
+        try:
+            # 동시에 등록되는 다른 개정판과 서로 놓치지 않도록 쓰기 잠금 후 조회
+            conn.execute("BEGIN IMMEDIATE")
+            own_keys = set(chunk_keys) | {
+                row["chunk_key"]
+                for row in conn.execute(
+                    "SELECT chunk_key FROM chunks WHERE document_id = ?", (document_id,)
+                )
+            }
+            self._remove_document(conn, document_id)
+            for chunk_key, signature in zip(chunk_keys, signatures):
+                if signature is None:
+                    continue
+                buckets = band_buckets(signature)
+                canonical_key = self._find_canonical(
+                    conn, document_id, signature, buckets, own_keys
+                )
+                if canonical_key:
+                    duplicates[chunk_key] = canonical_key
+                conn.execute(
+                    "INSERT OR REPLACE INTO chunks "
+                    "(chunk_key, document_id, canonical_key, signature) VALUES (?, ?, ?, ?)",
+                    (chunk_key, document_id, canonical_key, signature.tobytes()),
+                )
+                conn.executemany(
+                    "INSERT INTO buckets (band, bucket, chunk_key) VALUES (?, ?, ?)",
+                    [(band, bucket, chunk_key) for band, bucket in enumerate(buckets)],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return duplicates
+
+    def _promote_dependents(self, conn, document_id):
+        """문서 청크를 대표로 가리키던 다른 문서 청크 중 하나를 새 대표로 올림
+
+        대표 청크마다 키 순서상 첫 청크가 새 대표가 되고 나머지는 그 청크를 가리킨다.
+        {새 대표 청크 키: 문서 ID} 반환
+        """
+        rows = conn.execute(
+            "SELECT c.chunk_key, c.document_id, c.canonical_key FROM chunks c "
+            "JOIN chunks r ON c.canonical_key = r.chunk_key "
+            "WHERE r.document_id = ? AND c.document_id != ? ORDER BY c.chunk_key",
+            (document_id, document_id),
+        ).fetchall()
+
+        promoted = {}
+        replacements = {}
+        for row in rows:
+            new_key = replacements.setdefault(row["canonical_key"], row["chunk_key"])
+            if new_key == row["chunk_key"]:
+                promoted[new_key] = row["document_id"]
+                new_key = None
+            conn.execute(
+                "UPDATE chunks SET canonical_key = ? WHERE chunk_key = ?",
+                (new_key, row["chunk_key"]),
+            )
+        return promoted
+
+    def remove_document(self, document_id):
+        """문서의 청크 서명 제거 후 대표를 잃은 청크를 새 대표로 올림 ({새 대표 청크 키: 문서 ID} 반환)
+
+        skip 모드에서 새 대표가 된 청크는 인덱싱되지 않은 상태이므로 해당 문서를 다시 인덱싱해야 한다.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            promoted = self._promote_dependents(conn, document_id)
+            self._remove_document(conn, document_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return promoted
+
+    def document_chunk_keys(self, document_id):
+        """문서의 등록된 청크 키 목록 (중복으로 인덱싱을 건너뛴 청크 포함)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT chunk_key FROM chunks WHERE document_id = ?", (document_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row["chunk_key"] for row in rows]
+
+    def has_document(self, document_id):
+        """문서 청크 서명이 등록되어 있는지 확인"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM chunks WHERE document_id = ? LIMIT 1", (document_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def canonical_keys(self, chunk_keys):
+        """청크 키 -> 대표 키 (등록되지 않았거나 대표인 청크는 자기 자신)"""
+        chunk_keys = list(chunk_keys)
+        if not chunk_keys:
+            return {}
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(chunk_keys))
+            rows = conn.execute(
+                f"SELECT chunk_key, canonical_key FROM chunks WHERE chunk_key IN ({placeholders})",
+                chunk_keys,
+            ).fetchall()
+        finally:
+            conn.close()
+        canonical = {row["chunk_key"]: row["canonical_key"] for row in rows}
+        return {key: canonical.get(key) or key for key in chunk_keys}
+
+    def collapse_results(self, results):
+        """검색 결과에서 같은 대표 청크를 가리키는 결과는 점수가 가장 높은 하나만 남김"""
+        canonical = self.canonical_keys(r.storage_path for r in results)
+        seen = set()
+        collapsed = []
+        for result in results:
+            key = canonical.get(result.storage_path, result.storage_path)
+            if key in seen:
+                continue
+            seen.add(key)
+            collapsed.append(result)
+        return collapsed
+
+
+# 전역 중복 청크 검출기 객체
+chunk_deduplicator = ChunkDeduplicator(
+    os.getenv("CHUNK_SIGNATURE_DB_PATH", os.path.join("data", "chunk_signatures.sqlite3")),
+    threshold=float(os.getenv("DEDUP_THRESHOLD", "0.85")),
+)
@@ -0,0 +1,127 @@
+# content_store.py
+import hashlib
+import json
+import mmap
+import os
+import uuid
+import zlib
+
+from records import ProcessedFile
+
+
+class ContentStore:
+    """내용 주소 기반(SHA-256) 압축 저장소 - 추출 텍스트와 분석 결과를 세션 메모리 밖에 보관"""
+
+    def __init__(self, root, compression_level=6):
+        self.root = root
+        self.compression_level = compression_level
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        """키 앞 2자리로 디렉터리를 나눈 저장 경로"""
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def put_bytes(self, data):
+        """데이터를 압축 저장하고 키 반환 (같은 내용은 한 번만 저장)"""
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(data, self.compression_level))
+        os.replace(tmp_path, path)
+        return key
+
+    def get_bytes(self, key):
+        """저장된 데이터를 메모리 매핑으로 읽어 압축 해제"""
+        with open(self._path(key), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return zlib.decompress(mapped)
+
+    def put_text(self, text):
+        """텍스트 저장 후 키 반환"""
+        return self.put_bytes(text.encode("utf-8"))
+
+    def get_text(self, key):
+        """저장된 텍스트 읽기"""
+        return self.get_bytes(key).decode("utf-8")
+
+    def put_json(self, value):
+        """JSON 값 저장 후 키 반환"""
+        return self.put_bytes(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def get_json(self, key):
+        """저장된 JSON 값 읽기"""
+        return json.loads(self.get_bytes(key))
+
+    def exists(self, key):
+        """키에 해당하는 내용이 저장되어 있는지 확인"""
+        return os.path.exists(self._path(key))
+
+
+def make_session_record(result):
+    """문서 처리 결과를 세션용 ProcessedFile로 변환 (텍스트와 분석 결과는 저장소에 보관)"""
+    analysis_key = None
+    if "processing_results" in result:
+        analysis_key = content_store.put_json(result["processing_results"])
+    return ProcessedFile(
+        document_id=result["document_id"],
+        file_name=result["file_name"],
+        file_type=result["file_type"],
+        file_size=result["file_size"],
+        blob_url=result["blob_url"],
+        blob_name=result["blob_name"],
+        text_length=len(result["extracted_text"]),
+        text_key=content_store.put_text(result["extracted_text"]),
+        analysis_key=analysis_key,
+        processing_error=result.get("processing_error"),
+        success=result["success"],
+    )
+
+
+def load_extracted_text(file_result):
+    """처리 결과 dict 또는 ProcessedFile에서 추출 텍스트 읽기"""
+    if isinstance(file_result, ProcessedFile):
+        text_key, document_id = file_result.text_key, file_result.document_id
+    else:
+        if "extracted_text" in file_result:
+            return file_result["extracted_text"]
+        text_key, document_id = file_result.get("text_key"), file_result.get("document_id")
+    if text_key and content_store.exists(text_key):
+        return content_store.get_text(text_key)
+
+    # 로컬 저장소에 없으면 Blob Storage 사이드카에서 다시 받아 캐시
+    if document_id:
+        from document_uploader import document_uploader
+
+        try:
+            sidecar = document_uploader.read_extracted_text(document_id)
+        except Exception as e:
+            print(f"⚠️ 추출 텍스트 사이드카 읽기 실패: {str(e)}")
+            sidecar = None
+        if sidecar:
+            content_store.put_text(sidecar["text"])
+            return sidecar["text"]
+    return ""
+
+
+def load_processing_results(file_result):
+    """처리 결과 dict, ProcessedFile 또는 체크포인트 레코드에서 분석 결과(요약, 키워드, 인덱싱) 읽기"""
+    if isinstance(file_result, ProcessedFile):
+        analysis_key = file_result.analysis_key
+    else:
+        if "processing_results" in file_result:
+            return file_result["processing_results"]
+        analysis_key = file_result.get("analysis_key")
+    if analysis_key:
+        return content_store.get_json(analysis_key)
+    return {}
+
+
+# 전역 저장소 객체
+content_store = ContentStore(
+    os.getenv("CONTENT_STORE_DIR", os.path.join("data", "content"))
+)
@@ -0,0 +1,145 @@
+# context_builder.py
+import re
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken 미설치 시 근사치 사용
+    _ENCODING = None
+
+CHUNK_PATH_PATTERN = re.compile(r"^doc_(?P<document>[0-9a-zA-Z]+)_chunk_(?P<index>\d+)$")
+
+MIN_OVERLAP_CHARS = 20  # 이보다 짧은 일치는 우연으로 보고 병합하지 않음
+MIN_DUPLICATE_LINE_CHARS = 30  # 중복 제거 대상 줄의 최소 길이
+MIN_TRUNCATED_TOKENS = 100  # 남은 예산이 이보다 작으면 잘라서 넣지 않음
+
+
+def estimate_tokens(text):
+    """토큰 수 추정 (tiktoken이 없으면 ASCII 4자당 1토큰, 그 외 문자 1자당 1토큰)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def parse_chunk_path(storage_path):
+    """doc_<id>_chunk_<n> 키에서 (문서 키, 청크 번호) 추출"""
+    match = CHUNK_PATH_PATTERN.match(storage_path or "")
+    if not match:
+        return storage_path, None
+    return match.group("document"), int(match.group("index"))
+
+
+def merge_overlapping(left, right, max_overlap=400):
+    """left의 끝과 right의 시작이 겹치면 겹치는 부분을 한 번만 남기고 연결"""
+    limit = min(len(left), len(right), max_overlap)
+    for size in range(limit, MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return left + "\n" + right
+
+
+def _merge_adjacent(search_results):
+    """같은 문서의 연속/중복 청크를 하나의 구간으로 병합 (search_results는 SearchHit 목록)"""
+    by_document = {}
+    standalone = []
+    for result in search_results:
+        index = result.chunk_index
+        if index is None:
+            standalone.append(
+                {
+                    "file_name": result.file_name,
+                    "text": result.content,
+                    "score": result.score,
+                    "chunks": [result.storage_path],
+                }
+            )
+            continue
+        chunks = by_document.setdefault(result.document_key, {})
+        if index not in chunks or chunks[index].score < result.score:
+            chunks[index] = result
+
+    segments = []
+    for document_key, chunks in by_document.items():
+        segment = None
+        previous_index = None
+        for index in sorted(chunks):
+            result = chunks[index]
+            if segment is not None and index == previous_index + 1:
+                segment["text"] = merge_overlapping(segment["text"], result.content)
+                segment["score"] = max(segment["score"], result.score)
+                segment["chunks"].append(result.storage_path)
+            else:
+                segment = {
+                    "file_name": result.file_name,
+                    "text": result.content,
+                    "score": result.score,
+                    "chunks": [result.storage_path],
+                }
+                segments.append(segment)
+            previous_index = index
+
+    return segments + standalone
+
+
+def _remove_duplicate_lines(text, seen_lines):
+    """이미 컨텍스트에 포함된 긴 줄을 제거"""
+    kept = []
+    for line in text.split("\n"):
+        normalized = " ".join(line.split()).lower()
+        if len(normalized) >= MIN_DUPLICATE_LINE_CHARS:
+            if normalized in seen_lines:
+                continue
+            seen_lines.add(normalized)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def _truncate_to_tokens(text, max_tokens):
+    """토큰 예산에 맞게 텍스트 뒷부분을 잘라냄"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = int(len(text) * max_tokens / tokens)
+    while cut > 0 and estimate_tokens(text[:cut]) > max_tokens:
+        cut = int(cut * 0.9)
+    return text[:cut].rstrip() + " ..."
+
+
+def build_context(search_results, token_budget=4000):
+    """검색 결과로 토큰 예산 내의 답변 컨텍스트 구성 (인접 청크 병합, 중복 구간 제거, 점수순 채움)"""
+    segments = sorted(
+        _merge_adjacent(search_results), key=lambda s: s["score"], reverse=True
+    )
+
+    context_parts = []
+    sources = []
+    used_chunks = []
+    used_tokens = 0
+    seen_lines = set()
+
+    for segment in segments:
+        text = _remove_duplicate_lines(segment["text"], seen_lines)
+        if not text:
+            continue
+
+        header = f"[문서: {segment['file_name']}]\n"
+        remaining = token_budget - used_tokens - estimate_tokens(header)
+        if remaining < MIN_TRUNCATED_TOKENS:
+            break
+
+        text = _truncate_to_tokens(text, remaining)
+        part = header + text
+        context_parts.append(part)
+        used_tokens += estimate_tokens(part)
+        used_chunks.extend(segment["chunks"])
+        if segment["file_name"] not in sources:
+            sources.append(segment["file_name"])
+
+    return {
+        "context": "\n\n".join(context_parts),
+        "sources": sources,
+        "used_chunks": used_chunks,
+        "token_count": used_tokens,
+    }
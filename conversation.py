@@ -0,0 +1,72 @@
+# conversation.py
+from context_builder import estimate_tokens
+
+# 대화 기록에 넣는 답변 최대 길이 (긴 답변 하나가 예산을 다 쓰지 않도록)
+MAX_HISTORY_ANSWER_CHARS = 1200
+
+
+class Conversation:
+    """멀티턴 대화 상태: 오래된 대화는 누적 요약으로, 최근 대화만 원문으로 유지
+
+    요약 + 최근 대화 원문이 history_token_budget을 넘지 않도록 오래된 대화부터 요약으로 옮긴다.
+    """
+
+    def __init__(self, history_token_budget=2000, recent_turns=3):
+        self.history_token_budget = history_token_budget
+        self.recent_turns = recent_turns
+        self.summary = ""
+        self.turns = []  # {"question", "answer"} (최근 대화 원문)
+        self.turn_count = 0
+
+    def add_turn(self, question, answer):
+        """질의응답 한 턴 추가"""
+        self.turns.append(
+            {"question": question, "answer": answer[:MAX_HISTORY_ANSWER_CHARS]}
+        )
+        self.turn_count += 1
+
+    def _turn_tokens(self, turn):
+        return estimate_tokens(turn["question"]) + estimate_tokens(turn["answer"])
+
+    def history_tokens(self):
+        """프롬프트에 들어가는 대화 기록 토큰 수 (추정)"""
+        summary_tokens = estimate_tokens(self.summary) if self.summary else 0
+        return summary_tokens + sum(self._turn_tokens(turn) for turn in self.turns)
+
+    def turns_to_compress(self):
+        """요약으로 옮겨야 할 오래된 턴 (최근 턴 수와 토큰 예산 기준, 마지막 턴은 유지)"""
+        count = max(0, len(self.turns) - self.recent_turns)
+        tokens = self.history_tokens() - sum(
+            self._turn_tokens(turn) for turn in self.turns[:count]
+        )
+        while count < len(self.turns) - 1 and tokens > self.history_token_budget:
+            tokens -= self._turn_tokens(self.turns[count])
+            count += 1
+        return self.turns[:count]
+
+    def apply_summary(self, summary, compressed_count):
+        """오래된 턴을 누적 요약으로 교체"""
+        self.summary = summary
+        self.turns = self.turns[compressed_count:]
+
+    def history_messages(self):
+        """채팅 완성 호출에 넣을 대화 기록 메시지"""
+        messages = []
+        if self.summary:
+            messages.append(
+                {"role": "system", "content": f"이전 대화 요약:\n{self.summary}"}
+            )
+        for turn in self.turns:
+            messages.append({"role": "user", "content": turn["question"]})
+            messages.append({"role": "assistant", "content": turn["answer"]})
+        return messages
+
+    def transcript(self, answer_chars=300):
+        """질의 재작성용 대화 기록 텍스트 (답변은 앞부분만)"""
+        lines = []
+        if self.summary:
+            lines.append(f"[이전 대화 요약]\n{self.summary}")
+        for turn in self.turns:
+            lines.append(f"사용자: {turn['question']}")
+            lines.append(f"답변: {turn['answer'][:answer_chars]}")
+        return "\n".join(lines)
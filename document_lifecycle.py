@@ -0,0 +1,448 @@
+# document_lifecycle.py
+"""문서 삭제와 보존 기간 정리 (AI Search 청크 + Blob Storage 원본/사이드카 + 로컬 인덱스)
+
+사용 예:
+    python document_lifecycle.py delete <document_id> [<document_id> ...]
+    python document_lifecycle.py purge --older-than-days 180 --dry-run
+    python document_lifecycle.py purge --orphans
+
+문서의 청크는 필터 조회로 키만 받아 1000개씩 묶어 삭제하고,
+`document_id/` 아래 blob(원본, 추출 텍스트 사이드카)은 256개씩 묶어 삭제한다.
+이미 지워진 항목은 건너뛰므로 중단 후 다시 실행해도 된다.
+고아 문서 검색은 인덱스 전체 키를 조회하므로 검색 API의 페이지 조회 한도(10만 건) 안에서만 동작한다.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from async_document_processor import AsyncDocumentProcessor
+from async_document_uploader import AsyncDocumentUploader
+from azure_config import azure_config
+from chunk_dedup import DEDUP_SKIP, chunk_deduplicator
+from context_builder import parse_chunk_path
+from document_uploader import LocalFile, document_uploader
+from job_queue import job_queue
+from keyword_index import keyword_index
+from search_schema import (
+    chunk_key_filter,
+    document_chunk_filter,
+    document_id_from_key,
+)
+from sidecar import is_sidecar
+
+# 검색 인덱스 일괄 삭제 한도 (요청당 문서 수)
+INDEX_DELETE_BATCH = 1000
+
+# Blob 일괄 삭제 한도 (batch 요청당 blob 수)
+BLOB_DELETE_BATCH = 256
+
+# 파일명을 모르는 기존 스키마 문서의 청크 키를 한 번에 확인하는 개수
+KEY_PROBE_WINDOW = 200
+
+
+def document_id_from_blob(blob_name):
+    """`document_id/파일명` blob 이름에서 문서 ID 추출 (형식이 다르면 None)"""
+    prefix, _, rest = blob_name.partition("/")
+    if not rest or "/" in rest:
+        return None
+    try:
+        return str(uuid.UUID(prefix))
+    except ValueError:
+        return None
+
+
+def batched(items, size):
+    """목록을 size개씩 나눔"""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class DocumentLifecycle:
+    """문서 단위 삭제와 보존 기간/고아 문서 정리"""
+
+    def __init__(self, processor=None, uploader=None):
+        self.processor = processor or AsyncDocumentProcessor()
+        self.uploader = uploader or AsyncDocumentUploader(processor=self.processor)
+
+    @property
+    def search_client(self):
+        return self.processor.search_client
+
+    @property
+    def container_client(self):
+        return self.uploader.blob_service_client.get_container_client(
+            azure_config.storage_container_name
+        )
+
+    async def close(self):
+        """비동기 클라이언트 연결 종료"""
+        await self.processor.close()
+        await self.uploader.close()
+
+    async def _search_keys(self, search_filter):
+        """필터에 맞는 청크 키 목록 (본문은 받지 않음)"""
+        results = await self.search_client.search(
+            search_text="*", filter=search_filter, select=["metadata_storage_path"]
+        )
+        return [result["metadata_storage_path"] async for result in results]
+
+    async def find_chunk_keys(self, document_id, file_name=None):
+        """문서의 인덱스 청크 키 조회
+
+        compact 스키마는 document_id로, 기존 스키마는 파일명으로 좁힌 뒤 키의 문서 ID로 거른다.
+        파일명도 모르면 doc_<id>_chunk_<n> 키를 구간별로 확인한다.
+        앞쪽 청크가 중복으로 인덱싱되지 않았을 수 있으므로 알려진 청크 수까지는 빈 구간이 있어도
+        계속 확인하고, 그 뒤로는 빈 구간이 나오면 종료한다.
+        """
+        search_filter = document_chunk_filter(
+            self.processor.search_schema, document_id, file_name
+        )
+        if search_filter:
+            keys = await self._search_keys(search_filter)
+            return [key for key in keys if document_id_from_key(key) == document_id]
+
+        chunk_count = await self.known_chunk_count(document_id)
+        keys = []
+        start = 0
+        while True:
+            found = await self._search_keys(
+                chunk_key_filter(document_id, start, KEY_PROBE_WINDOW)
+            )
+            keys.extend(found)
+            start += KEY_PROBE_WINDOW
+            if not found and start >= chunk_count:
+                return keys
+
+    async def known_chunk_count(self, document_id):
+        """중복 검출 DB와 사이드카로 알 수 있는 문서의 청크 수 (모르면 0)"""
+        registered = await asyncio.to_thread(
+            chunk_deduplicator.document_chunk_keys, document_id
+        )
+        indexes = [parse_chunk_path(key)[1] for key in registered]
+        count = max((index + 1 for index in indexes if index is not None), default=0)
+
+        sidecar = await self.uploader.read_extracted_text(document_id)
+        if sidecar:
+            count = max(count, len(self.processor.chunk_text(sidecar["text"])))
+        return count
+
+    async def list_document_blobs(self, document_id):
+        """문서 폴더(document_id/)의 blob 목록"""
+        return [
+            blob
+            async for blob in self.container_client.list_blobs(
+                name_starts_with=f"{document_id}/"
+            )
+        ]
+
+    async def delete_index_keys(self, keys):
+        """청크 키를 묶음 단위로 삭제하고 (삭제, 실패) 건수 반환 (없는 키 삭제도 성공으로 처리됨)"""
+        deleted = failed = 0
+        for batch in batched(list(keys), INDEX_DELETE_BATCH):
+            results = await self.search_client.delete_documents(
+                documents=[{"metadata_storage_path": key} for key in batch]
+            )
+            succeeded = sum(1 for result in results if result.succeeded)
+            deleted += succeeded
+            failed += len(batch) - succeeded
+        return deleted, failed
+
+    async def delete_blobs(self, blob_names):
+        """blob을 묶음 단위로 삭제하고 (삭제, 이미 없음, 실패) 건수 반환"""
+        deleted = missing = failed = 0
+        for batch in batched(list(blob_names), BLOB_DELETE_BATCH):
+            responses = await self.container_client.delete_blobs(
+                *batch, raise_on_any_failure=False
+            )
+            async for response in responses:
+                if response.status_code == 202:
+                    deleted += 1
+                elif response.status_code == 404:
+                    missing += 1
+                else:
+                    failed += 1
+        return deleted, missing, failed
+
+    async def _load_document(self, document_id):
+        """다시 인덱싱할 문서 정보 (사이드카 우선, 없으면 원본에서 추출), 원본이 없으면 None"""
+        originals = [
+            blob.name
+            for blob in await self.list_document_blobs(document_id)
+            if not is_sidecar(blob.name)
+        ]
+        if not originals:
+            return None
+        file_name = originals[0].split("/", 1)[1]
+
+        sidecar = await self.uploader.read_extracted_text(document_id)
+        if sidecar:
+            text = sidecar["text"]
+        else:
+            downloader = await self.container_client.download_blob(originals[0])
+            data = await downloader.readall()
+            text, page_offsets = await asyncio.to_thread(
+                document_uploader.extract_text_with_pages, LocalFile(file_name, data)
+            )
+            if not text:
+                raise Exception("텍스트를 추출할 수 없습니다.")
+            await self.uploader.upload_extracted_text(document_id, text, page_offsets)
+
+        return {
+            "document_id": document_id,
+            "file_name": file_name,
+            "file_type": file_name.rsplit(".", 1)[-1].lower(),
+            "extracted_text": text,
+        }
+
+    async def reindex_documents(self, document_ids):
+        """중복으로 인덱싱을 건너뛴 청크의 대표가 삭제된 문서들을 다시 인덱싱
+
+        (성공한 문서 수, 실패한 문서 ID 목록) 반환 - 한 문서가 실패해도 나머지는 계속 처리한다.
+        """
+        reindexed = 0
+        failed = []
+        for document_id in document_ids:
+            try:
+                document_result = await self._load_document(document_id)
+                if document_result is None:
+                    continue
+                index_result = await self.processor.index_document(document_result)
+                if not index_result["success"]:
+                    raise Exception(index_result["error"])
+                reindexed += 1
+            except Exception as e:
+                print(f"❌ {document_id} 재인덱싱 실패: {str(e)}")
+                failed.append(document_id)
+        return reindexed, failed
+
+    async def delete_document(self, document_id, file_name=None):
+        """문서의 인덱스 청크, 로컬 인덱스 항목, blob(원본/사이드카)을 삭제하고 건수 반환
+
+        검색에서 먼저 빠지도록 인덱스 → 로컬 인덱스 → blob 순으로 지운다.
+        blob이 남아 있으면 다시 실행할 때 파일명을 다시 알 수 있다.
+        """
+        try:
+            blobs = await self.list_document_blobs(document_id)
+            if file_name is None:
+                originals = [b.name for b in blobs if not is_sidecar(b.name)]
+                if originals:
+                    file_name = originals[0].split("/", 1)[1]
+
+            chunk_keys = await self.find_chunk_keys(document_id, file_name)
+            deleted_chunks, failed_chunks = await self.delete_index_keys(chunk_keys)
+            if failed_chunks:
+                raise Exception(f"청크 {failed_chunks}개 삭제 실패")
+
+            await asyncio.to_thread(keyword_index.remove_document, document_id)
+            promoted = await asyncio.to_thread(
+                chunk_deduplicator.remove_document, document_id
+            )
+            # skip 모드에서는 새 대표가 된 청크가 인덱스에 없으므로 해당 문서를 다시 인덱싱
+            reindexed, reindex_failed = 0, []
+            if promoted and self.processor.dedup_mode == DEDUP_SKIP:
+                reindexed, reindex_failed = await self.reindex_documents(
+                    sorted(set(promoted.values()))
+                )
+            removed_jobs = await asyncio.to_thread(
+                job_queue.remove_document_jobs, [document_id]
+            )
+
+            deleted_blobs, missing_blobs, failed_blobs = await self.delete_blobs(
+                [blob.name for blob in blobs]
+            )
+            if failed_blobs:
+                raise Exception(f"blob {failed_blobs}개 삭제 실패")
+            # 문서 자체는 지워졌지만 중복으로 건너뛴 청크가 인덱스에 없는 문서가 남음
+            if reindex_failed:
+                raise Exception(
+                    f"문서는 삭제했지만 다음 문서의 재인덱싱 실패 "
+                    f"(reindex.py로 다시 인덱싱 필요): {', '.join(reindex_failed)}"
+                )
+
+            return {
+                "success": True,
+                "document_id": document_id,
+                "file_name": file_name,
+                "deleted_chunks": deleted_chunks,
+                "deleted_blobs": deleted_blobs,
+                "missing_blobs": missing_blobs,
+                "promoted_chunks": len(promoted),
+                "reindexed_documents": reindexed,
+                "removed_jobs": removed_jobs,
+            }
+
+        except Exception as e:
+            return {"success": False, "document_id": document_id, "error": str(e)}
+
+    async def delete_documents(self, document_ids, max_concurrency=8):
+        """여러 문서를 최대 max_concurrency개씩 동시에 삭제하고 합계 보고 반환"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        started = time.perf_counter()
+
+        async def delete(document_id):
+            async with semaphore:
+                result = await self.delete_document(document_id)
+            if result["success"]:
+                print(
+                    f"🗑️ {document_id} ({result['file_name'] or '파일명 없음'}): "
+                    f"청크 {result['deleted_chunks']}개, blob {result['deleted_blobs']}개 삭제"
+                )
+            else:
+                print(f"❌ {document_id}: {result['error']}")
+            return result
+
+        results = await asyncio.gather(*(delete(d) for d in document_ids))
+        succeeded = [r for r in results if r["success"]]
+        return {
+            "documents": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "deleted_chunks": sum(r["deleted_chunks"] for r in succeeded),
+            "deleted_blobs": sum(r["deleted_blobs"] for r in succeeded),
+            "missing_blobs": sum(r["missing_blobs"] for r in succeeded),
+            "reindexed_documents": sum(r["reindexed_documents"] for r in succeeded),
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+            "results": results,
+        }
+
+    async def scan_container(self):
+        """컨테이너의 문서 폴더 목록 {문서 ID: {"file_name", "blobs", "has_original", "uploaded_at"}}"""
+        documents = {}
+        async for blob in self.container_client.list_blobs():
+            document_id = document_id_from_blob(blob.name)
+            if document_id is None:
+                continue
+            document = documents.setdefault(
+                document_id,
+                {
+                    "file_name": None,
+                    "blobs": [],
+                    "has_original": False,
+                    "uploaded_at": blob.last_modified,
+                },
+            )
+            document["blobs"].append(blob.name)
+            if not is_sidecar(blob.name):
+                document["has_original"] = True
+                document["file_name"] = blob.name.split("/", 1)[1]
+            document["uploaded_at"] = min(document["uploaded_at"], blob.last_modified)
+        return documents
+
+    async def indexed_document_ids(self):
+        """인덱스 청크 키에 나타나는 문서 ID 집합 (doc_<id>_chunk_<n> 형식이 아닌 키는 제외)"""
+        keys = await self._search_keys(None)
+        return {document_id_from_key(key) for key in keys} - {None}
+
+    async def find_expired(self, older_than_days):
+        """업로드 후 older_than_days일이 지난 문서 ID 목록"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        documents = await self.scan_container()
+        return sorted(
+            document_id
+            for document_id, document in documents.items()
+            if document["uploaded_at"] < cutoff
+        )
+
+    async def find_orphans(self, min_age_hours=24):
+        """고아 문서 ID 목록과 사유
+
+        - 원본 없이 사이드카만 남은 문서 폴더
+        - 업로드는 됐지만 인덱스에 청크가 없는 문서 (중복으로 모든 청크를 건너뛴 문서는 제외)
+        - blob 없이 인덱스에만 남은 문서
+        처리 중인 업로드와 겹치지 않도록 min_age_hours보다 최근에 올린 문서는 제외한다.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=min_age_hours)
+        documents, indexed = await asyncio.gather(
+            self.scan_container(), self.indexed_document_ids()
+        )
+
+        orphans = {}
+        for document_id, document in documents.items():
+            if document["uploaded_at"] >= cutoff:
+                continue
+            if not document["has_original"]:
+                orphans[document_id] = "원본 없음"
+            elif document_id not in indexed and not await asyncio.to_thread(
+                chunk_deduplicator.has_document, document_id
+            ):
+                orphans[document_id] = "인덱스 없음"
+        for document_id in indexed - set(documents):
+            orphans[document_id] = "blob 없음"
+        return dict(sorted(orphans.items()))
+
+
+def print_delete_report(report, title="삭제 결과"):
+    """삭제 보고 출력"""
+    print(f"\n📊 {title}")
+    print(f"• 삭제 {report['documents']}개 문서, 실패 {report['failed']}개")
+    print(
+        f"• 청크 {report['deleted_chunks']:,}개, blob {report['deleted_blobs']:,}개 삭제 "
+        f"(이미 없던 blob {report['missing_blobs']:,}개)"
+    )
+    if report["reindexed_documents"]:
+        print(f"• 중복 대표가 바뀐 문서 {report['reindexed_documents']}개 재인덱싱")
+    print(f"• 경과 시간: {report['elapsed_seconds']}초")
+
+
+async def run(args):
+    lifecycle = DocumentLifecycle()
+    try:
+        if args.command == "delete":
+            document_ids = args.document_ids
+        elif args.orphans:
+            orphans = await lifecycle.find_orphans(args.min_age_hours)
+            for document_id, reason in orphans.items():
+                print(f"• {document_id}: {reason}")
+            document_ids = list(orphans)
+        else:
+            document_ids = await lifecycle.find_expired(args.older_than_days)
+
+        if args.command == "purge":
+            print(f"🔎 정리 대상 문서 {len(document_ids)}개")
+            if args.dry_run or not document_ids:
+                return None
+        return await lifecycle.delete_documents(document_ids, args.concurrency)
+    finally:
+        await lifecycle.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문서 삭제와 보존 기간 정리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    delete_parser = subparsers.add_parser("delete", help="문서 ID로 삭제")
+    delete_parser.add_argument("document_ids", nargs="+", help="삭제할 문서 ID")
+
+    purge_parser = subparsers.add_parser("purge", help="오래된 문서 또는 고아 문서 정리")
+    target = purge_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--older-than-days", type=float, help="업로드 후 이 기간이 지난 문서 삭제"
+    )
+    target.add_argument(
+        "--orphans", action="store_true", help="원본/인덱스 한쪽만 남은 문서 삭제"
+    )
+    purge_parser.add_argument(
+        "--min-age-hours",
+        type=float,
+        default=24,
+        help="고아 판정에서 제외할 최근 업로드 기간 (기본: 24시간)",
+    )
+    purge_parser.add_argument(
+        "--dry-run", action="store_true", help="삭제하지 않고 대상만 출력"
+    )
+    for subparser in (delete_parser, purge_parser):
+        subparser.add_argument(
+            "--concurrency", type=int, default=8, help="동시에 삭제할 문서 수"
+        )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if report is None:
+        return 0
+    print_delete_report(report)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,78 @@
 # document_uploader.py
-import uuid
-import streamlit as st
 from io import BytesIO
-import PyPDF2
-import docx
 from azure_config import azure_config
+from async_document_uploader import AsyncDocumentUploader
+from async_runner import run_sync
+from progress import PrintProgress
+from docx_extractor import extract_docx_text
+from pdf_ocr import extract_pdf_pages, read_ocr
+
+# 지원 파일 확장자
+TEXT_EXTENSIONS = ['txt', 'md']
+IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff']
+SUPPORTED_EXTENSIONS = ['pdf', 'docx'] + IMAGE_EXTENSIONS + TEXT_EXTENSIONS
+
+
+def join_pages(pages):
+    """페이지별 텍스트를 합쳐 (텍스트, 페이지 시작 위치 목록) 반환"""
+    text = ""
+    offsets = []
+    for page in pages:
+        offsets.append(len(text))
+        text += page + "\n"
+
+    # 앞쪽 공백을 제거한 만큼 시작 위치 보정
+    stripped = text.strip()
+    leading = len(text) - len(text.lstrip())
+    return stripped, [max(0, offset - leading) for offset in offsets]
+
+
+class LocalFile(BytesIO):
+    """메모리에 읽어 둔 파일 (Streamlit UploadedFile처럼 name, size, read, seek 제공)"""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
 
 class DocumentUploader:
-    def __init__(self):
-        self.blob_service_client = azure_config.get_blob_service_client()
+    def __init__(self, progress=None):
+        # 진행 상황 콜백 (기본은 콘솔 출력 - UI 업로드도 작업 워커에서 처리됨)
+        self.progress = progress or PrintProgress()
+        # 업로드는 비동기 업로더에 위임 (추출기는 이 클래스의 것을 사용)
+        self.async_uploader = AsyncDocumentUploader(
+            extract_text=self.extract_text_from_file
+        )
                 
     def extract_text_from_file(self, uploaded_file):
         try:
-            file_extension = uploaded_file.name.split('.')[-1].lower()
-            
-            if file_extension == 'pdf':
-                return self._extract_text_from_pdf(uploaded_file)
-            elif file_extension in ['docx']:
-                return self._extract_text_from_docx(uploaded_file)
-            elif file_extension in ['png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff']:
-                # 이미지 파일 OCR 처리
-                return self._extract_text_from_image_ocr(uploaded_file)
-            elif file_extension in ['txt', 'md']:
-                return self._extract_text_from_text(uploaded_file)
-            else:
-                raise ValueError(f"지원하지 않는 파일 형식: {file_extension}. 지원 형식: PDF, Word, 이미지(PNG/JPG/GIF), 텍스트")
-                
+            return self.extract_text_or_raise(uploaded_file)
         except Exception as e:
-            st.error(f"텍스트 추출 실패: {str(e)}")
+            self.progress.error(f"텍스트 추출 실패: {str(e)}")
             return None
+    
+    def extract_text_with_pages(self, uploaded_file):
+        """텍스트와 페이지 시작 위치 추출 (페이지 구분이 없는 형식은 None, 실패 시 예외 발생)"""
+        if uploaded_file.name.split('.')[-1].lower() == 'pdf':
+            return join_pages(self._extract_pdf_pages(uploaded_file))
+        return self.extract_text_or_raise(uploaded_file), None
+    
+    def extract_text_or_raise(self, uploaded_file):
+        """파일 형식별 텍스트 추출 (실패 시 예외 발생)"""
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        
+        if file_extension == 'pdf':
+            return self._extract_text_from_pdf(uploaded_file)
+        elif file_extension in ['docx']:
+            return self._extract_text_from_docx(uploaded_file)
+        elif file_extension in IMAGE_EXTENSIONS:
+            # 이미지 파일 OCR 처리
+            return self._extract_text_from_image_ocr(uploaded_file)
+        elif file_extension in TEXT_EXTENSIONS:
+            return self._extract_text_from_text(uploaded_file)
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식: {file_extension}. 지원 형식: PDF, Word, 이미지(PNG/JPG/GIF), 텍스트")
         
     def _extract_text_from_image_ocr(self, uploaded_file):
         """이미지 파일에서 Computer Vision OCR로 텍스트 추출"""
@@ -39,15 +83,13 @@ class DocumentUploader:
             # Azure AI Services 클라이언트 확인
             try:
                 from azure_config import azure_config
-                print("🔍 azure_config import 성공")
-                
+
                 vision_client = azure_config.get_vision_client()
-                print(f"🔍 vision_client 결과: {vision_client}")
-                
+
                 if not vision_client:
                     raise Exception("Computer Vision Client가 None입니다.")
                     
-                st.info("🔍 이미지에서 Computer Vision OCR로 텍스트를 추출합니다...")
+                self.progress.info("🔍 이미지에서 Computer Vision OCR로 텍스트를 추출합니다...")
                 
             except Exception as e:
                 print(f"❌ OCR 클라이언트 생성 오류: {str(e)}")
@@ -60,7 +102,7 @@ class DocumentUploader:
             # 이미지 유효성 검사
             try:
                 img = Image.open(BytesIO(image_data))
-                st.info(f"📷 이미지 크기: {img.size[0]}×{img.size[1]} pixels")
+                self.progress.info(f"📷 이미지 크기: {img.size[0]}×{img.size[1]} pixels")
             except Exception as e:
                 raise Exception(f"유효하지 않은 이미지 파일: {str(e)}")
             
@@ -68,46 +110,22 @@ class DocumentUploader:
             try:
                 print("🔍 Computer Vision OCR 분석 시작...")
                 
-                # OCR 분석 시작
-                ocr_result = vision_client.read_in_stream(
-                    BytesIO(image_data),
-                    raw=True
-                )
-                
-                # 결과 폴링
-                operation_id = ocr_result.headers["Operation-Location"].split("/")[-1]
-                print(f"🔍 OCR 작업 ID: {operation_id}")
-                
-                import time
-                max_attempts = 30  # 최대 30초 대기
-                attempt = 0
-                
-                while attempt < max_attempts:
-                    result = vision_client.get_read_result(operation_id)
-                    print(f"🔍 OCR 상태: {result.status}")
-                    
-                    if result.status.lower() not in ['notstarted', 'running']:
-                        break
-                    time.sleep(0.5)
-                    attempt += 1
-                
-                if attempt >= max_attempts:
-                    raise Exception("OCR 처리 시간이 초과되었습니다.")
-                
+                # OCR 분석 및 결과 폴링
+                read_pages = read_ocr(vision_client, image_data)
                 print("🔍 OCR 분석 완료")
                 
                 # 텍스트 추출
                 extracted_text = ""
-                if result.analyze_result and result.analyze_result.read_results:
-                    st.success(f"✅ {len(result.analyze_result.read_results)}개 페이지에서 텍스트를 발견했습니다.")
+                if read_pages:
+                    self.progress.success(f"✅ {len(read_pages)}개 페이지에서 텍스트를 발견했습니다.")
                     
-                    for page_num, page in enumerate(result.analyze_result.read_results, 1):
+                    for page_num, lines in enumerate(read_pages, 1):
                         extracted_text += f"\n=== 페이지 {page_num} ===\n"
-                        for line in page.lines:
-                            extracted_text += f"{line.text}\n"
+                        for line in lines:
+                            extracted_text += f"{line}\n"
                 else:
                     extracted_text = "[OCR] 이미지에서 텍스트를 찾을 수 없습니다."
-                    st.warning("⚠️ 이미지에서 텍스트를 찾을 수 없습니다.")
+                    self.progress.warning("⚠️ 이미지에서 텍스트를 찾을 수 없습니다.")
             
             except Exception as e:
                 print(f"❌ Computer Vision OCR 분석 실패: {str(e)}")
@@ -127,25 +145,28 @@ class DocumentUploader:
         
     def _extract_text_from_pdf(self, uploaded_file):
         """PDF 파일에서 텍스트 추출"""
-        text = ""
+        return join_pages(self._extract_pdf_pages(uploaded_file))[0]
+    
+    def _extract_pdf_pages(self, uploaded_file):
+        """PDF 파일에서 페이지별 텍스트 추출 (텍스트 레이어가 없는 스캔 페이지는 OCR)"""
         try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(uploaded_file.read()))
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+            pages = extract_pdf_pages(
+                uploaded_file.read(),
+                vision_client=azure_config.get_vision_client(),
+                max_concurrency=azure_config.ocr_max_concurrency,
+                progress=self.progress,
+            )
             uploaded_file.seek(0)  # 파일 포인터 리셋
-            return text.strip()
+            return pages
         except Exception as e:
             raise Exception(f"PDF 읽기 오류: {str(e)}")
     
     def _extract_text_from_docx(self, uploaded_file):
-        """DOCX 파일에서 텍스트 추출"""
+        """DOCX 파일에서 문단과 표 텍스트 추출"""
         try:
-            doc = docx.Document(BytesIO(uploaded_file.read()))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            text = extract_docx_text(BytesIO(uploaded_file.read()))
             uploaded_file.seek(0)  # 파일 포인터 리셋
-            return text.strip()
+            return text
         except Exception as e:
             raise Exception(f"DOCX 읽기 오류: {str(e)}")
     
@@ -160,110 +181,91 @@ class DocumentUploader:
         except Exception as e:
             raise Exception(f"텍스트 파일 읽기 오류: {str(e)}")
     
-    def upload_to_blob_storage(self, uploaded_file):
-        """파일을 Azure Blob Storage에 업로드 (단순화된 버전)"""
-        try:
-            # 고유한 문서 ID 생성
-            document_id = str(uuid.uuid4())
-            blob_name = f"{document_id}/{uploaded_file.name}"
-            
-            blob_client = self.blob_service_client.get_blob_client(
-                container=azure_config.storage_container_name,
-                blob=blob_name
-            )
-            
-            # 파일 업로드
-            uploaded_file.seek(0)
-            blob_client.upload_blob(
-                uploaded_file.read(),
-                overwrite=True
+    def upload_to_blob_storage(self, uploaded_file, extracted_text=None, page_offsets=None):
+        """파일을 Azure Blob Storage에 업로드 (추출 텍스트가 있으면 사이드카도 함께 저장)"""
+        return run_sync(
+            self.async_uploader.upload_to_blob_storage(
+                uploaded_file, extracted_text=extracted_text, page_offsets=page_offsets
             )
-            
-            return {
-                "document_id": document_id,
-                "blob_url": blob_client.url,
-                "blob_name": blob_name
-            }
-            
-        except Exception as e:
-            raise Exception(f"Blob Storage 업로드 실패: {str(e)}")
+        )
+    
+    def read_extracted_text(self, document_id):
+        """사이드카에서 추출 텍스트 읽기 (없거나 추출기 버전이 다르면 None)"""
+        return run_sync(self.async_uploader.read_extracted_text(document_id))
+    
+    def build_document_result(self, uploaded_file, extracted_text, upload_result):
+        """추출 텍스트와 업로드 결과로 문서 처리 결과 생성"""
+        return self.async_uploader.build_document_result(
+            uploaded_file, extracted_text, upload_result
+        )
     
     def process_single_file(self, uploaded_file):
         """단일 파일 처리: 텍스트 추출 + Blob Storage 업로드 + AI Search 인덱싱 + 요약"""
         try:
             # 1. 텍스트 추출
-            st.info("텍스트 추출 중...")
+            self.progress.info("텍스트 추출 중...")
             extracted_text = self.extract_text_from_file(uploaded_file)
             
             if not extracted_text:
                 raise Exception("텍스트를 추출할 수 없습니다.")
             
-            st.success(f"텍스트 추출 완료 (길이: {len(extracted_text)}자)")
+            self.progress.success(f"텍스트 추출 완료 (길이: {len(extracted_text)}자)")
             
             # 2. Blob Storage 업로드
-            st.info("클라우드 저장 중...")
-            upload_result = self.upload_to_blob_storage(uploaded_file)
+            self.progress.info("클라우드 저장 중...")
+            upload_result = self.upload_to_blob_storage(
+                uploaded_file, extracted_text=extracted_text
+            )
             
-            st.success("업로드 완료!")
+            self.progress.success("업로드 완료!")
             
             # 3. 기본 결과 생성
-            result = {
-                "success": True,
-                "document_id": upload_result["document_id"],
-                "file_name": uploaded_file.name,
-                "file_type": uploaded_file.name.split('.')[-1].lower(),
-                "extracted_text": extracted_text,
-                "blob_url": upload_result["blob_url"],
-                "blob_name": upload_result["blob_name"],
-                "file_size": uploaded_file.size
-            }
+            result = self.build_document_result(uploaded_file, extracted_text, upload_result)
             
             # 4. 문서 처리 (인덱싱 + 요약)
-            st.info("문서 분석 및 요약 중...")
+            self.progress.info("문서 분석 및 요약 중...")
             try:
                 # document_processor import 확인
                 try:
                     from document_processor import document_processor
-                    st.info("✅ document_processor 모듈 로드 성공")
+                    self.progress.info("✅ document_processor 모듈 로드 성공")
                 except ImportError as e:
-                    st.error(f"❌ document_processor 모듈 로드 실패: {str(e)}")
+                    self.progress.error(f"❌ document_processor 모듈 로드 실패: {str(e)}")
                     raise e
                 
                 # 문서 전체 처리
-                st.info("문서 처리 시작...")
+                self.progress.info("문서 처리 시작...")
                 processing_results = document_processor.process_document_complete(result)
-                st.info("문서 처리 완료")
+                self.progress.info("문서 처리 완료")
                 
                 # 결과에 처리 정보 추가
                 result["processing_results"] = processing_results["processing_results"]
                 
                 # 디버깅: 결과 구조 확인
-                st.write("**처리 결과 구조:**")
-                st.json({
+                self.progress.data("처리 결과 구조", {
                     "summary_success": result["processing_results"].get("summary", {}).get("success", False),
                     "tech_info_success": result["processing_results"].get("technical_info", {}).get("success", False),
                     "indexing_success": result["processing_results"].get("indexing", {}).get("success", False)
                 })
                 
-                st.success("문서 분석 완료!")
+                self.progress.success("문서 분석 완료!")
                 
             except Exception as e:
-                st.error(f"❌ 문서 분석 중 오류 발생: {str(e)}")
-                st.write(f"오류 타입: {type(e).__name__}")
-                st.write(f"오류 메시지: {str(e)}")
+                self.progress.error(
+                    f"❌ 문서 분석 중 오류 발생 ({type(e).__name__}): {str(e)}"
+                )
                 result["processing_error"] = str(e)
             
             return result
             
         except Exception as e:
-            st.error(f"❌ 파일 처리 실패: {str(e)}")
-            st.write(f"오류 타입: {type(e).__name__}")
+            self.progress.error(f"❌ 파일 처리 실패 ({type(e).__name__}): {str(e)}")
             return {
                 "success": False,
                 "error": str(e)
             }
 
-def get_blob_files():
+def get_blob_files(progress=None):
     """업로드된 파일 목록 조회"""
     try:
         blob_service_client = azure_config.get_blob_service_client()
@@ -275,7 +277,7 @@ def get_blob_files():
         return blobs
         
     except Exception as e:
-        st.error(f"파일 목록 조회 실패: {str(e)}")
+        (progress or PrintProgress()).error(f"파일 목록 조회 실패: {str(e)}")
         return []
 
 # 전역 업로더 객체
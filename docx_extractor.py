@@ -0,0 +1,100 @@
+# docx_extractor.py
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# WordprocessingML 네임스페이스 (Transitional, Strict)
+WORD_NAMESPACES = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",
+)
+
+# 호환용 대체 내용 (mc:Choice와 같은 텍스트 상자가 한 번 더 들어 있음)
+FALLBACK_TAG = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# 표 셀 구분자
+CELL_SEPARATOR = " | "
+
+
+def _local_name(tag):
+    """워드 네임스페이스 태그면 로컬 이름, 아니면 None"""
+    namespace, _, name = tag[1:].partition("}")
+    return name if namespace in WORD_NAMESPACES else None
+
+
+def extract_docx_text(file):
+    """DOCX의 word/document.xml을 스트리밍 파싱해 문단과 표 텍스트를 문서 순서대로 추출
+
+    python-docx처럼 전체 문서 객체를 만들지 않고, 본문 최상위 요소를 처리할 때마다 비워서
+    메모리를 일정하게 유지한다. 표는 행마다 셀을 " | "로 이어 한 줄로 만든다.
+    """
+    lines = []
+    paragraphs = []  # 처리 중인 문단의 텍스트 조각 (텍스트 상자 속 문단은 중첩)
+    tables = []  # 처리 중인 표 {"rows", "row", "cell"} (표 안의 표는 중첩)
+    body = None
+    fallback_depth = 0
+    properties_depth = 0  # 문단 속성(w:pPr) 안 (w:tabs/w:tab은 탭 위치 정의라 본문이 아님)
+
+    def emit(text):
+        """완성된 문단/표 텍스트를 감싸는 셀, 문단, 본문 순으로 전달"""
+        if tables and tables[-1]["cell"] is not None:
+            tables[-1]["cell"].append(text)
+        elif paragraphs:
+            paragraphs[-1].append("\n" + text)
+        else:
+            lines.append(text)
+
+    with zipfile.ZipFile(file) as archive:
+        with archive.open("word/document.xml") as document_xml:
+            for event, element in iterparse(document_xml, events=("start", "end")):
+                if element.tag == FALLBACK_TAG:
+                    fallback_depth += 1 if event == "start" else -1
+                    continue
+                name = _local_name(element.tag)
+                if name is None or fallback_depth:
+                    continue
+                if name == "pPr":
+                    properties_depth += 1 if event == "start" else -1
+                    continue
+                if properties_depth:
+                    continue
+
+                if event == "start":
+                    if name == "p":
+                        paragraphs.append([])
+                    elif name == "tbl":
+                        tables.append({"rows": [], "row": None, "cell": None})
+                    elif name == "tr" and tables:
+                        tables[-1]["row"] = []
+                    elif name == "tc" and tables:
+                        tables[-1]["cell"] = []
+                    elif name == "body":
+                        body = element
+                    continue
+
+                if name == "t" and paragraphs:
+                    paragraphs[-1].append(element.text or "")
+                elif name == "tab" and paragraphs:
+                    paragraphs[-1].append("\t")
+                elif name in ("br", "cr") and paragraphs:
+                    paragraphs[-1].append("\n")
+                elif name == "p" and paragraphs:
+                    emit("".join(paragraphs.pop()))
+                elif name == "tc" and tables and tables[-1]["cell"] is not None:
+                    table = tables[-1]
+                    cell_text = " ".join(t.strip() for t in table["cell"] if t.strip())
+                    if table["row"] is not None:
+                        table["row"].append(cell_text)
+                    table["cell"] = None
+                elif name == "tr" and tables and tables[-1]["row"] is not None:
+                    table = tables[-1]
+                    if any(table["row"]):
+                        table["rows"].append(CELL_SEPARATOR.join(table["row"]))
+                    table["row"] = None
+                elif name == "tbl" and tables:
+                    emit("\n".join(tables.pop()["rows"]))
+
+                # 본문 최상위 요소가 끝나면 파싱된 트리를 비워 메모리 회수
+                if body is not None and not paragraphs and not tables:
+                    body.clear()
+
+    return "\n".join(lines).strip()
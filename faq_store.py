@@ -0,0 +1,159 @@
+# faq_store.py
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl이 없는 환경
+    fcntl = None
+
+# 신규 투입자가 첫 주에 공통으로 묻는 질문 (문서 기반 질문과 함께 미리 답변)
+DEFAULT_FAQ_QUESTIONS = [
+    "이 프로젝트는 어떤 서비스이고 주요 기능은 무엇인가요?",
+    "전체 시스템 아키텍처는 어떻게 구성되어 있나요?",
+    "개발 환경은 어떻게 설정하나요?",
+    "사용하는 주요 기술 스택은 무엇인가요?",
+    "빌드와 배포는 어떻게 진행하나요?",
+    "코드 리뷰와 브랜치 전략은 어떻게 되나요?",
+    "장애가 발생하면 어떻게 대응하나요?",
+    "신규 투입자가 먼저 읽어야 할 문서는 무엇인가요?",
+]
+
+
+def question_key(question):
+    """질문 비교용 정규화 (대소문자, 띄어쓰기, 문장부호 무시)"""
+    return re.sub(r"[\W_]+", "", question.lower())
+
+
+def _bigrams(key):
+    return {key[i : i + 2] for i in range(len(key) - 1)} or {key}
+
+
+def question_similarity(left_key, right_key):
+    """정규화된 두 질문의 글자 2-gram Jaccard 유사도"""
+    left, right = _bigrams(left_key), _bigrams(right_key)
+    return len(left & right) / len(left | right)
+
+
+def group_similar_questions(questions, threshold):
+    """비슷한 질문끼리 묶음 - (대표 질문 목록, 질문별 대표 질문 인덱스) 반환
+
+    대표 질문은 그룹에서 처음 나온 질문이며, 유사도는 FAQ 조회와 같은 기준을 사용한다.
+    """
+    representatives = []  # (질문 키, 질문)
+    groups = []
+    for question in questions:
+        key = question_key(question)
+        for index, (representative_key, _) in enumerate(representatives):
+            if key == representative_key or (
+                key
+                and representative_key
+                and question_similarity(key, representative_key) >= threshold
+            ):
+                groups.append(index)
+                break
+        else:
+            groups.append(len(representatives))
+            representatives.append((key, question))
+    return [question for _, question in representatives], groups
+
+
+class FaqStore:
+    """프로젝트별로 미리 생성한 질의응답 (JSON 파일로 영속화)"""
+
+    def __init__(self, path, match_threshold=0.8):
+        self.path = path
+        self.match_threshold = match_threshold
+        self._lock = threading.Lock()
+        self._mtime = None
+        self.projects = {}  # 프로젝트 -> {질문 키: {"question", "answer", "sources", ...}}
+        self._load()
+
+    def _load(self):
+        """디스크의 FAQ를 읽어옴 (다른 프로세스가 갱신한 경우 다시 읽음)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.projects = json.load(f).get("projects", {})
+        self._mtime = mtime
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체하여 원자적으로 저장"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"projects": self.projects}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def _file_lock(self):
+        """프로세스 간 동시 갱신 방지용 잠금 파일"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(f"{self.path}.lock", "a")
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def save_answers(self, project, answers):
+        """질의응답 목록을 프로젝트 FAQ에 반영 (같은 질문은 교체)"""
+        generated_at = datetime.now().isoformat()
+        with self._lock:
+            lock_file = self._file_lock()
+            try:
+                self._load()
+                entries = self.projects.setdefault(project, {})
+                for answer in answers:
+                    entries[question_key(answer["question"])] = {
+                        "question": answer["question"],
+                        "answer": answer["answer"],
+                        "answer_type": answer.get("answer_type"),
+                        "sources": answer.get("sources", []),
+                        "generated_at": generated_at,
+                    }
+                self._save()
+            finally:
+                lock_file.close()
+        return len(answers)
+
+    def lookup(self, project, question):
+        """미리 생성한 답변 중 같은(또는 거의 같은) 질문의 답변 (없으면 None)"""
+        key = question_key(question)
+        if not key:
+            return None
+
+        with self._lock:
+            self._load()
+            entries = self.projects.get(project, {})
+            entry = entries.get(key)
+            if entry is None:
+                best_score = 0.0
+                for entry_key, candidate in entries.items():
+                    score = question_similarity(key, entry_key)
+                    if score > best_score:
+                        best_score, entry = score, candidate
+                if best_score < self.match_threshold:
+                    return None
+            return dict(entry)
+
+    def list_answers(self, project):
+        """프로젝트 FAQ 전체 (생성 순서)"""
+        with self._lock:
+            self._load()
+            return [dict(entry) for entry in self.projects.get(project, {}).values()]
+
+
+# 전역 FAQ 저장소 객체
+faq_store = FaqStore(os.getenv("FAQ_STORE_PATH", os.path.join("data", "faq.json")))
@@ -0,0 +1,44 @@
+# healthcheck.py
+"""Azure 서비스 준비 상태 점검 (Web App 시작/준비 확인용)
+
+사용 예:
+    python healthcheck.py            # 사람이 읽는 출력
+    python healthcheck.py --json     # JSON 출력
+
+모든 필수 서비스가 준비되면 0, 아니면 1로 종료한다.
+"""
+import argparse
+import json
+import sys
+
+from azure_config import azure_config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Azure 서비스 준비 상태 점검")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="서비스별 제한 시간(초) (기본: HEALTH_CHECK_TIMEOUT)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.timeout is not None:
+        azure_config.health_check_timeout = args.timeout
+
+    health = azure_config.check_health(force=True)
+
+    if args.json:
+        print(json.dumps(health, ensure_ascii=False, indent=2))
+    else:
+        print("✅ 준비 완료" if health["ready"] else "❌ 준비 안 됨")
+        for name, service in health["services"].items():
+            print(f"• {name}: {service['message']} ({service['latency_ms']}ms)")
+
+    return 0 if health["ready"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,474 @@
+# ingest_cli.py
+"""로컬 디렉터리 문서 일괄 수집 (텍스트 추출 → Blob 업로드 → AI Search 인덱싱 → 요약)
+
+사용 예:
+    python ingest_cli.py ./docs --extract-workers 8 --network-workers 16
+
+텍스트 추출은 프로세스 풀, 네트워크 단계는 스레드 풀에서 실행하며
+처리 결과를 체크포인트(JSONL)에 기록해 중단 후 다시 실행하면 이어서 처리한다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+
+from document_uploader import SUPPORTED_EXTENSIONS, DocumentUploader, LocalFile
+from progress import PrintProgress, ProgressReporter
+
+STAGES = ("download", "extract", "upload", "index", "summarize")
+
+
+def find_documents(root, extensions=SUPPORTED_EXTENSIONS):
+    """디렉터리 트리에서 지원 형식 파일 경로를 정렬된 순서로 반환"""
+    for directory, subdirectories, file_names in os.walk(root):
+        subdirectories.sort()
+        for file_name in sorted(file_names):
+            if file_name.rsplit(".", 1)[-1].lower() in extensions:
+                yield os.path.abspath(os.path.join(directory, file_name))
+
+
+def file_signature(path):
+    """파일 변경 여부 확인용 (크기, 수정 시각)"""
+    stat = os.stat(path)
+    return stat.st_size, int(stat.st_mtime)
+
+
+class IngestCheckpoint:
+    """파일별 처리 상태를 JSONL로 기록 (마지막 기록이 현재 상태)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 중단 시 마지막 줄이 잘렸을 수 있음
+                        continue
+                    self.records[record["path"]] = record
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def get(self, path, signature):
+        """파일이 바뀌지 않았으면 이전 기록 반환"""
+        record = self.records.get(path)
+        if record and (record["size"], record["mtime"]) == tuple(signature):
+            return record
+        return None
+
+    def record(self, path, signature, status, **fields):
+        """상태 기록 (즉시 디스크에 반영)"""
+        record = {
+            "path": path,
+            "size": signature[0],
+            "mtime": signature[1],
+            "status": status,
+            "updated_at": time.time(),
+            **fields,
+        }
+        with self._lock:
+            self.records[path] = record
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        return record
+
+    def close(self):
+        self._file.close()
+
+
+class IngestStats:
+    """처리량 집계"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.counts = {"done": 0, "failed": 0, "skipped": 0}
+        self.bytes = 0
+        self.characters = 0
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_counts = {stage: 0 for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def add_timings(self, timings):
+        with self._lock:
+            for stage, seconds in timings.items():
+                self.stage_seconds[stage] += seconds
+                self.stage_counts[stage] += 1
+
+    def count(self, status, size=0, characters=0):
+        with self._lock:
+            self.counts[status] += 1
+            self.bytes += size
+            self.characters += characters
+
+    def report(self):
+        """최종 처리량 보고 (dict)"""
+        elapsed = time.perf_counter() - self.started_at
+        processed = self.counts["done"] + self.counts["failed"]
+        return {
+            **self.counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "documents_per_second": round(processed / elapsed, 3) if elapsed else 0.0,
+            "megabytes_per_second": round(self.bytes / 1e6 / elapsed, 3)
+            if elapsed
+            else 0.0,
+            "characters": self.characters,
+            "stage_avg_seconds": {
+                stage: round(self.stage_seconds[stage] / self.stage_counts[stage], 3)
+                for stage in STAGES
+                if self.stage_counts[stage]
+            },
+        }
+
+
+# 추출 프로세스별 업로더 (진행 메시지는 출력하지 않음)
+_extract_uploader = None
+
+
+def init_extract_worker():
+    """추출 프로세스 초기화"""
+    global _extract_uploader
+    _extract_uploader = DocumentUploader(progress=ProgressReporter())
+
+
+def extract_bytes(file_name, data):
+    """(프로세스 풀) 파일 내용에서 텍스트 추출 후 (텍스트, 페이지 위치, 소요 시간) 반환"""
+    started = time.perf_counter()
+    text, page_offsets = _extract_uploader.extract_text_with_pages(
+        LocalFile(file_name, data)
+    )
+    if not text:
+        raise Exception("텍스트를 추출할 수 없습니다.")
+    return text, page_offsets, time.perf_counter() - started
+
+
+def extract_document(path):
+    """(프로세스 풀) 파일 텍스트 추출"""
+    with open(path, "rb") as f:
+        return extract_bytes(os.path.basename(path), f.read())
+
+
+def ingest_document(
+    path, text, page_offsets, upload_result, uploader, processor, summarize
+):
+    """(스레드 풀) 업로드 → 인덱싱 → 요약 후 세션 레코드와 단계별 소요 시간 반환"""
+    from content_store import make_session_record
+
+    timings = {}
+    with open(path, "rb") as f:
+        uploaded_file = LocalFile(os.path.basename(path), f.read())
+
+    # 이전 실행에서 업로드까지 끝났으면 같은 문서 ID를 재사용 (인덱스 키 유지)
+    if not upload_result:
+        started = time.perf_counter()
+        upload_result = uploader.upload_to_blob_storage(
+            uploaded_file, extracted_text=text, page_offsets=page_offsets
+        )
+        timings["upload"] = time.perf_counter() - started
+        yield "uploaded", {"upload": upload_result}
+
+    result = uploader.build_document_result(uploaded_file, text, upload_result)
+
+    started = time.perf_counter()
+    index_result = processor.index_document(result)
+    timings["index"] = time.perf_counter() - started
+    if not index_result["success"]:
+        raise Exception(f"인덱싱 실패: {index_result['error']}")
+    processing_results = {"indexing": index_result}
+
+    if summarize:
+        started = time.perf_counter()
+        processing_results.update(processor.summarize_document(result))
+        timings["summarize"] = time.perf_counter() - started
+    result["processing_results"] = processing_results
+
+    yield "done", {
+        "upload": upload_result,
+        "record": make_session_record(result),
+        "timings": timings,
+    }
+
+
+def _run_network_stage(
+    path, signature, text, page_offsets, upload_result, checkpoint, **kwargs
+):
+    """네트워크 단계 실행 - 업로드 직후에도 체크포인트 기록"""
+    for status, fields in ingest_document(
+        path, text, page_offsets, upload_result, **kwargs
+    ):
+        if status == "uploaded":
+            upload_result = fields["upload"]
+            checkpoint.record(path, signature, "uploaded", upload=upload_result)
+        else:
+            return fields
+    return None
+
+
+def ingest_directory(
+    root,
+    checkpoint_path,
+    extract_workers=None,
+    network_workers=16,
+    summarize=True,
+    extensions=SUPPORTED_EXTENSIONS,
+    progress=None,
+):
+    """디렉터리 트리 일괄 수집 후 처리량 보고 반환"""
+    from document_processor import document_processor
+
+    progress = progress or PrintProgress()
+    extract_workers = extract_workers or os.cpu_count() or 1
+    uploader = DocumentUploader(progress=ProgressReporter())
+    checkpoint = IngestCheckpoint(checkpoint_path)
+    stats = IngestStats()
+
+    paths = find_documents(root, extensions)
+    # 추출 결과(텍스트)를 메모리에 쌓아두지 않도록 대기 작업 수 제한
+    max_pending_extract = extract_workers * 2
+    max_pending_network = network_workers * 2
+    pending_extract = {}
+    pending_network = {}
+    exhausted = False
+
+    def make_extract_pool():
+        return ProcessPoolExecutor(
+            max_workers=extract_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_extract_worker,
+        )
+
+    extract_pool = make_extract_pool()
+    network_pool = ThreadPoolExecutor(max_workers=network_workers)
+
+    def submit_network(path, signature, text, page_offsets, upload_result):
+        future = network_pool.submit(
+            _run_network_stage,
+            path,
+            signature,
+            text,
+            page_offsets,
+            upload_result,
+            checkpoint,
+            uploader=uploader,
+            processor=document_processor,
+            summarize=summarize,
+        )
+        pending_network[future] = (path, signature, len(text))
+
+    def fail(path, signature, error, previous=None):
+        upload = (previous or {}).get("upload")
+        checkpoint.record(path, signature, "failed", error=error, upload=upload)
+        stats.count("failed")
+        progress.error(f"❌ {path}: {error}")
+
+    try:
+        while True:
+            # 대기 작업 채우기
+            while (
+                not exhausted
+                and len(pending_extract) < max_pending_extract
+                and len(pending_network) < max_pending_network
+            ):
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                    break
+
+                signature = file_signature(path)
+                previous = checkpoint.get(path, signature)
+                if previous and previous["status"] == "done":
+                    stats.count("skipped")
+                    continue
+
+                try:
+                    future = extract_pool.submit(extract_document, path)
+                except BrokenProcessPool:
+                    # 추출기 크래시로 풀이 깨지면 새 풀로 교체
+                    extract_pool.shutdown(wait=False)
+                    extract_pool = make_extract_pool()
+                    future = extract_pool.submit(extract_document, path)
+                pending_extract[future] = (path, signature, previous)
+
+            if not pending_extract and not pending_network:
+                break
+
+            done, _ = wait(
+                list(pending_extract) + list(pending_network),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                if future in pending_extract:
+                    path, signature, previous = pending_extract.pop(future)
+                    try:
+                        text, page_offsets, seconds = future.result()
+                    except Exception as e:
+                        fail(path, signature, f"텍스트 추출 실패: {str(e)}", previous)
+                        continue
+                    stats.add_timings({"extract": seconds})
+                    submit_network(
+                        path,
+                        signature,
+                        text,
+                        page_offsets,
+                        (previous or {}).get("upload"),
+                    )
+                else:
+                    path, signature, characters = pending_network.pop(future)
+                    try:
+                        fields = future.result()
+                    except Exception as e:
+                        fail(path, signature, str(e), checkpoint.records.get(path))
+                        continue
+                    checkpoint.record(
+                        path,
+                        signature,
+                        "done",
+                        upload=fields["upload"],
+                        document_id=fields["record"].document_id,
+                        text_key=fields["record"].text_key,
+                        analysis_key=fields["record"].analysis_key,
+                    )
+                    stats.add_timings(fields["timings"])
+                    stats.count("done", size=signature[0], characters=characters)
+                    finished = stats.counts["done"] + stats.counts["failed"]
+                    progress.success(f"✅ [{finished}] {path}")
+
+    except KeyboardInterrupt:
+        progress.warning("⚠️ 중단됨 - 다시 실행하면 체크포인트부터 이어서 처리합니다.")
+        extract_pool.shutdown(wait=False, cancel_futures=True)
+        network_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        extract_pool.shutdown()
+        network_pool.shutdown()
+        checkpoint.close()
+
+    return stats.report()
+
+
+def faq_documents(checkpoint_path):
+    """체크포인트의 처리 완료 문서에서 FAQ 생성용 (파일명, 요약) 목록"""
+    from content_store import load_processing_results
+
+    checkpoint = IngestCheckpoint(checkpoint_path)
+    checkpoint.close()
+
+    documents = []
+    for record in checkpoint.records.values():
+        if record["status"] != "done" or not record.get("analysis_key"):
+            continue
+        summary_result = load_processing_results(record).get("summary", {})
+        if summary_result.get("success"):
+            documents.append(
+                {
+                    "file_name": os.path.basename(record["path"]),
+                    "summary": summary_result["summary"],
+                }
+            )
+    return documents
+
+
+def build_project_faq(checkpoint_path, project=None):
+    """수집된 문서 기준으로 프로젝트 FAQ를 미리 생성"""
+    from document_processor import document_processor
+
+    documents = faq_documents(checkpoint_path)
+    print(f"\n❓ FAQ 생성 중... (요약 문서 {len(documents)}개)")
+    faq_result = document_processor.build_faq(documents, project=project)
+    print(
+        f"• FAQ {faq_result['saved_count']}/{faq_result['question_count']}개 저장 "
+        f"(프로젝트: {faq_result['project']})"
+    )
+    for error in faq_result["errors"]:
+        print(f"⚠️ FAQ 답변 실패: {error}")
+    return faq_result
+
+
+def print_report(report, title="수집 결과"):
+    """처리량 보고 출력"""
+    from rate_limiter import format_metrics, openai_rate_limiter
+
+    print(f"\n📊 {title}")
+    print(
+        f"• 성공 {report['done']}개, 실패 {report['failed']}개, "
+        f"건너뜀(이미 처리) {report['skipped']}개"
+    )
+    print(f"• 경과 시간: {report['elapsed_seconds']}초")
+    print(
+        f"• 처리량: {report['documents_per_second']}문서/초, "
+        f"{report['megabytes_per_second']}MB/초 ({report['characters']:,}자)"
+    )
+    for stage, seconds in report["stage_avg_seconds"].items():
+        print(f"• {stage} 평균: {seconds}초")
+    print(f"• OpenAI 호출 제한: {format_metrics(openai_rate_limiter.get_metrics())}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 문서 일괄 수집")
+    parser.add_argument("root", help="수집할 디렉터리")
+    parser.add_argument(
+        "--checkpoint",
+        default=os.path.join("data", "ingest_checkpoint.jsonl"),
+        help="체크포인트 파일 경로 (기본: data/ingest_checkpoint.jsonl)",
+    )
+    parser.add_argument(
+        "--extract-workers", type=int, default=None, help="추출 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument(
+        "--network-workers", type=int, default=16, help="네트워크 단계 스레드 수"
+    )
+    parser.add_argument(
+        "--skip-summary", action="store_true", help="요약/키워드 추출 없이 인덱싱만 수행"
+    )
+    parser.add_argument(
+        "--extensions",
+        default=",".join(SUPPORTED_EXTENSIONS),
+        help="처리할 확장자 (콤마 구분)",
+    )
+    parser.add_argument(
+        "--faq", action="store_true", help="수집 후 프로젝트 FAQ를 미리 생성"
+    )
+    parser.add_argument(
+        "--project", default=None, help="FAQ 프로젝트 이름 (기본: ONBOARDING_PROJECT)"
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        print(f"❌ 디렉터리가 없습니다: {args.root}")
+        return 2
+
+    try:
+        report = ingest_directory(
+            args.root,
+            args.checkpoint,
+            extract_workers=args.extract_workers,
+            network_workers=args.network_workers,
+            summarize=not args.skip_summary,
+            extensions=[e.strip().lower() for e in args.extensions.split(",")],
+        )
+    except KeyboardInterrupt:
+        return 130
+
+    print_report(report)
+    if args.faq:
+        build_project_faq(args.checkpoint, project=args.project)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
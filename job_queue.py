@@ -0,0 +1,574 @@
+# job_queue.py
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from records import ProcessedFile
+
+# 작업 상태 (처리 단계 순서)
+JOB_STAGES = ["queued", "extracting", "uploading", "indexing", "summarizing", "done"]
+ACTIVE_STATES = ("extracting", "uploading", "indexing", "summarizing")
+FINISHED_STATES = ("done", "failed")
+
+# 모듈 위치 (앱과 워커 프로세스가 같은 데이터 경로를 쓰도록 기본 경로의 기준으로 사용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAGE_MESSAGES = {
+    "queued": "대기 중",
+    "extracting": "텍스트 추출 중...",
+    "uploading": "클라우드 저장 중...",
+    "indexing": "AI Search 인덱싱 중...",
+    "summarizing": "문서 분석 및 요약 중...",
+    "done": "처리 완료",
+    "failed": "처리 실패",
+}
+
+
+class JobQueue:
+    """SQLite 기반 문서 처리 작업 큐 (여러 프로세스/세션에서 공유)"""
+
+    def __init__(
+        self, db_path, spool_dir, lease_seconds=60, max_attempts=3, retry_delay=5.0
+    ):
+        self.db_path = db_path
+        self.spool_dir = spool_dir
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # 실패한 작업의 재시도 대기 시간 (시도마다 두 배)
+        self.retry_delay = retry_delay
+
+        os.makedirs(spool_dir, exist_ok=True)
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    session_id TEXT,
+                    file_name TEXT NOT NULL,
+                    file_size INTEGER,
+                    spool_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    message TEXT,
+                    error TEXT,
+                    upload_json TEXT,
+                    result_json TEXT,
+                    worker_id TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    created_at REAL,
+                    updated_at REAL,
+                    heartbeat_at REAL,
+                    retry_at REAL
+                )"""
+            )
+            # 재시도 대기 시각 컬럼이 없던 기존 DB 갱신
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "retry_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN retry_at REAL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session_id)"
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS workers (
+                    worker_id TEXT PRIMARY KEY,
+                    pid INTEGER,
+                    heartbeat_at REAL
+                )"""
+            )
+        finally:
+            conn.close()
+
+    def _to_job(self, row):
+        job = dict(row)
+        job["upload"] = json.loads(job.pop("upload_json") or "null")
+        result = json.loads(job.pop("result_json") or "null")
+        job["result"] = ProcessedFile.from_dict(result) if result else None
+        return job
+
+    def enqueue(self, uploaded_file, session_id=None):
+        """업로드 파일을 디스크에 보관하고 작업 등록 (즉시 반환)"""
+        job_id = uuid.uuid4().hex
+        spool_path = os.path.join(self.spool_dir, job_id)
+
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        with open(spool_path, "wb") as f:
+            f.write(data)
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """INSERT INTO jobs (id, session_id, file_name, file_size, spool_path,
+                       status, message, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)""",
+                (
+                    job_id,
+                    session_id,
+                    uploaded_file.name,
+                    len(data),
+                    spool_path,
+                    STAGE_MESSAGES["queued"],
+                    now,
+                    now,
+                ),
+            )
+        finally:
+            conn.close()
+        return job_id
+
+    def get_jobs(self, job_ids):
+        """작업 상태 조회 (요청한 순서대로)"""
+        if not job_ids:
+            return []
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(job_ids))})",
+                list(job_ids),
+            ).fetchall()
+        finally:
+            conn.close()
+        jobs = {row["id"]: self._to_job(row) for row in rows}
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+    def get_session_jobs(self, session_id):
+        """세션이 등록한 작업 목록 (새로고침 후 복원용)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE session_id = ? ORDER BY created_at",
+                (session_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._to_job(row) for row in rows]
+
+    def get_done_results(self, limit=50):
+        """최근 완료된 작업의 처리 결과 (문서별 최신 하나, 최근 순)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """SELECT * FROM jobs WHERE status = 'done' AND result_json IS NOT NULL
+                   ORDER BY updated_at DESC""",
+            ).fetchall()
+        finally:
+            conn.close()
+        results = {}
+        for row in rows:
+            result = self._to_job(row)["result"]
+            results.setdefault(result.document_id, result)
+            if len(results) >= limit:
+                break
+        return list(results.values())
+
+    def remove_document_jobs(self, document_ids):
+        """삭제된 문서의 완료 작업 기록 제거 (세션 복원 시 다시 나타나지 않도록), 제거한 작업 수 반환"""
+        document_ids = list(document_ids)
+        if not document_ids:
+            return 0
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"""DELETE FROM jobs WHERE status = 'done'
+                    AND json_extract(result_json, '$.document_id')
+                        IN ({','.join('?' * len(document_ids))})""",
+                document_ids,
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def claim(self, worker_id):
+        """대기 중이거나 담당 워커가 중단된 작업 하나를 원자적으로 가져옴"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"""SELECT * FROM jobs
+                    WHERE (status = 'queued' AND (retry_at IS NULL OR retry_at <= ?))
+                       OR (status IN ({','.join('?' * len(ACTIVE_STATES))})
+                           AND heartbeat_at < ?)
+                    ORDER BY created_at LIMIT 1""",
+                (now, *ACTIVE_STATES, now - self.lease_seconds),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row["attempts"] >= self.max_attempts:
+                conn.execute(
+                    """UPDATE jobs SET status = 'failed', message = ?, error = ?,
+                           updated_at = ? WHERE id = ?""",
+                    (
+                        STAGE_MESSAGES["failed"],
+                        f"최대 재시도 횟수({self.max_attempts}회) 초과",
+                        now,
+                        row["id"],
+                    ),
+                )
+                conn.execute("COMMIT")
+                self.cleanup_spool(row)
+                return self.claim(worker_id)
+
+            status = "extracting" if row["status"] == "queued" else row["status"]
+            conn.execute(
+                """UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1,
+                       heartbeat_at = ?, updated_at = ? WHERE id = ?""",
+                (status, worker_id, now, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = self._to_job(row)
+        job["status"] = status
+        return job
+
+    def update(self, job_id, status, message=None, error=None, upload=None, result=None):
+        """작업 단계/결과 기록"""
+        fields = {
+            "status": status,
+            "message": message or STAGE_MESSAGES.get(status, status),
+            "updated_at": time.time(),
+            "heartbeat_at": time.time(),
+        }
+        if error is not None:
+            fields["error"] = error
+        if upload is not None:
+            fields["upload_json"] = json.dumps(upload, ensure_ascii=False)
+        if result is not None:
+            fields["result_json"] = json.dumps(result, ensure_ascii=False)
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+        finally:
+            conn.close()
+
+    def retry_or_fail(self, job, error):
+        """처리 중 오류가 난 작업을 재시도 대기열로 되돌리고, 최대 시도 횟수에 도달했으면 실패 처리
+
+        일시적 오류(429 재시도 소진, 네트워크 오류 등)로 업로드를 다시 하지 않도록
+        완료된 단계의 결과(추출 텍스트, 업로드 결과)는 남겨 두고 이어서 처리한다.
+        최종 상태("queued" 또는 "failed")를 반환한다.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ?", (job["id"],)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        attempts = row["attempts"] if row else self.max_attempts
+        if attempts >= self.max_attempts:
+            self.update(job["id"], "failed", error=error)
+            self.cleanup_spool(job)
+            return "failed"
+
+        retry_in = self.retry_delay * 2 ** max(attempts - 1, 0)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """UPDATE jobs SET status = 'queued', message = ?, error = ?,
+                       worker_id = NULL, retry_at = ?, updated_at = ? WHERE id = ?""",
+                (
+                    f"재시도 대기 중 ({attempts}/{self.max_attempts}회 시도)",
+                    error,
+                    time.time() + retry_in,
+                    time.time(),
+                    job["id"],
+                ),
+            )
+        finally:
+            conn.close()
+        return "queued"
+
+    def save_extracted_text(self, job, text, page_offsets=None):
+        """추출 결과(텍스트, 페이지 위치)를 임시 파일에 보관 (재시도 시 재사용)"""
+        with open(job["spool_path"] + ".json", "w", encoding="utf-8") as f:
+            json.dump({"text": text, "page_offsets": page_offsets}, f, ensure_ascii=False)
+
+    def load_extracted_text(self, job):
+        """이전 시도의 추출 결과 (텍스트, 페이지 위치), 없으면 None"""
+        try:
+            with open(job["spool_path"] + ".json", "r", encoding="utf-8") as f:
+                extracted = json.load(f)
+            return extracted["text"], extracted.get("page_offsets")
+        except FileNotFoundError:
+            pass
+        # 페이지 위치를 함께 저장하기 전의 임시 파일
+        try:
+            with open(job["spool_path"] + ".txt", "r", encoding="utf-8") as f:
+                return f.read(), None
+        except FileNotFoundError:
+            return None
+
+    def heartbeat(self, worker_id, job_ids):
+        """워커와 처리 중인 작업의 생존 신호 갱신"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, pid, heartbeat_at) VALUES (?, ?, ?)",
+                (worker_id, os.getpid(), now),
+            )
+            if job_ids:
+                conn.execute(
+                    f"""UPDATE jobs SET heartbeat_at = ?
+                        WHERE id IN ({','.join('?' * len(job_ids))}) AND worker_id = ?""",
+                    (now, *job_ids, worker_id),
+                )
+        finally:
+            conn.close()
+
+    def has_live_worker(self):
+        """최근 생존 신호를 보낸 워커가 있는지 확인"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE heartbeat_at >= ?",
+                (time.time() - self.lease_seconds,),
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] > 0
+
+    def cleanup_spool(self, job):
+        """완료되었거나 최종 실패한 작업의 임시 파일 삭제"""
+        spool_path = job["spool_path"]
+        for path in (spool_path, spool_path + ".json", spool_path + ".txt"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class JobWorker:
+    """작업 큐에서 문서를 꺼내 추출 → 업로드 → 인덱싱 → 요약을 수행하는 워커"""
+
+    def __init__(
+        self,
+        queue,
+        concurrency=2,
+        poll_interval=1.0,
+        heartbeat_interval=10.0,
+        faq_rebuild_delay=None,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+        # 문서 처리가 끝난 뒤 이 시간(초) 동안 추가 완료가 없으면 FAQ 재생성 (None 또는 0이면 끔)
+        self.faq_rebuild_delay = faq_rebuild_delay
+        self._faq_lock = threading.Lock()
+        self._faq_due = None
+        self._faq_running = False
+
+    def process(self, job):
+        """작업 하나 처리 (이전 시도에서 끝난 단계는 건너뜀)"""
+        from content_store import make_session_record
+        from document_processor import document_processor
+        from document_uploader import LocalFile, document_uploader
+        from rate_limiter import format_metrics, openai_rate_limiter
+
+        job_id = job["id"]
+        try:
+            with open(job["spool_path"], "rb") as f:
+                uploaded_file = LocalFile(job["file_name"], f.read())
+
+            # 1. 텍스트 추출 (이전 시도 결과가 있으면 재사용)
+            extracted = self.queue.load_extracted_text(job)
+            if extracted:
+                extracted_text, page_offsets = extracted
+            else:
+                self.queue.update(job_id, "extracting")
+                extracted_text, page_offsets = document_uploader.extract_text_with_pages(
+                    uploaded_file
+                )
+                if not extracted_text:
+                    raise Exception("텍스트를 추출할 수 없습니다.")
+                self.queue.save_extracted_text(job, extracted_text, page_offsets)
+
+            # 2. Blob Storage 업로드 + 추출 텍스트 사이드카 (이전 시도 결과가 있으면 재사용)
+            upload_result = job["upload"]
+            if not upload_result:
+                self.queue.update(job_id, "uploading")
+                upload_result = document_uploader.upload_to_blob_storage(
+                    uploaded_file, extracted_text=extracted_text, page_offsets=page_offsets
+                )
+                self.queue.update(job_id, "uploading", upload=upload_result)
+
+            result = document_uploader.build_document_result(
+                uploaded_file, extracted_text, upload_result
+            )
+
+            # 3. AI Search 인덱싱 (고정 키라 재실행해도 중복되지 않음)
+            self.queue.update(job_id, "indexing")
+            processing_results = {
+                "indexing": document_processor.index_document(result)
+            }
+
+            # 4. 요약 + 기술 키워드
+            self.queue.update(job_id, "summarizing")
+            processing_results.update(document_processor.summarize_document(result))
+            result["processing_results"] = processing_results
+
+            # 텍스트와 분석 결과는 저장소에, 작업/세션에는 요약 레코드만 보관
+            self.queue.update(
+                job_id, "done", result=make_session_record(result).to_dict()
+            )
+            self.queue.cleanup_spool(job)
+            self.schedule_faq_rebuild()
+            print(f"📈 OpenAI 호출 제한: {format_metrics(openai_rate_limiter.get_metrics())}")
+
+        except Exception as e:
+            status = self.queue.retry_or_fail(job, str(e))
+            retry_info = " - 재시도 예정" if status == "queued" else ""
+            print(f"❌ 작업 {job_id} 처리 실패{retry_info}: {str(e)}")
+
+    def schedule_faq_rebuild(self):
+        """FAQ 재생성 예약 (연속 업로드 중에는 마지막 완료 시점 기준으로 미룸)"""
+        if not self.faq_rebuild_delay:
+            return
+        with self._faq_lock:
+            self._faq_due = time.time() + self.faq_rebuild_delay
+
+    def _claim_faq_rebuild(self):
+        """예약 시각이 지났고 실행 중인 재생성이 없으면 실행 권한 획득"""
+        with self._faq_lock:
+            if self._faq_running or self._faq_due is None or time.time() < self._faq_due:
+                return False
+            self._faq_due = None
+            self._faq_running = True
+            return True
+
+    def rebuild_faq(self):
+        """완료된 문서의 요약으로 프로젝트 FAQ 재생성"""
+        from content_store import load_processing_results
+        from document_processor import document_processor
+
+        try:
+            documents = []
+            for record in self.queue.get_done_results():
+                summary_result = load_processing_results(record).get("summary", {})
+                if summary_result.get("success"):
+                    documents.append(
+                        {"file_name": record.file_name, "summary": summary_result["summary"]}
+                    )
+            if not documents:
+                return None
+
+            print(f"❓ FAQ 재생성 중... (요약 문서 {len(documents)}개)")
+            faq_result = document_processor.build_faq(documents)
+            print(
+                f"❓ FAQ {faq_result['saved_count']}/{faq_result['question_count']}개 저장 "
+                f"(프로젝트: {faq_result['project']})"
+            )
+            return faq_result
+        except Exception as e:
+            print(f"⚠️ FAQ 재생성 실패: {str(e)}")
+            return None
+        finally:
+            with self._faq_lock:
+                self._faq_running = False
+
+    def run_forever(self):
+        """작업을 계속 가져와 동시에 최대 concurrency개까지 처리"""
+        print(f"작업 워커 시작: {self.worker_id} (동시 처리 {self.concurrency}개)")
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        running = {}
+        last_heartbeat = 0.0
+
+        while True:
+            running = {j: f for j, f in running.items() if not f.done()}
+
+            if time.time() - last_heartbeat >= self.heartbeat_interval:
+                self.queue.heartbeat(self.worker_id, list(running))
+                last_heartbeat = time.time()
+
+            while len(running) < self.concurrency:
+                job = self.queue.claim(self.worker_id)
+                if job is None:
+                    break
+                print(f"작업 시작: {job['id']} ({job['file_name']}, {job['status']})")
+                running[job["id"]] = executor.submit(self.process, job)
+
+            # 문서 처리 슬롯을 차지하지 않도록 별도 스레드에서 실행
+            if self._claim_faq_rebuild():
+                threading.Thread(target=self.rebuild_faq, daemon=True).start()
+
+            time.sleep(self.poll_interval)
+
+
+# 전역 작업 큐 객체
+job_queue = JobQueue(
+    os.path.abspath(os.getenv("JOB_DB_PATH", os.path.join(BASE_DIR, "data", "jobs.sqlite3"))),
+    os.path.abspath(os.getenv("JOB_SPOOL_DIR", os.path.join(BASE_DIR, "data", "spool"))),
+)
+
+_spawn_lock = threading.Lock()
+_last_spawn = 0.0
+
+
+def ensure_worker_running():
+    """살아 있는 워커가 없으면 백그라운드 워커 프로세스 시작"""
+    global _last_spawn
+    with _spawn_lock:
+        # 방금 시작한 워커가 생존 신호를 보내기 전에는 다시 띄우지 않음
+        if time.time() - _last_spawn < job_queue.lease_seconds:
+            return False
+        if job_queue.has_live_worker():
+            return False
+        # 앱과 같은 작업 디렉터리/큐 경로로 실행 (다른 data/ 경로를 쓰지 않도록)
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            cwd=os.getcwd(),
+            env=dict(
+                os.environ,
+                JOB_DB_PATH=job_queue.db_path,
+                JOB_SPOOL_DIR=job_queue.spool_dir,
+            ),
+            start_new_session=True,
+        )
+        _last_spawn = time.time()
+        return True
+
+
+if __name__ == "__main__":
+    JobWorker(
+        job_queue,
+        concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "2")),
+        faq_rebuild_delay=float(os.getenv("FAQ_REBUILD_DELAY", "300")),
+    ).run_forever()
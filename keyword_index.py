@@ -0,0 +1,349 @@
+# keyword_index.py
+import json
+import os
+import re
+import sqlite3
+
+# 같은 기술을 가리키는 표기 -> 정규화된 이름
+KEYWORD_ALIASES = {
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "springboot": "spring boot",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "ms sql": "sql server",
+    "mssql": "sql server",
+    "elastic search": "elasticsearch",
+    "apache kafka": "kafka",
+}
+
+# 흔한 단어와 겹치는 짧은 표기 (본문에서는 키워드에 적힌 대소문자 그대로만 찾고 별칭으로는 쓰지 않음)
+AMBIGUOUS_FORMS = {"go", "node", "js", "ts"}
+
+# 공백으로 구분된 키워드 끝의 버전 표기 (예: "Python 3.11", "Vue v3"; "S3", "EC2"는 유지)
+_VERSION_SUFFIX = re.compile(r"\s+v?\d+(\.\d+)*(\.x)?$")
+
+# 키워드 표기 앞뒤 경계 (단어 문자, -, "."+단어 문자로 이어지면 다른 토큰의 일부)
+# 뒤쪽은 영문/숫자만 이어짐으로 봄 ("Kafka를"처럼 바로 붙는 조사는 허용)
+_TOKEN_START = r"(?<![\w\-])(?<!\w\.)"
+_TOKEN_END = r"(?![A-Za-z0-9_\-])(?!\.[A-Za-z0-9_])"
+
+
+def normalize_technology(keyword):
+    """기술 키워드를 인덱스 키로 정규화 (대소문자, 공백, 버전, 별칭 통일)"""
+    key = re.sub(r"\s+", " ", keyword.strip().strip("-*•`'\".,:;()[]")).lower()
+    if not key:
+        return ""
+
+    stripped = _VERSION_SUFFIX.sub("", key).strip()
+    if stripped:
+        key = stripped
+
+    return KEYWORD_ALIASES.get(key, key)
+
+
+class KeywordIndex:
+    """정규화된 기술 키워드 -> 빈도, 문서, 청크 위치 인덱스 (SQLite에 문서 단위로 갱신)"""
+
+    def __init__(self, db_path, legacy_json_path=None):
+        self.db_path = db_path
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+        if legacy_json_path and os.path.exists(legacy_json_path):
+            self._import_json(legacy_json_path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS keywords (
+                    key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS documents (
+                    document_id TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS mentions (
+                    key TEXT NOT NULL,
+                    document_id TEXT NOT NULL,
+                    chunks TEXT NOT NULL,
+                    mentions INTEGER NOT NULL,
+                    PRIMARY KEY (key, document_id)
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS mentions_document ON mentions (document_id)"
+            )
+        finally:
+            conn.close()
+
+    def _import_json(self, json_path):
+        """이전 JSON 인덱스 파일을 한 번 옮겨옴 (이미 문서가 있으면 건너뜀)"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone():
+                conn.execute("COMMIT")
+                return
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, keyword_entry in data.get("keywords", {}).items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO keywords (key, name) VALUES (?, ?)",
+                    (key, keyword_entry["name"]),
+                )
+                for document_id, entry in keyword_entry["documents"].items():
+                    conn.execute(
+                        """INSERT OR REPLACE INTO mentions (key, document_id, chunks, mentions)
+                           VALUES (?, ?, ?, ?)""",
+                        (key, document_id, json.dumps(entry["chunks"]), entry["mentions"]),
+                    )
+            for document_id, document in data.get("documents", {}).items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO documents (document_id, file_name) VALUES (?, ?)",
+                    (document_id, document["file_name"]),
+                )
+            conn.execute("COMMIT")
+            print(f"🔁 키워드 인덱스 이전 완료: {json_path} -> {self.db_path}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _find_chunks(self, surfaces, exact_surfaces, chunks):
+        """키워드 표기가 등장하는 청크 번호와 등장 횟수
+
+        exact_surfaces(흔한 단어와 겹치는 표기)는 대소문자까지 같을 때만 센다.
+        """
+        alternatives = sorted(
+            [(s, True) for s in surfaces] + [(s, False) for s in exact_surfaces],
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        if not alternatives:
+            return [], 0
+        # 단어 문자나 -, 파일 확장자(.js 등)로 이어지는 표기는 다른 토큰의 일부로 봄
+        pattern = re.compile(
+            _TOKEN_START
+            + "(?:"
+            + "|".join(
+                f"(?i:{re.escape(s)})" if ignore_case else re.escape(s)
+                for s, ignore_case in alternatives
+            )
+            + ")"
+            + _TOKEN_END
+        )
+        positions = []
+        mentions = 0
+        for i, chunk in enumerate(chunks):
+            count = len(pattern.findall(chunk))
+            if count:
+                positions.append(i)
+                mentions += count
+        return positions, mentions
+
+    def add_document(self, document_id, file_name, keywords, chunks=None):
+        """문서의 키워드를 인덱스에 반영 (같은 문서를 다시 넣으면 교체)"""
+        chunks = chunks or []
+
+        # 정규화 키별 원래 표기 모음 (흔한 단어와 겹치는 표기는 적힌 그대로만 찾음)
+        surfaces = {}
+        for keyword in keywords:
+            key = normalize_technology(keyword)
+            if not key:
+                continue
+            surface = surfaces.setdefault(
+                key, {"name": keyword.strip(), "forms": set(), "exact_forms": set()}
+            )
+            if keyword.strip().lower() in AMBIGUOUS_FORMS:
+                surface["exact_forms"].add(keyword.strip())
+            else:
+                surface["forms"].add(keyword.strip())
+            if key not in AMBIGUOUS_FORMS:
+                surface["forms"].add(key)
+        for alias, key in KEYWORD_ALIASES.items():
+            if key in surfaces and alias not in AMBIGUOUS_FORMS:
+                surfaces[key]["forms"].add(alias)
+
+        entries = {}
+        for key, surface in surfaces.items():
+            entries[key] = self._find_chunks(
+                surface["forms"], surface["exact_forms"], chunks
+            )
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            previous_keys = self._remove_document(conn, document_id)
+            conn.execute(
+                "INSERT INTO documents (document_id, file_name) VALUES (?, ?)",
+                (document_id, file_name),
+            )
+            for key, (positions, mentions) in entries.items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO keywords (key, name) VALUES (?, ?)",
+                    (key, surfaces[key]["name"]),
+                )
+                conn.execute(
+                    """INSERT INTO mentions (key, document_id, chunks, mentions)
+                       VALUES (?, ?, ?, ?)""",
+                    (key, document_id, json.dumps(positions), mentions),
+                )
+            self._remove_unused_keywords(conn, previous_keys)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        return list(entries)
+
+    def remove_document(self, document_id):
+        """문서를 인덱스에서 제거"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            exists = conn.execute(
+                "SELECT 1 FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+            self._remove_unused_keywords(conn, self._remove_document(conn, document_id))
+            conn.execute("COMMIT")
+            return exists is not None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _remove_document(self, conn, document_id):
+        """트랜잭션 안에서 문서 항목을 제거하고 문서가 갖고 있던 키워드 반환"""
+        keys = [
+            row["key"]
+            for row in conn.execute(
+                "SELECT key FROM mentions WHERE document_id = ?", (document_id,)
+            )
+        ]
+        conn.execute("DELETE FROM mentions WHERE document_id = ?", (document_id,))
+        conn.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+        return keys
+
+    def _remove_unused_keywords(self, conn, keys):
+        """더 이상 어떤 문서에도 없는 키워드 제거"""
+        for key in keys:
+            conn.execute(
+                """DELETE FROM keywords WHERE key = ?
+                   AND NOT EXISTS (SELECT 1 FROM mentions WHERE mentions.key = ?)""",
+                (key, key),
+            )
+
+    def has_document(self, document_id):
+        """문서가 인덱스에 반영되어 있는지 확인"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def lookup(self, keyword):
+        """기술을 언급한 문서 목록 (예: "Kafka" -> 문서와 청크 위치)"""
+        key = normalize_technology(keyword)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """SELECT m.document_id, d.file_name, m.chunks, m.mentions
+                   FROM mentions m JOIN documents d ON d.document_id = m.document_id
+                   WHERE m.key = ?
+                   ORDER BY m.mentions DESC""",
+                (key,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                "document_id": row["document_id"],
+                "file_name": row["file_name"],
+                "chunks": json.loads(row["chunks"]),
+                "mentions": row["mentions"],
+            }
+            for row in rows
+        ]
+
+    def top_keywords(self, document_ids=None, limit=None):
+        """문서 빈도 순 기술 목록 (document_ids가 주어지면 해당 문서들로 한정)"""
+        where, params = "", []
+        if document_ids is not None:
+            document_ids = list(document_ids)
+            if not document_ids:
+                return []
+            where = f"WHERE m.document_id IN ({','.join('?' * len(document_ids))})"
+            params = document_ids
+        query = f"""SELECT k.key, k.name, COUNT(*) AS document_frequency,
+                       SUM(m.mentions) AS mentions
+                   FROM mentions m JOIN keywords k ON k.key = m.key
+                   {where}
+                   GROUP BY k.key
+                   ORDER BY document_frequency DESC, mentions DESC, k.key"""
+        if limit:
+            query += " LIMIT ?"
+            params = params + [limit]
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                "keyword": row["key"],
+                "name": row["name"],
+                "document_frequency": row["document_frequency"],
+                "mentions": row["mentions"],
+            }
+            for row in rows
+        ]
+
+
+def _index_paths(path):
+    """설정 경로에서 (SQLite 경로, 이전 JSON 인덱스 경로) 결정 (JSON 파일을 가리키던 설정도 허용)"""
+    base = os.path.splitext(path)[0]
+    if path.endswith(".json"):
+        return base + ".sqlite3", path
+    return path, base + ".json"
+
+
+# 전역 키워드 인덱스 객체 (이전 JSON 인덱스가 있으면 처음 한 번 옮겨옴)
+_db_path, _legacy_json_path = _index_paths(
+    os.getenv("KEYWORD_INDEX_PATH", os.path.join("data", "keyword_index.sqlite3"))
+)
+keyword_index = KeywordIndex(_db_path, legacy_json_path=_legacy_json_path)
@@ -0,0 +1,100 @@
+# migrate_index.py
+"""기존 onboarding-index 레이아웃에서 compact 스키마 인덱스로 이전
+
+사용 예:
+    python migrate_index.py --target onboarding-index-compact
+
+compact 인덱스를 만들고 기존 인덱스의 청크를 같은 키(doc_<id>_chunk_<n>)로 옮긴다.
+키가 같으므로 중단 후 다시 실행해도 중복 없이 덮어쓴다.
+이전이 끝나면 AZURE_SEARCH_INDEX_NAME을 새 인덱스로, AZURE_SEARCH_SCHEMA=compact로 바꾼다.
+(검색 API의 페이지 조회 한도(10만 건)를 넘는 인덱스는 reindex.py로 사이드카에서 다시 만든다.)
+"""
+import argparse
+import json
+import sys
+import time
+
+from azure_config import azure_config
+from search_schema import MIGRATION_SELECT_FIELDS, legacy_to_compact
+
+
+def upload_batch(target_client, batch):
+    """compact 문서 묶음 업로드 후 실패 건수 반환"""
+    results = target_client.merge_or_upload_documents(batch)
+    return sum(1 for result in results if not result.succeeded)
+
+
+def migrate_index(source_index, target_index, batch_size=500):
+    """기존 인덱스 전체를 compact 인덱스로 복사하고 이전 결과 반환"""
+    azure_config.create_compact_index(target_index)
+    source_client = azure_config.get_search_client(source_index)
+    target_client = azure_config.get_search_client(target_index)
+
+    migrated = failed = 0
+    source_bytes = target_bytes = 0
+    started = time.perf_counter()
+    batch = []
+
+    for record in source_client.search(search_text="*", select=MIGRATION_SELECT_FIELDS):
+        record = {k: v for k, v in record.items() if not k.startswith("@search.")}
+        document = legacy_to_compact(record)
+        source_bytes += len(json.dumps(record))
+        target_bytes += len(json.dumps(document))
+        batch.append(document)
+
+        if len(batch) >= batch_size:
+            failed += upload_batch(target_client, batch)
+            migrated += len(batch)
+            print(f"📦 {migrated}개 청크 이전")
+            batch = []
+
+    if batch:
+        failed += upload_batch(target_client, batch)
+        migrated += len(batch)
+
+    return {
+        "migrated": migrated - failed,
+        "failed": failed,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+        "source_bytes": source_bytes,
+        "target_bytes": target_bytes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="compact 스키마 인덱스로 이전")
+    parser.add_argument(
+        "--source",
+        default=azure_config.search_index_name,
+        help="기존 인덱스 이름 (기본: AZURE_SEARCH_INDEX_NAME)",
+    )
+    parser.add_argument("--target", required=True, help="새로 만들 compact 인덱스 이름")
+    parser.add_argument("--batch-size", type=int, default=500, help="업로드 묶음 크기")
+    args = parser.parse_args(argv)
+
+    if args.source == args.target:
+        print("❌ 기존 인덱스와 다른 이름의 대상 인덱스를 지정하세요.")
+        return 2
+
+    try:
+        report = migrate_index(args.source, args.target, batch_size=args.batch_size)
+    except Exception as e:
+        print(f"❌ 인덱스 이전 실패: {str(e)}")
+        return 1
+
+    print(f"\n📊 인덱스 이전 결과 ({args.source} → {args.target})")
+    print(f"• 성공 {report['migrated']}개, 실패 {report['failed']}개")
+    print(f"• 경과 시간: {report['elapsed_seconds']}초")
+    total = report["migrated"] + report["failed"]
+    if total:
+        # 조회한 필드 기준 비교 (기존 인덱스의 text/layoutText 복사본은 포함되지 않음)
+        print(
+            f"• 청크당 크기: {report['source_bytes'] // total}B → "
+            f"{report['target_bytes'] // total}B"
+        )
+    print(f"\n다음 설정으로 전환하세요: AZURE_SEARCH_INDEX_NAME={args.target}, AZURE_SEARCH_SCHEMA=compact")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# pdf_ocr.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import PyPDF2
+
+# 텍스트 레이어로 인정하는 최소 글자 수 (문자/숫자 기준)
+MIN_PAGE_TEXT_CHARS = 20
+
+# 공백 제외 글자 중 문자/숫자 비율이 이보다 낮으면 깨진 텍스트 레이어로 간주
+MIN_TEXT_RATIO = 0.5
+
+# Read API 결과 폴링 간격과 최대 대기 시간 (초)
+OCR_POLL_INTERVAL = 0.5
+OCR_TIMEOUT = 30
+
+
+def needs_ocr(text):
+    """텍스트 레이어가 없거나(스캔 페이지) 글꼴 매핑이 깨져 읽을 수 없는 페이지인지 판단"""
+    characters = [c for c in text or "" if not c.isspace()]
+    meaningful = sum(1 for c in characters if c.isalnum())
+    if meaningful < MIN_PAGE_TEXT_CHARS:
+        return True
+    return meaningful / len(characters) < MIN_TEXT_RATIO
+
+
+def page_has_images(page):
+    """페이지(Form XObject 포함)에 이미지가 있는지 확인 (빈 페이지는 OCR하지 않음)"""
+
+    def has_images(resources, depth=0):
+        xobjects = (resources or {}).get("/XObject")
+        if not xobjects or depth > 3:
+            return False
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                return True
+            if subtype == "/Form" and has_images(xobject.get("/Resources"), depth + 1):
+                return True
+        return False
+
+    try:
+        return has_images(page.get("/Resources"))
+    except Exception:
+        # 리소스 구조가 비정상이면 OCR 대상으로 둠
+        return True
+
+
+def single_page_pdf(page):
+    """페이지 하나만 담은 PDF 바이트 (Read API는 PDF를 직접 받으므로 래스터화하지 않음)"""
+    writer = PyPDF2.PdfWriter()
+    writer.add_page(page)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def read_ocr(vision_client, data):
+    """Computer Vision Read API로 이미지/PDF를 OCR하여 페이지별 줄 목록 반환"""
+    response = vision_client.read_in_stream(BytesIO(data), raw=True)
+    operation_id = response.headers["Operation-Location"].split("/")[-1]
+
+    deadline = time.monotonic() + OCR_TIMEOUT
+    while True:
+        result = vision_client.get_read_result(operation_id)
+        if result.status.lower() not in ["notstarted", "running"]:
+            break
+        if time.monotonic() >= deadline:
+            raise Exception("OCR 처리 시간이 초과되었습니다.")
+        time.sleep(OCR_POLL_INTERVAL)
+
+    if result.status.lower() != "succeeded":
+        raise Exception(f"OCR 실패 (상태: {result.status})")
+    if not result.analyze_result or not result.analyze_result.read_results:
+        return []
+    return [
+        [line.text for line in page.lines]
+        for page in result.analyze_result.read_results
+    ]
+
+
+def ocr_pdf_pages(vision_client, pages, max_concurrency=4):
+    """PDF 페이지들을 동시에 OCR (동시 요청 수 제한), {페이지 번호: 텍스트 또는 예외} 반환"""
+
+    def ocr_page(page):
+        lines = read_ocr(vision_client, single_page_pdf(page))
+        return "\n".join(line for page_lines in lines for line in page_lines)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {
+            index: executor.submit(ocr_page, page) for index, page in pages.items()
+        }
+        for index, future in futures.items():
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = e
+    return results
+
+
+def extract_pdf_pages(data, vision_client=None, max_concurrency=4, progress=None):
+    """PDF 페이지별 텍스트 추출 - 텍스트 레이어가 없는 페이지만 OCR해 페이지 순서대로 병합
+
+    vision_client가 없으면 텍스트 레이어만 사용한다.
+    """
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    pages = [page.extract_text() or "" for page in reader.pages]
+
+    scanned = {
+        index: reader.pages[index]
+        for index, text in enumerate(pages)
+        if needs_ocr(text) and page_has_images(reader.pages[index])
+    }
+    if not scanned:
+        return pages
+    if vision_client is None:
+        if progress:
+            progress.warning(
+                f"⚠️ 텍스트 레이어가 없는 페이지 {len(scanned)}개 - OCR 설정이 없어 건너뜁니다."
+            )
+        return pages
+
+    if progress:
+        progress.info(
+            f"🔍 전체 {len(pages)}페이지 중 스캔 페이지 {len(scanned)}개를 OCR로 추출합니다..."
+        )
+    failed = 0
+    for index, text in ocr_pdf_pages(vision_client, scanned, max_concurrency).items():
+        if isinstance(text, Exception):
+            failed += 1
+            print(f"❌ {index + 1}페이지 OCR 실패: {str(text)}")
+        elif text.strip():
+            pages[index] = text
+    if failed and progress:
+        progress.warning(f"⚠️ {failed}개 페이지 OCR 실패 (텍스트 레이어만 사용)")
+    return pages
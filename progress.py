@@ -0,0 +1,41 @@
+# progress.py
+
+
+class ProgressReporter:
+    """처리 진행 상황 콜백 인터페이스 (기본 구현은 아무것도 하지 않음)"""
+
+    def info(self, message):
+        pass
+
+    def success(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+    def data(self, label, value):
+        """구조화된 디버깅 정보 (처리 결과 구조 등)"""
+        pass
+
+
+class PrintProgress(ProgressReporter):
+    """콘솔 출력 (작업 워커, CLI)"""
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+
+    def info(self, message):
+        print(f"{self.prefix}{message}")
+
+    def success(self, message):
+        print(f"{self.prefix}{message}")
+
+    def warning(self, message):
+        print(f"{self.prefix}{message}")
+
+    def error(self, message):
+        print(f"{self.prefix}{message}")
+
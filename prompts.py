@@ -0,0 +1,212 @@
+# prompts.py
+import threading
+
+# 프롬프트 템플릿: 고정된 역할/지시문을 앞에, 문서명/질문/본문 같은 가변 내용을 맨 뒤에 둔다.
+# Azure OpenAI는 앞부분이 같은 프롬프트(1024토큰 이상)의 처리 결과를 캐시하므로
+# 가변 내용이 앞에 오면 매 호출이 처음부터 다시 처리된다.
+
+SUMMARY_SYSTEM = """당신은 프로젝트 문서 분석 전문가입니다. 핵심 내용을 정확하고 간결하게 요약합니다.
+
+사용자가 보내는 문서를 분석하여 다음 형식으로 요약해주세요:
+1. 문서 개요 (2-3줄)
+2. 주요 내용 (3-5개 요점)
+3. 핵심 기술/시스템 (있는 경우)
+4. 중요 참고사항 (있는 경우)"""
+
+KEYWORD_SYSTEM = """기술 문서에서 기술 키워드만 간략하게 추출합니다.
+
+사용자가 보내는 문서에서 기술 키워드만 추출해서 콤마로 구분해주세요 (예: Python, React, Docker, AWS)."""
+
+ANALYSIS_SYSTEM = """당신은 프로젝트 문서 분석 전문가입니다. 핵심 내용을 정확하고 간결하게 요약하고 기술 키워드를 추출하여 JSON으로만 응답합니다.
+
+사용자가 보내는 문서를 분석하여 다음 키를 가진 JSON 객체 하나로만 응답해주세요:
+{
+  "overview": "문서 개요 (2-3줄)",
+  "key_points": ["주요 내용 (3-5개 요점)"],
+  "technologies": ["핵심 기술/시스템 설명 (없으면 빈 배열)"],
+  "notes": ["중요 참고사항 (없으면 빈 배열)"],
+  "keywords": ["기술 키워드 (예: Python, React, Docker, AWS)"]
+}"""
+
+ANSWER_ROLE = "당신은 프로젝트 수행 중 신규 투입자에게 인수인계를 하는 전문가입니다. 기술 문서와 일반 지식을 활용하여 신규 투입자에게 도움이 되는 답변을 제공합니다."
+
+# 대화 기록 메시지가 시스템 메시지 바로 뒤에 붙으므로 답변 규칙은 모두 시스템 메시지에 둔다
+DOCUMENT_ANSWER_SYSTEM = f"""{ANSWER_ROLE}
+
+사용자 메시지의 참고 문서를 참고하여 질문에 답변해주세요.
+
+답변 규칙:
+1. 먼저 문서에 있는 정보를 기반으로 답변하세요
+2. 문서 정보가 부족하면 일반적인 지식으로 보완하되, 이를 명시하세요
+3. 한국어로 명확하고 도움이 되는 답변을 작성하세요
+4. 답변 마지막에 참고한 문서를 명시하세요
+
+답변 형식:
+### 문서 기반 답변
+### 추가 일반 지식 (해당하는 경우)
+
+**참고 문서:** [문서명들]"""
+
+GENERAL_ANSWER_SYSTEM = f"""{ANSWER_ROLE}
+
+사용자의 질문에 대해 일반적인 지식을 바탕으로 답변해주세요.
+
+답변 규칙:
+1. 프로젝트 신규 투입 및 기술 학습 관점에서 도움이 되는 답변을 제공하세요
+2. 한국어로 명확하고 실용적인 답변을 작성하세요
+3. 가능하면 구체적인 예시나 방법을 포함하세요
+4. 답변 마지막에 "※ 업로드된 문서에서 관련 정보를 찾을 수 없어 일반적인 지식으로 답변했습니다."라고 명시하세요"""
+
+REWRITE_SYSTEM = """당신은 대화형 검색을 위한 질의 재작성기입니다. 설명 없이 질의만 출력합니다.
+
+사용자 메시지의 대화에 이어지는 마지막 질문을 문서 검색용 독립 질의로 바꿔주세요.
+대명사나 생략된 대상을 대화 내용으로 채우고, 질의 한 줄만 출력하세요."""
+
+HISTORY_SUMMARY_SYSTEM = """당신은 대화 기록을 간결하게 요약하는 전문가입니다.
+
+사용자 메시지의 기존 대화 요약과 이어지는 대화를 합쳐 하나의 요약으로 정리해주세요.
+이후 질문에 답할 때 필요한 사실, 사용자가 관심을 보인 주제, 결정된 내용 위주로 10줄 이내로 작성하세요."""
+
+FAQ_QUESTIONS_SYSTEM = """당신은 프로젝트 수행 중 신규 투입자에게 인수인계를 하는 전문가입니다. JSON으로만 응답합니다.
+
+사용자 메시지의 프로젝트 문서 요약을 읽고 신규 투입자가 첫 주에 자주 물어볼 만한 질문을 만들어주세요.
+문서 내용으로 답할 수 있는 구체적인 질문이어야 합니다.
+
+다음 키를 가진 JSON 객체 하나로만 응답해주세요:
+{"questions": ["질문"]}"""
+
+GUIDE_FORMAT = """### 🚀 프로젝트 기술 스택
+- 주요 기술들의 간단한 설명
+
+### 📚 우선 학습 기술 (중요도 순)
+1. **기술명1**: 학습 이유 및 중요도
+2. **기술명2**: 학습 이유 및 중요도
+...
+
+## 📖 추천 학습 리소스
+- 각 기술별 추천 문서나 튜토리얼"""
+
+GUIDE_SYSTEM = f"""당신은 개발자를 위한 기술 학습 가이드 작성 전문가입니다. 제공된 문서를 통합하여 신규 투입자를 위한 기술 학습 가이드를 작성합니다.
+
+사용자 메시지의 지시에 따라 다음 형식으로 학습 가이드를 작성해주세요:
+
+{GUIDE_FORMAT}"""
+
+GUIDE_GENERATE_INSTRUCTION = "다음은 프로젝트 문서들의 요약입니다. 이를 바탕으로 신규 투입자를 위한 기술 학습 가이드를 작성해주세요."
+GUIDE_COMBINE_INSTRUCTION = "다음은 프로젝트 문서 묶음별로 작성된 기술 학습 가이드들입니다. 중복을 제거하고 하나의 통합 가이드로 정리해주세요."
+GUIDE_MERGE_INSTRUCTION = "다음은 기존 기술 학습 가이드와 새로 추가된 프로젝트 문서들의 요약입니다. 새 문서의 기술과 내용을 기존 가이드에 반영하여 갱신된 가이드를 작성해주세요. 기존 내용은 유지하되 중요도 순서는 다시 판단해주세요."
+
+
+def _messages(system, user, history=None):
+    """시스템 메시지(고정) → 대화 기록 → 사용자 메시지(가변) 순서의 메시지 목록"""
+    return [
+        {"role": "system", "content": system},
+        *(history or []),
+        {"role": "user", "content": user},
+    ]
+
+
+def _document_content(file_name, file_type, text, label="내용"):
+    return f"문서명: {file_name}\n문서 타입: {file_type}\n\n{label}:\n{text}"
+
+
+def summary_messages(file_name, file_type, text):
+    """문서 요약 프롬프트"""
+    return _messages(SUMMARY_SYSTEM, _document_content(file_name, file_type, text))
+
+
+def keyword_messages(text):
+    """기술 키워드 추출 프롬프트"""
+    return _messages(KEYWORD_SYSTEM, f"문서 내용:\n{text}")
+
+
+def analysis_messages(file_name, file_type, text):
+    """요약 + 기술 키워드 단일 JSON 분석 프롬프트"""
+    return _messages(ANALYSIS_SYSTEM, _document_content(file_name, file_type, text))
+
+
+def answer_messages(question, context=None, history=None):
+    """질의응답 프롬프트 (context가 있으면 문서 기반, 없으면 일반 지식 답변)"""
+    if context:
+        return _messages(
+            DOCUMENT_ANSWER_SYSTEM, f"참고 문서:\n{context}\n\n질문: {question}", history
+        )
+    return _messages(GENERAL_ANSWER_SYSTEM, f"질문: {question}", history)
+
+
+def rewrite_messages(transcript, question):
+    """후속 질문 재작성 프롬프트"""
+    return _messages(REWRITE_SYSTEM, f"{transcript}\n\n마지막 질문: {question}")
+
+
+def history_summary_messages(summary, dialogue):
+    """대화 기록 누적 요약 프롬프트"""
+    return _messages(
+        HISTORY_SUMMARY_SYSTEM,
+        f"기존 요약:\n{summary or '(없음)'}\n\n이어지는 대화:\n{dialogue}",
+    )
+
+
+def faq_question_messages(digests, limit):
+    """FAQ 질문 생성 프롬프트"""
+    return _messages(
+        FAQ_QUESTIONS_SYSTEM, f"질문 수: 최대 {limit}개\n\n프로젝트 문서 요약:\n{digests}"
+    )
+
+
+def guide_messages(instruction, sections):
+    """기술 가이드 프롬프트 (sections는 (제목, 본문) 목록)"""
+    body = "\n\n".join(f"{title}:\n{text}" for title, text in sections)
+    return _messages(GUIDE_SYSTEM, f"{instruction}\n\n{body}")
+
+
+class PromptCacheStats:
+    """프롬프트별 호출 수, 프롬프트 토큰, 캐시된 토큰(usage.prompt_tokens_details.cached_tokens) 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}  # 프롬프트 이름 -> {"calls", "prompt_tokens", "cached_tokens", "cache_hits"}
+
+    def record(self, prompt_name, usage):
+        """응답 usage를 집계하고 이번 호출의 캐시된 토큰 수 반환"""
+        if usage is None:
+            return 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                prompt_name or "other",
+                {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "cache_hits": 0},
+            )
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["cached_tokens"] += cached_tokens
+            if cached_tokens:
+                stats["cache_hits"] += 1
+        return cached_tokens
+
+    def get_metrics(self):
+        """프롬프트별 집계와 전체 캐시 적중률 (토큰 기준)"""
+        with self._lock:
+            prompts = {name: dict(stats) for name, stats in self._stats.items()}
+        prompt_tokens = sum(s["prompt_tokens"] for s in prompts.values())
+        cached_tokens = sum(s["cached_tokens"] for s in prompts.values())
+        for stats in prompts.values():
+            stats["cached_ratio"] = (
+                stats["cached_tokens"] / stats["prompt_tokens"]
+                if stats["prompt_tokens"]
+                else 0.0
+            )
+        return {
+            "calls": sum(s["calls"] for s in prompts.values()),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "cached_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+            "prompts": prompts,
+        }
+
+
+# 전역 프롬프트 캐시 집계 객체 (프로세스 단위)
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,322 @@
+# rate_limiter.py
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import openai
+
+from azure_config import azure_config
+
+# 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 질의응답 등 사용자가 기다리는 호출
+PRIORITY_BACKGROUND = 10  # 문서 요약 등 백그라운드 호출
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+class TokenBucketRateLimiter:
+    """배포의 TPM/RPM에 맞춘 토큰 버킷 (우선순위 대기열 + 대화형 예약분 + 429 대응)"""
+
+    def __init__(self, tokens_per_minute, requests_per_minute, interactive_reserve=0.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        # 백그라운드 호출이 건드리지 못하는 버킷 비율 (대화형 호출 전용)
+        self.interactive_reserve = interactive_reserve
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+        # 대기열: (우선순위, 순번) - 맨 앞 대기자만 버킷을 사용할 수 있음
+        self._waiters = []
+        self._sequence = itertools.count()
+        # 비동기 대기자 깨우기용: 순번 -> (이벤트 루프, asyncio.Event)
+        self._async_wakeups = {}
+
+        # 지표
+        self._wait_times = deque(maxlen=1000)
+        self._acquired = 0
+        self._throttled = 0
+        self._retries = 0
+        self._max_queue_depth = 0
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60,
+        )
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60,
+        )
+
+    def _reserved(self, priority):
+        """우선순위별로 남겨둬야 하는 (토큰, 요청) 수 - 대화형 호출은 예약분까지 사용"""
+        if priority <= PRIORITY_INTERACTIVE:
+            return 0.0, 0.0
+        return (
+            self.tokens_per_minute * self.interactive_reserve,
+            self.requests_per_minute * self.interactive_reserve,
+        )
+
+    def _cap_cost(self, cost, priority):
+        """한 번에 확보할 수 있는 최대 토큰 수로 제한 (백그라운드는 예약분 제외)"""
+        reserved_tokens, _ = self._reserved(priority)
+        return min(cost, max(1, self.tokens_per_minute - reserved_tokens))
+
+    def _try_acquire(self, ticket, cost):
+        """잠금 상태에서 버킷 사용 시도 - 성공하면 0, 아니면 다시 시도할 때까지의 대기 시간"""
+        now = time.monotonic()
+        self._refill(now)
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._waiters[0] != ticket:
+            # 맨 앞 차례가 되면 깨어남 (동기 대기자는 주기적으로 재확인)
+            return 1.0
+
+        # 백그라운드 호출은 예약분을 남긴 범위에서만 버킷을 사용
+        reserved_tokens, reserved_requests = self._reserved(ticket[0])
+        needed_tokens = cost + reserved_tokens
+        needed_requests = 1 + reserved_requests
+        if self._tokens >= needed_tokens and self._requests >= needed_requests:
+            self._tokens -= cost
+            self._requests -= 1
+            heapq.heappop(self._waiters)
+            return 0.0
+
+        token_wait = max(0.0, needed_tokens - self._tokens) * 60 / self.tokens_per_minute
+        request_wait = max(0.0, needed_requests - self._requests) * 60 / self.requests_per_minute
+        return max(token_wait, request_wait, 0.001)
+
+    def _enqueue(self, priority):
+        ticket = (priority, next(self._sequence))
+        heapq.heappush(self._waiters, ticket)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+        return ticket
+
+    def _notify_waiters(self):
+        """잠금 상태에서 동기 대기자와 맨 앞 비동기 대기자를 깨움
+
+        비동기 대기자는 맨 앞 차례가 되었을 때만 깨워 대기자 수에 비례한 깨우기를 피한다.
+        """
+        self._condition.notify_all()
+        if not self._waiters:
+            return
+        waiter = self._async_wakeups.get(self._waiters[0])
+        if waiter is None:
+            return
+        loop, wakeup = waiter
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _record_wait(self, started_at):
+        self._acquired += 1
+        self._wait_times.append(time.monotonic() - started_at)
+
+    def acquire(self, cost, priority=PRIORITY_BACKGROUND):
+        """토큰 cost개와 요청 1개를 확보할 때까지 대기"""
+        cost = self._cap_cost(cost, priority)
+        started_at = time.monotonic()
+        with self._condition:
+            ticket = self._enqueue(priority)
+            while True:
+                wait = self._try_acquire(ticket, cost)
+                if wait == 0.0:
+                    break
+                self._condition.wait(timeout=wait)
+            self._record_wait(started_at)
+            self._notify_waiters()
+
+    async def acquire_async(self, cost, priority=PRIORITY_BACKGROUND):
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        cost = self._cap_cost(cost, priority)
+        started_at = time.monotonic()
+        wakeup = asyncio.Event()
+        with self._lock:
+            ticket = self._enqueue(priority)
+            self._async_wakeups[ticket] = (asyncio.get_running_loop(), wakeup)
+        try:
+            while True:
+                with self._lock:
+                    wakeup.clear()
+                    wait = self._try_acquire(ticket, cost)
+                    if wait == 0.0:
+                        self._record_wait(started_at)
+                        del self._async_wakeups[ticket]
+                        self._notify_waiters()
+                        return
+                    if self._waiters[0] != ticket:
+                        wait = None
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            # 취소된 대기자는 대기열에서 제거
+            with self._lock:
+                self._async_wakeups.pop(ticket, None)
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                self._notify_waiters()
+            raise
+
+    def release_unused(self, unused_tokens):
+        """실제 사용량이 추정치보다 적으면 차이만큼 버킷에 반환"""
+        if unused_tokens <= 0:
+            return
+        with self._condition:
+            self._tokens = min(self.tokens_per_minute, self._tokens + unused_tokens)
+            self._notify_waiters()
+
+    def throttle(self, delay, retry=True):
+        """429 응답 시 지정 시간 동안 모든 호출을 멈춤"""
+        with self._condition:
+            self._throttled += 1
+            if retry:
+                self._retries += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    def record_retry(self):
+        with self._lock:
+            self._retries += 1
+
+    def reset_metrics(self):
+        """누적 지표 초기화 (부하 테스트 단계별 측정용, 버킷 상태는 유지)"""
+        with self._lock:
+            self._wait_times.clear()
+            self._acquired = 0
+            self._throttled = 0
+            self._retries = 0
+            self._max_queue_depth = len(self._waiters)
+
+    def get_metrics(self):
+        """대기열 깊이와 대기 시간 지표"""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            return {
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self._max_queue_depth,
+                "acquired": self._acquired,
+                "throttled_429": self._throttled,
+                "retries": self._retries,
+                "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait_seconds": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "max_wait_seconds": waits[-1] if waits else 0.0,
+                "available_tokens": int(self._tokens),
+                "available_requests": int(self._requests),
+            }
+
+
+def format_metrics(metrics):
+    """호출 제한 지표를 한 줄 문자열로 변환"""
+    return (
+        f"대기열 {metrics['queue_depth']}개 (최대 {metrics['max_queue_depth']}), "
+        f"평균 대기 {metrics['avg_wait_seconds']:.2f}초, "
+        f"p95 대기 {metrics['p95_wait_seconds']:.2f}초, "
+        f"429 {metrics['throttled_429']}회, 재시도 {metrics['retries']}회"
+    )
+
+
+def retry_after_seconds(error):
+    """429/503 응답의 Retry-After(-ms) 헤더 값 (초)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return None
+
+
+def backoff_delay(error, attempt, base_delay=1.0, max_delay=60.0):
+    """Retry-After가 있으면 따르고, 없으면 지수 백오프 + 지터"""
+    delay = retry_after_seconds(error)
+    if delay is None:
+        delay = min(max_delay, base_delay * 2**attempt)
+    return delay + random.uniform(0, delay * 0.25)
+
+
+def call_with_rate_limit(fn, cost, priority=PRIORITY_BACKGROUND, max_retries=5, limiter=None):
+    """버킷을 확보한 뒤 호출하고, 429 등 일시적 오류는 백오프 후 재시도"""
+    limiter = limiter or openai_rate_limiter
+    for attempt in range(max_retries + 1):
+        limiter.acquire(cost, priority)
+        try:
+            return fn()
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(e, attempt)
+            print(f"⚠️ OpenAI 호출 재시도 ({attempt + 1}/{max_retries}, {delay:.1f}초 후): {str(e)}")
+            if isinstance(e, openai.RateLimitError):
+                limiter.throttle(delay)
+            else:
+                limiter.record_retry()
+                time.sleep(delay)
+
+
+async def call_with_rate_limit_async(
+    fn, cost, priority=PRIORITY_BACKGROUND, max_retries=5, limiter=None
+):
+    """call_with_rate_limit의 비동기 버전 (fn은 코루틴을 반환하는 함수)"""
+    limiter = limiter or openai_rate_limiter
+    for attempt in range(max_retries + 1):
+        await limiter.acquire_async(cost, priority)
+        try:
+            return await fn()
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(e, attempt)
+            print(f"⚠️ OpenAI 호출 재시도 ({attempt + 1}/{max_retries}, {delay:.1f}초 후): {str(e)}")
+            if isinstance(e, openai.RateLimitError):
+                limiter.throttle(delay)
+            else:
+                limiter.record_retry()
+                await asyncio.sleep(delay)
+
+
+# 전역 Azure OpenAI 호출 제한 객체 (프로세스 단위)
+openai_rate_limiter = TokenBucketRateLimiter(
+    azure_config.openai_tokens_per_minute,
+    azure_config.openai_requests_per_minute,
+    azure_config.openai_interactive_reserve,
+)
@@ -0,0 +1,109 @@
+# records.py
+from dataclasses import dataclass, field
+
+from context_builder import parse_chunk_path
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """검색 결과 한 건 (청크 키에서 문서 키와 청크 번호를 한 번만 파싱해 보관)
+
+    content가 None이면 스니펫 모드 결과로, 본문은 hydrate_results에서 채운다.
+    """
+
+    storage_path: str
+    file_name: str
+    score: float
+    content: str | None = None
+    snippet: str | None = None
+    rerank_score: float | None = None
+    document_key: str = field(init=False, repr=False)
+    chunk_index: int | None = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.document_key, self.chunk_index = parse_chunk_path(self.storage_path)
+
+    @property
+    def has_content(self):
+        return self.content is not None
+
+    def to_dict(self):
+        """JSON 캐시용 dict (값이 없는 선택 필드는 생략)"""
+        data = {
+            "storage_path": self.storage_path,
+            "file_name": self.file_name,
+            "score": self.score,
+        }
+        if self.content is not None:
+            data["content"] = self.content
+        if self.snippet is not None:
+            data["snippet"] = self.snippet
+        if self.rerank_score is not None:
+            data["rerank_score"] = self.rerank_score
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            storage_path=data["storage_path"],
+            file_name=data["file_name"],
+            score=data["score"],
+            content=data.get("content"),
+            snippet=data.get("snippet"),
+            rerank_score=data.get("rerank_score"),
+        )
+
+
+@dataclass(slots=True)
+class ProcessedFile:
+    """세션/작업 큐에 보관하는 문서 처리 결과 (추출 텍스트와 분석 결과는 저장소 키만 보관)"""
+
+    document_id: str
+    file_name: str
+    file_type: str
+    file_size: int
+    blob_url: str
+    blob_name: str
+    text_length: int
+    text_key: str
+    analysis_key: str | None = None
+    processing_error: str | None = None
+    success: bool = True
+    status: str = "done"
+
+    def to_dict(self):
+        """작업 큐 JSON 저장용 dict (값이 없는 선택 필드는 생략)"""
+        data = {
+            "success": self.success,
+            "document_id": self.document_id,
+            "file_name": self.file_name,
+            "file_type": self.file_type,
+            "file_size": self.file_size,
+            "blob_url": self.blob_url,
+            "blob_name": self.blob_name,
+            "text_length": self.text_length,
+            "text_key": self.text_key,
+            "status": self.status,
+        }
+        if self.analysis_key is not None:
+            data["analysis_key"] = self.analysis_key
+        if self.processing_error is not None:
+            data["processing_error"] = self.processing_error
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            document_id=data["document_id"],
+            file_name=data["file_name"],
+            file_type=data["file_type"],
+            file_size=data["file_size"],
+            blob_url=data["blob_url"],
+            blob_name=data["blob_name"],
+            text_length=data["text_length"],
+            text_key=data["text_key"],
+            analysis_key=data.get("analysis_key"),
+            processing_error=data.get("processing_error"),
+            success=data.get("success", True),
+            status=data.get("status", "done"),
+        )
@@ -0,0 +1,218 @@
+# reindex.py
+"""Blob Storage 원본 파일로 AI Search 인덱스 재구축
+
+사용 예:
+    python reindex.py --concurrency 32 --extract-workers 8
+
+컨테이너의 `document_id/filename` 원본을 목록 조회와 동시에 처리하며,
+추출 텍스트 사이드카(document_id/extracted.txt.gz)가 있으면 원본 다운로드와 추출을 건너뛴다.
+문서 ID 기반의 고정 키(doc_<id>_chunk_<n>)로 다시 인덱싱한다.
+처리 결과를 체크포인트(JSONL)에 기록해 중단 후 다시 실행하면 이어서 처리한다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from async_document_processor import AsyncDocumentProcessor
+from async_document_uploader import AsyncDocumentUploader
+from azure_config import azure_config
+from document_uploader import SUPPORTED_EXTENSIONS
+from ingest_cli import (
+    IngestCheckpoint,
+    IngestStats,
+    extract_bytes,
+    init_extract_worker,
+    print_report,
+)
+from progress import PrintProgress
+from sidecar import is_sidecar
+
+# 업로드 시 만든 원본 파일 이름 형식: <uuid>/<파일명>
+BLOB_NAME_PATTERN = re.compile(
+    r"^(?P<document_id>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})/(?P<file_name>[^/]+)$"
+)
+
+
+def parse_blob_name(blob_name):
+    """원본 파일 blob 이름에서 (문서 ID, 파일명) 추출 (원본이 아니면 None)"""
+    match = BLOB_NAME_PATTERN.match(blob_name)
+    if not match or is_sidecar(blob_name):
+        return None
+    file_name = match.group("file_name")
+    if file_name.rsplit(".", 1)[-1].lower() not in SUPPORTED_EXTENSIONS:
+        return None
+    return match.group("document_id"), file_name
+
+
+async def reindex_container(
+    checkpoint_path,
+    prefix=None,
+    concurrency=32,
+    extract_workers=None,
+    refresh_text=False,
+    progress=None,
+):
+    """컨테이너 원본을 스트리밍 조회하며 병렬로 재인덱싱 후 처리량 보고 반환"""
+    progress = progress or PrintProgress()
+    extract_workers = extract_workers or os.cpu_count() or 1
+    checkpoint = IngestCheckpoint(checkpoint_path)
+    stats = IngestStats()
+    loop = asyncio.get_running_loop()
+
+    processor = AsyncDocumentProcessor()
+    uploader = AsyncDocumentUploader(processor=processor)
+    container_client = uploader.blob_service_client.get_container_client(
+        azure_config.storage_container_name
+    )
+    extract_pool = ProcessPoolExecutor(
+        max_workers=extract_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_extract_worker,
+    )
+
+    # 목록 조회가 처리보다 앞서 나가지 않도록 크기 제한 큐 사용
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def produce():
+        async for blob in container_client.list_blobs(name_starts_with=prefix):
+            parsed = parse_blob_name(blob.name)
+            if parsed is None:
+                continue
+            signature = (blob.size, int(blob.last_modified.timestamp()))
+            previous = checkpoint.get(blob.name, signature)
+            if previous and previous["status"] == "done":
+                stats.count("skipped")
+                continue
+            await queue.put((blob.name, signature, *parsed))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def reindex_blob(blob_name, signature, document_id, file_name):
+        timings = {}
+
+        # 추출 텍스트 사이드카가 있으면 원본 다운로드와 추출 생략
+        started = time.perf_counter()
+        sidecar = None
+        if not refresh_text:
+            sidecar = await uploader.read_extracted_text(document_id)
+
+        if sidecar:
+            text = sidecar["text"]
+            timings["download"] = time.perf_counter() - started
+            text_source = "sidecar"
+        else:
+            downloader = await container_client.download_blob(blob_name)
+            data = await downloader.readall()
+            timings["download"] = time.perf_counter() - started
+
+            text, page_offsets, timings["extract"] = await loop.run_in_executor(
+                extract_pool, extract_bytes, file_name, data
+            )
+            # 다음 재구축부터는 사이드카 사용
+            await uploader.upload_extracted_text(document_id, text, page_offsets)
+            text_source = "extracted"
+
+        started = time.perf_counter()
+        index_result = await processor.index_document(
+            {
+                "document_id": document_id,
+                "file_name": file_name,
+                "file_type": file_name.rsplit(".", 1)[-1].lower(),
+                "extracted_text": text,
+            }
+        )
+        timings["index"] = time.perf_counter() - started
+        if not index_result["success"]:
+            raise Exception(f"인덱싱 실패: {index_result['error']}")
+
+        return index_result["indexed_chunks"], len(text), text_source, timings
+
+    async def consume():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            blob_name, signature, document_id, file_name = item
+            try:
+                chunks, characters, text_source, timings = await reindex_blob(*item)
+            except Exception as e:
+                await asyncio.to_thread(
+                    checkpoint.record, blob_name, signature, "failed", error=str(e)
+                )
+                stats.count("failed")
+                progress.error(f"❌ {blob_name}: {str(e)}")
+                continue
+
+            await asyncio.to_thread(
+                checkpoint.record,
+                blob_name,
+                signature,
+                "done",
+                document_id=document_id,
+                indexed_chunks=chunks,
+                text_source=text_source,
+            )
+            stats.add_timings(timings)
+            stats.count("done", size=signature[0], characters=characters)
+            finished = stats.counts["done"] + stats.counts["failed"]
+            progress.success(
+                f"✅ [{finished}] {blob_name} ({chunks}개 청크, {text_source})"
+            )
+
+    try:
+        await asyncio.gather(produce(), *(consume() for _ in range(concurrency)))
+    finally:
+        extract_pool.shutdown(cancel_futures=True)
+        checkpoint.close()
+        await processor.close()
+        await uploader.close()
+
+    return stats.report()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Blob Storage 원본으로 검색 인덱스 재구축")
+    parser.add_argument(
+        "--checkpoint",
+        default=os.path.join("data", "reindex_checkpoint.jsonl"),
+        help="체크포인트 파일 경로 (기본: data/reindex_checkpoint.jsonl)",
+    )
+    parser.add_argument("--prefix", default=None, help="이 접두사로 시작하는 blob만 처리")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="동시에 처리할 blob 수"
+    )
+    parser.add_argument(
+        "--extract-workers", type=int, default=None, help="추출 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument(
+        "--refresh-text",
+        action="store_true",
+        help="사이드카를 무시하고 원본에서 다시 추출",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        report = asyncio.run(
+            reindex_container(
+                args.checkpoint,
+                prefix=args.prefix,
+                concurrency=args.concurrency,
+                extract_workers=args.extract_workers,
+                refresh_text=args.refresh_text,
+            )
+        )
+    except KeyboardInterrupt:
+        print("⚠️ 중단됨 - 다시 실행하면 체크포인트부터 이어서 처리합니다.")
+        return 130
+
+    print_report(report, title="재인덱싱 결과")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
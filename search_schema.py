@@ -0,0 +1,256 @@
+# search_schema.py
+import uuid
+from datetime import datetime, timezone
+from azure.search.documents.indexes.models import (
+    SearchableField,
+    SearchFieldDataType,
+    SimpleField,
+)
+
+# 기존 onboarding-index 레이아웃 (청크 본문을 content/merged_content/text/layoutText에 4번 저장)
+SCHEMA_LEGACY = "legacy"
+
+# 청크 본문을 content 한 곳에만 저장하는 레이아웃
+SCHEMA_COMPACT = "compact"
+
+# 청크 분할 기준 (문자 수) - 청크 키를 문서 길이로부터 다시 계산할 때도 사용
+CHUNK_SIZE = 1500
+CHUNK_OVERLAP = 150
+
+# search_documents에서 조회하는 필드
+LEGACY_SELECT_FIELDS = [
+    "content",
+    "merged_content",
+    "metadata_storage_path",
+    "metadata_storage_name",
+]
+COMPACT_SELECT_FIELDS = ["content", "metadata_storage_path", "metadata_storage_name"]
+
+# 스니펫 모드 검색에서 조회하는 필드 (본문은 하이라이트로 대신함)
+SNIPPET_SELECT_FIELDS = ["metadata_storage_path", "metadata_storage_name"]
+
+# 기존 인덱스에서 compact 인덱스로 옮길 때 읽는 필드
+MIGRATION_SELECT_FIELDS = [
+    "metadata_storage_path",
+    "content",
+    "merged_content",
+    "metadata_storage_name",
+    "metadata_storage_file_extension",
+    "metadata_storage_last_modified",
+]
+
+
+def select_fields(schema):
+    """스키마별 검색 결과 조회 필드"""
+    if schema == SCHEMA_COMPACT:
+        return COMPACT_SELECT_FIELDS
+    return LEGACY_SELECT_FIELDS
+
+
+def content_fields(schema):
+    """스키마별 청크 본문 필드"""
+    if schema == SCHEMA_COMPACT:
+        return ["content"]
+    return ["content", "merged_content"]
+
+
+def _odata_string(value):
+    """OData 문자열 리터럴 (작은따옴표는 두 번 써서 이스케이프)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _odata_datetime(value):
+    """OData DateTimeOffset 리터럴 (UTC, 초 단위)"""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _in_filter(field, values):
+    """필드 값이 목록 중 하나인지 검사하는 OData 식"""
+    values = [str(value) for value in values]
+    if any("|" in value for value in values):
+        # 구분자와 겹치는 값이 있으면 eq 조건을 or로 연결
+        return "(" + " or ".join(f"{field} eq {_odata_string(v)}" for v in values) + ")"
+    return f"search.in({field}, {_odata_string('|'.join(values))}, '|')"
+
+
+def build_search_filter(
+    schema,
+    document_ids=None,
+    chunk_counts=None,
+    file_types=None,
+    modified_after=None,
+    modified_before=None,
+):
+    """검색 범위(문서, 파일 형식, 업로드 기간)를 OData 필터로 변환 (범위가 없으면 None)
+
+    compact 스키마는 document_id로, 기존 스키마는 document_id 필드가 없으므로 문서별 청크 키
+    (chunk_counts는 document_ids와 같은 순서의 청크 수)로 문서를 한정한다.
+    modified_after/modified_before는 datetime이다 (timezone 정보가 없으면 로컬 시각으로 간주).
+    """
+    clauses = []
+    if document_ids and schema == SCHEMA_COMPACT:
+        clauses.append(_in_filter("document_id", document_ids))
+    elif document_ids:
+        if chunk_counts is None or len(chunk_counts) != len(document_ids):
+            raise ValueError("기존 스키마의 문서 범위에는 문서별 청크 수가 필요합니다.")
+        clauses.append(
+            _in_filter(
+                "metadata_storage_path",
+                [
+                    chunk_key(document_id, index)
+                    for document_id, count in zip(document_ids, chunk_counts)
+                    for index in range(count)
+                ],
+            )
+        )
+    if file_types:
+        clauses.append(
+            _in_filter(
+                "metadata_storage_file_extension", [t.lower() for t in file_types]
+            )
+        )
+    if modified_after:
+        clauses.append(
+            f"metadata_storage_last_modified ge {_odata_datetime(modified_after)}"
+        )
+    if modified_before:
+        clauses.append(
+            f"metadata_storage_last_modified lt {_odata_datetime(modified_before)}"
+        )
+    return " and ".join(clauses) or None
+
+
+def chunk_count(text_length, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """chunk_text가 만드는 청크 수 (추출 텍스트 길이 기준)"""
+    if text_length <= chunk_size:
+        return 1 if text_length else 0
+    step = chunk_size - overlap
+    return 1 + -(-(text_length - chunk_size) // step)
+
+
+def chunk_key(document_id, index):
+    """청크 문서 키 (문자, 숫자, 언더스코어만 사용: doc_<id>_chunk_<n>)"""
+    return f"doc_{document_id.replace('-', '')}_chunk_{index}"
+
+
+def document_id_from_key(key):
+    """doc_<id>_chunk_<n> 키에서 원래 문서 ID(UUID) 복원 (형식이 다르면 None)"""
+    parts = (key or "").split("_")
+    if len(parts) != 4 or parts[0] != "doc" or parts[2] != "chunk":
+        return None
+    try:
+        return str(uuid.UUID(hex=parts[1]))
+    except ValueError:
+        return None
+
+
+def document_chunk_filter(schema, document_id, file_name=None):
+    """문서 청크 조회용 OData 필터 (기존 스키마는 파일명으로 좁힌 뒤 키로 거름, 파일명을 모르면 None)"""
+    if schema == SCHEMA_COMPACT:
+        return f"document_id eq {_odata_string(document_id)}"
+    if file_name:
+        return f"metadata_storage_name eq {_odata_string(file_name)}"
+    return None
+
+
+def chunk_key_filter(document_id, start, count):
+    """문서의 청크 키 start..start+count-1 중 인덱스에 있는 것을 찾는 OData 필터"""
+    return _in_filter(
+        "metadata_storage_path",
+        [chunk_key(document_id, index) for index in range(start, start + count)],
+    )
+
+
+def compact_index_fields():
+    """compact 인덱스 필드 정의"""
+    return [
+        SimpleField(
+            name="metadata_storage_path",
+            type=SearchFieldDataType.String,
+            key=True,
+            filterable=True,
+        ),
+        SearchableField(name="content", type=SearchFieldDataType.String),
+        SimpleField(
+            name="metadata_storage_name",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+        ),
+        SimpleField(name="document_id", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(
+            name="metadata_storage_file_extension",
+            type=SearchFieldDataType.String,
+            filterable=True,
+            facetable=True,
+        ),
+        SimpleField(
+            name="metadata_storage_last_modified",
+            type=SearchFieldDataType.DateTimeOffset,
+            filterable=True,
+            sortable=True,
+        ),
+    ]
+
+
+def build_legacy_document(document_result, index, chunk, last_modified):
+    """기존 onboarding-index 스키마의 청크 문서"""
+    return {
+        # 필수 key 필드
+        "metadata_storage_path": chunk_key(document_result["document_id"], index),
+        # 실제 onboarding-index 스키마에 있는 필드들만 사용
+        "content": chunk,
+        "merged_content": chunk,
+        "text": [chunk],  # Collection 타입
+        "layoutText": [chunk],  # Collection 타입
+        # 메타데이터 필드들 (스키마에 있는 것들만)
+        "metadata_storage_size": len(chunk.encode("utf-8")),
+        "metadata_storage_last_modified": last_modified,
+        "metadata_storage_content_type": "text/plain",
+        "metadata_storage_file_extension": document_result["file_type"],
+        "metadata_storage_name": document_result["file_name"],
+        # 빈 컬렉션들 (스키마에 있는 것들)
+        "people": [],
+        "organizations": [],
+        "locations": [],  # 스키마에 있음
+        "keyphrases": [],
+        "pii_entities": [],
+        "imageTags": [],
+        "imageCaption": [],
+    }
+
+
+def build_compact_document(document_result, index, chunk, last_modified):
+    """compact 스키마의 청크 문서 (본문은 content에 한 번만 저장)"""
+    return {
+        "metadata_storage_path": chunk_key(document_result["document_id"], index),
+        "content": chunk,
+        "metadata_storage_name": document_result["file_name"],
+        "document_id": document_result["document_id"],
+        "metadata_storage_file_extension": document_result["file_type"],
+        "metadata_storage_last_modified": last_modified,
+    }
+
+
+def build_index_documents(document_result, chunks, schema):
+    """청크 목록을 스키마에 맞는 인덱스 문서 목록으로 변환"""
+    build = build_compact_document if schema == SCHEMA_COMPACT else build_legacy_document
+    # 업로드 기간 필터와 맞도록 UTC 기준으로 기록
+    last_modified = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    return [
+        build(document_result, i, chunk, last_modified)
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def legacy_to_compact(record):
+    """기존 인덱스 검색 결과 한 건을 compact 스키마 문서로 변환"""
+    key = record["metadata_storage_path"]
+    return {
+        "metadata_storage_path": key,
+        "content": record.get("content") or record.get("merged_content") or "",
+        "metadata_storage_name": record.get("metadata_storage_name"),
+        "document_id": document_id_from_key(key),
+        "metadata_storage_file_extension": record.get("metadata_storage_file_extension"),
+        "metadata_storage_last_modified": record.get("metadata_storage_last_modified"),
+    }
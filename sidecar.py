@@ -0,0 +1,47 @@
+# sidecar.py
+import gzip
+
+# 추출 결과가 달라지는 변경(추출기 교체, 후처리 변경 등) 시 올려서 기존 사이드카를 무효화
+EXTRACTOR_VERSION = "1"
+
+# 원본 옆(document_id/)에 저장하는 추출 텍스트 blob 이름
+SIDECAR_NAME = "extracted.txt.gz"
+
+# blob 메타데이터 전체 한도(8KB) 안에 들어가는 경우에만 페이지 위치 기록
+MAX_PAGE_OFFSETS_LENGTH = 7000
+
+
+def sidecar_blob_name(document_id):
+    """문서의 추출 텍스트 사이드카 blob 이름"""
+    return f"{document_id}/{SIDECAR_NAME}"
+
+
+def is_sidecar(blob_name):
+    """추출 텍스트 사이드카 blob 여부"""
+    return blob_name.rsplit("/", 1)[-1] == SIDECAR_NAME
+
+
+def encode_sidecar(text, page_offsets=None):
+    """추출 텍스트를 gzip으로 압축하고 blob 메타데이터 생성"""
+    metadata = {"extractor_version": EXTRACTOR_VERSION}
+    if page_offsets:
+        encoded_offsets = ",".join(str(offset) for offset in page_offsets)
+        if len(encoded_offsets) <= MAX_PAGE_OFFSETS_LENGTH:
+            metadata["page_offsets"] = encoded_offsets
+    return gzip.compress(text.encode("utf-8"), compresslevel=6), metadata
+
+
+def decode_sidecar(data, metadata):
+    """사이드카 내용 복원 (추출기 버전이 다르면 None)"""
+    if (metadata or {}).get("extractor_version") != EXTRACTOR_VERSION:
+        return None
+
+    page_offsets = None
+    if metadata.get("page_offsets"):
+        page_offsets = [int(offset) for offset in metadata["page_offsets"].split(",")]
+
+    return {
+        "text": gzip.decompress(data).decode("utf-8"),
+        "page_offsets": page_offsets,
+        "extractor_version": metadata["extractor_version"],
+    }
@@ -3,5 +3,9 @@ echo "패키지 설치 시작..."
 pip install --upgrade pip
 pip install -r requirements.txt --no-cache-dir
 echo "패키지 설치 완료!"
+echo "Azure 서비스 준비 상태 점검..."
+python healthcheck.py || echo "⚠️ 일부 Azure 서비스가 준비되지 않았습니다."
+echo "문서 처리 워커 시작..."
+python job_queue.py &
 echo "Streamlit 시작..."
 python -m streamlit run app.py --server.port 8000 --server.address 0.0.0.0
\ No newline at end of file
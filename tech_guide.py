@@ -0,0 +1,173 @@
+# tech_guide.py
+from content_store import content_store, load_extracted_text, load_processing_results
+from keyword_index import keyword_index
+from prompts import (
+    GUIDE_COMBINE_INSTRUCTION,
+    GUIDE_GENERATE_INSTRUCTION,
+    GUIDE_MERGE_INSTRUCTION,
+    guide_messages,
+)
+from rate_limiter import PRIORITY_INTERACTIVE
+
+
+class IncrementalTechGuide:
+    """문서별 요약본(digest)을 유지하며 통합 기술 가이드를 점진적으로 갱신"""
+
+    def __init__(self, processor, digest_chars=1200, batch_chars=8000):
+        self.processor = processor
+        self.digest_chars = digest_chars
+        self.batch_chars = batch_chars
+
+        self.digests = {}  # document_id -> 저장소에 보관된 문서 요약본 키
+        self.pending = []  # 아직 가이드에 반영되지 않은 document_id
+        self.guide = None
+        self.llm_calls = 0
+
+    def make_digest(self, file_result):
+        """문서 처리 결과에서 가이드용 요약본 생성 (LLM 호출 없음)"""
+        processing_results = load_processing_results(file_result)
+
+        summary_result = processing_results.get("summary", {})
+        if summary_result.get("success"):
+            body = summary_result["summary"]
+        else:
+            body = load_extracted_text(file_result)
+
+        tech_result = processing_results.get("technical_info", {})
+        keywords = []
+        if tech_result.get("success"):
+            keywords = tech_result.get("keywords") or self.processor.normalize_keywords(
+                tech_result.get("technical_keywords", "")
+            )
+
+        digest = f"[{file_result.file_name}]\n{body[: self.digest_chars]}"
+        if keywords:
+            digest += f"\n기술 키워드: {', '.join(keywords)}"
+        return digest, keywords
+
+    def add_document(self, file_result):
+        """처리된 문서를 반영 대기 목록에 추가"""
+        if not file_result.success:
+            return False
+
+        document_id = file_result.document_id
+        if document_id in self.digests:
+            return False
+
+        digest, keywords = self.make_digest(file_result)
+        self.digests[document_id] = content_store.put_text(digest)
+        if keywords and not keyword_index.has_document(document_id):
+            # 키워드 인덱스 도입 전에 처리된 문서는 청크 위치 없이 반영
+            keyword_index.add_document(document_id, file_result.file_name, keywords)
+        self.pending.append(document_id)
+        return True
+
+    @property
+    def pending_count(self):
+        """가이드에 아직 반영되지 않은 문서 수"""
+        return len(self.pending)
+
+    def total_keywords(self, limit=50):
+        """키워드 인덱스 기준 전체 문서의 기술 키워드 (문서 빈도 순)"""
+        top_keywords = keyword_index.top_keywords(
+            document_ids=list(self.digests), limit=limit
+        )
+        return ", ".join(
+            f"{k['name']} ({k['document_frequency']})" for k in top_keywords
+        )
+
+    def update(self):
+        """대기 중인 문서를 가이드에 반영 (최초에는 계층적 생성, 이후에는 병합)"""
+        try:
+            if self.guide is None:
+                self.guide = self._reduce(
+                    [content_store.get_text(k) for k in self.digests.values()]
+                )
+            else:
+                pending_digests = [
+                    content_store.get_text(self.digests[d]) for d in self.pending
+                ]
+                for batch in self._batches(pending_digests):
+                    self.guide = self._merge(self.guide, batch)
+            self.pending = []
+
+            return {
+                "success": True,
+                "tech_guide": self.guide,
+                "processed_files_count": len(self.digests),
+                "total_keywords": self.total_keywords(),
+                "llm_calls": self.llm_calls,
+            }
+
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def _batches(self, texts):
+        """batch_chars 이내로 텍스트 묶기 (모든 텍스트가 어느 한 묶음에 포함됨)"""
+        batches = []
+        current = []
+        current_len = 0
+        for text in texts:
+            if current and current_len + len(text) > self.batch_chars:
+                batches.append(current)
+                current = []
+                current_len = 0
+            current.append(text)
+            current_len += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _reduce(self, digests):
+        """문서 요약본 묶음별 부분 가이드 생성 후 하나가 될 때까지 계층적으로 통합"""
+        if not digests:
+            raise ValueError("가이드를 생성할 문서가 없습니다.")
+
+        partials = [self._generate(batch) for batch in self._batches(digests)]
+        while len(partials) > 1:
+            batches = self._batches(partials)
+            if len(batches) == len(partials):
+                # 부분 가이드가 길어 하나도 묶이지 않으면 두 개씩 통합
+                batches = [partials[i : i + 2] for i in range(0, len(partials), 2)]
+            partials = [
+                self._combine(batch) if len(batch) > 1 else batch[0]
+                for batch in batches
+            ]
+        return partials[0]
+
+    def _generate(self, digests):
+        """문서 요약본으로부터 가이드 생성"""
+        return self._complete(
+            guide_messages(
+                GUIDE_GENERATE_INSTRUCTION, [("문서 요약", "\n\n".join(digests))]
+            )
+        )
+
+    def _combine(self, guides):
+        """부분 가이드들을 하나의 가이드로 통합"""
+        return self._complete(
+            guide_messages(
+                GUIDE_COMBINE_INSTRUCTION,
+                [("부분 가이드", "\n\n---\n\n".join(guides))],
+            )
+        )
+
+    def _merge(self, guide, digests):
+        """기존 가이드에 새 문서 요약본 병합"""
+        return self._complete(
+            guide_messages(
+                GUIDE_MERGE_INSTRUCTION,
+                [("기존 가이드", guide), ("새 문서 요약", "\n\n".join(digests))],
+            )
+        )
+
+    def _complete(self, messages):
+        """가이드 작성 LLM 호출"""
+        response = self.processor._create_completion(
+            messages=messages,
+            max_completion_tokens=7000,
+            priority=PRIORITY_INTERACTIVE,
+            prompt_name="guide",
+        )
+        self.llm_calls += 1
+        return response.choices[0].message.content
@@ -0,0 +1,18 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 전역 저장소 객체가 저장소의 data/ 대신 임시 디렉터리를 쓰도록 import 전에 설정
+_data_dir = tempfile.mkdtemp(prefix="onboarding-test-")
+for name, path in {
+    "CHUNK_SIGNATURE_DB_PATH": "chunk_signatures.sqlite3",
+    "CONTENT_STORE_DIR": "content",
+    "FAQ_STORE_PATH": "faq.json",
+    "JOB_DB_PATH": "jobs.sqlite3",
+    "JOB_SPOOL_DIR": "spool",
+    "KEYWORD_INDEX_PATH": "keyword_index.sqlite3",
+}.items():
+    os.environ.setdefault(name, os.path.join(_data_dir, path))
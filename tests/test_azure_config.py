@@ -0,0 +1,78 @@
+# tests/test_azure_config.py
+import threading
+import time
+
+import pytest
+
+from azure_config import AzureConfig
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = AzureConfig()
+    config.health_check_timeout = 0.3
+    config.calls = {"OpenAI": 0, "AI Search": 0, "Blob Storage": 0, "AI Services Vision": 0}
+
+    def probe(name, delay=0.0, release=None):
+        def run(timeout):
+            config.calls[name] += 1
+            if release is not None:
+                release.wait()
+            time.sleep(delay)
+            return True, "연결 성공"
+
+        return run
+
+    config.make_probe = probe
+    for attr, name in [
+        ("_probe_openai", "OpenAI"),
+        ("_probe_search", "AI Search"),
+        ("_probe_blob", "Blob Storage"),
+        ("_probe_vision", "AI Services Vision"),
+    ]:
+        monkeypatch.setattr(config, attr, probe(name, delay=0.1))
+    return config
+
+
+def test_concurrent_health_checks_share_one_probe_round(config):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(config.check_health(force=True)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert config.calls["OpenAI"] == 1
+    assert len(results) == 5 and all(result["ready"] for result in results)
+    assert sum(not result["cached"] for result in results) == 1
+
+
+def test_cache_is_readable_while_a_probe_round_is_running(config):
+    config.check_health()
+    config._health_cache = (time.monotonic(), config._health_cache[1])
+    refresher = threading.Thread(target=config.check_health, kwargs={"force": True})
+    refresher.start()
+    time.sleep(0.02)
+
+    started = time.monotonic()
+    assert config.check_health()["cached"]
+    assert time.monotonic() - started < 0.05
+    refresher.join()
+
+
+def test_stuck_probe_is_not_started_again(config, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(config, "_probe_search", config.make_probe("AI Search", release=release))
+    try:
+        for _ in range(3):
+            health = config.check_health(force=True)
+            assert not health["services"]["AI Search"]["ready"]
+            assert health["services"]["OpenAI"]["ready"]
+
+        assert config.calls["AI Search"] == 1
+        assert config.calls["OpenAI"] == 3
+    finally:
+        release.set()
@@ -0,0 +1,43 @@
+# tests/test_chunk_dedup.py
+import pytest
+
+from chunk_dedup import ChunkDeduplicator
+
+TEXT = "쿠버네티스 클러스터에 서비스를 배포하는 절차는 다음과 같다. " * 20
+
+
+@pytest.fixture
+def deduplicator(tmp_path):
+    return ChunkDeduplicator(str(tmp_path / "signatures.sqlite3"))
+
+
+def test_links_near_duplicate_to_earlier_document(deduplicator):
+    assert deduplicator.register_document("A", ["doc_A_chunk_0"], [TEXT]) == {}
+    assert deduplicator.register_document("B", ["doc_B_chunk_0"], [TEXT + "!"]) == {
+        "doc_B_chunk_0": "doc_A_chunk_0"
+    }
+
+
+def test_reregistering_document_does_not_link_to_itself(deduplicator):
+    deduplicator.register_document("A", ["doc_A_chunk_0"], [TEXT])
+    deduplicator.register_document("B", ["doc_B_chunk_0"], [TEXT + "!"])
+
+    # B의 청크는 A를 대표로 가리키므로 A를 다시 등록해도 A가 대표로 남아야 함
+    assert deduplicator.register_document("A", ["doc_A_chunk_0"], [TEXT]) == {}
+    assert deduplicator.canonical_keys(["doc_A_chunk_0", "doc_B_chunk_0"]) == {
+        "doc_A_chunk_0": "doc_A_chunk_0",
+        "doc_B_chunk_0": "doc_A_chunk_0",
+    }
+
+
+def test_remove_document_promotes_dependent_chunk(deduplicator):
+    deduplicator.register_document("A", ["doc_A_chunk_0"], [TEXT])
+    deduplicator.register_document("B", ["doc_B_chunk_0"], [TEXT + "!"])
+    deduplicator.register_document("C", ["doc_C_chunk_0"], [TEXT + "?"])
+
+    assert deduplicator.remove_document("A") == {"doc_B_chunk_0": "B"}
+    assert deduplicator.canonical_keys(["doc_B_chunk_0", "doc_C_chunk_0"]) == {
+        "doc_B_chunk_0": "doc_B_chunk_0",
+        "doc_C_chunk_0": "doc_B_chunk_0",
+    }
+    assert deduplicator.remove_document("A") == {}
@@ -0,0 +1,256 @@
+# tests/test_document_lifecycle.py
+import asyncio
+import re
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from async_document_processor import AsyncDocumentProcessor
+from async_document_uploader import AsyncDocumentUploader
+from chunk_dedup import DEDUP_SKIP, chunk_deduplicator
+from document_lifecycle import KEY_PROBE_WINDOW, DocumentLifecycle
+from search_schema import SCHEMA_COMPACT, SCHEMA_LEGACY, chunk_key
+
+
+class FakeSearchClient:
+    """필터 조회/업로드/삭제만 지원하는 메모리 인덱스"""
+
+    def __init__(self):
+        self.documents = {}
+
+    def _matches(self, key, document, search_filter):
+        if search_filter is None:
+            return True
+        match = re.fullmatch(r"(document_id|metadata_storage_name) eq '(.*)'", search_filter)
+        if match:
+            return document.get(match.group(1)) == match.group(2)
+        match = re.fullmatch(
+            r"search\.in\(metadata_storage_path, '(.*)', '\|'\)", search_filter
+        )
+        return key in match.group(1).split("|")
+
+    async def search(self, search_text, filter=None, select=None):
+        rows = [
+            {"metadata_storage_path": key}
+            for key, document in self.documents.items()
+            if self._matches(key, document, filter)
+        ]
+
+        async def results():
+            for row in rows:
+                yield row
+
+        return results()
+
+    async def upload_documents(self, documents):
+        for document in documents:
+            self.documents[document["metadata_storage_path"]] = document
+
+    async def delete_documents(self, documents):
+        for document in documents:
+            self.documents.pop(document["metadata_storage_path"], None)
+        return [SimpleNamespace(succeeded=True) for _ in documents]
+
+    async def close(self):
+        pass
+
+
+class FakeContainerClient:
+    """목록 조회/일괄 삭제만 지원하는 메모리 컨테이너 (ghosts는 목록에만 있고 삭제 시 404)"""
+
+    def __init__(self):
+        self.blobs = {}
+        self.ghosts = set()
+
+    def list_blobs(self, name_starts_with=""):
+        names = sorted(set(self.blobs) | self.ghosts)
+
+        async def blobs():
+            for name in names:
+                if name.startswith(name_starts_with or ""):
+                    yield SimpleNamespace(
+                        name=name, last_modified=datetime.now(timezone.utc)
+                    )
+
+        return blobs()
+
+    async def download_blob(self, name):
+        data = self.blobs[name]
+
+        async def readall():
+            return data
+
+        return SimpleNamespace(readall=readall)
+
+    async def delete_blobs(self, *names, raise_on_any_failure=True):
+        statuses = []
+        for name in names:
+            self.ghosts.discard(name)
+            statuses.append(202 if self.blobs.pop(name, None) is not None else 404)
+
+        async def responses():
+            for status in statuses:
+                yield SimpleNamespace(status_code=status)
+
+        return responses()
+
+
+class FakeBlobServiceClient:
+    def __init__(self, container_client):
+        self.container_client = container_client
+
+    def get_container_client(self, container):
+        return self.container_client
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def lifecycle(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunk_deduplicator, "db_path", str(tmp_path / "signatures.sqlite3"))
+    chunk_deduplicator._init_schema()
+
+    processor = AsyncDocumentProcessor()
+    processor._search_client = FakeSearchClient()
+    uploader = AsyncDocumentUploader(processor=processor)
+    container_client = FakeContainerClient()
+    uploader._blob_service_client = FakeBlobServiceClient(container_client)
+
+    sidecars = {}
+
+    async def read_extracted_text(document_id):
+        if f"{document_id}/extracted.txt.gz" not in container_client.blobs:
+            return None
+        return {"text": sidecars[document_id]}
+
+    async def upload_extracted_text(document_id, text, page_offsets=None):
+        container_client.blobs[f"{document_id}/extracted.txt.gz"] = b""
+        sidecars[document_id] = text
+
+    uploader.read_extracted_text = read_extracted_text
+    uploader.upload_extracted_text = upload_extracted_text
+    lifecycle = DocumentLifecycle(processor=processor, uploader=uploader)
+    lifecycle.sidecars = sidecars
+    return lifecycle
+
+
+def add_document(lifecycle, file_name, text):
+    """blob(원본, 사이드카) 저장 후 인덱싱하고 문서 ID 반환"""
+    document_id = str(uuid.uuid4())
+    blobs = lifecycle.container_client.blobs
+    blobs[f"{document_id}/{file_name}"] = text.encode("utf-8")
+    blobs[f"{document_id}/extracted.txt.gz"] = b""
+    lifecycle.sidecars[document_id] = text
+    result = asyncio.run(
+        lifecycle.processor.index_document(
+            {
+                "document_id": document_id,
+                "file_name": file_name,
+                "file_type": "txt",
+                "extracted_text": text,
+            }
+        )
+    )
+    assert result["success"]
+    return document_id
+
+
+@pytest.mark.parametrize("schema", [SCHEMA_LEGACY, SCHEMA_COMPACT])
+def test_delete_document_keeps_one_copy_of_duplicate_revisions(lifecycle, schema):
+    lifecycle.processor.search_schema = schema
+    lifecycle.processor.dedup_mode = DEDUP_SKIP
+    text = "배포 파이프라인은 빌드, 테스트, 스테이징 배포, 승인 후 운영 배포 순서로 진행된다. " * 10
+    revisions = [
+        add_document(lifecycle, f"guide_v{i}.txt", text + "." * i) for i in range(3)
+    ]
+    index = lifecycle.search_client.documents
+    assert len(index) == 1
+
+    report = asyncio.run(lifecycle.delete_documents([revisions[0]]))
+
+    assert report["documents"] == 1
+    assert report["deleted_chunks"] == 1
+    assert report["deleted_blobs"] == 2
+    assert report["reindexed_documents"] == 1
+    # 남은 두 개정판 중 새 대표가 된 쪽의 사본 하나만 인덱스에 있음
+    assert len(index) == 1
+    (remaining,) = index
+    assert remaining in {chunk_key(revisions[1], 0), chunk_key(revisions[2], 0)}
+
+    # 남은 개정판을 모두 다시 인덱싱해도 사본은 하나
+    for i in (1, 2):
+        asyncio.run(
+            lifecycle.processor.index_document(
+                {
+                    "document_id": revisions[i],
+                    "file_name": f"guide_v{i}.txt",
+                    "file_type": "txt",
+                    "extracted_text": text + "." * i,
+                }
+            )
+        )
+    assert list(index) == [remaining]
+
+
+def test_reindex_extracts_from_original_when_sidecar_is_missing(lifecycle):
+    lifecycle.processor.dedup_mode = DEDUP_SKIP
+    text = "장애 대응 절차는 알림 확인, 영향 범위 파악, 롤백 결정, 사후 회고 순서로 진행한다. " * 10
+    revisions = [
+        add_document(lifecycle, f"incident_v{i}.txt", text + "." * i) for i in range(3)
+    ]
+    # 사이드카가 없는 문서 (사이드카 도입 전 업로드 등)
+    blobs = lifecycle.container_client.blobs
+    for document_id in revisions:
+        del blobs[f"{document_id}/extracted.txt.gz"]
+
+    report = asyncio.run(lifecycle.delete_documents([revisions[0]]))
+
+    assert report["failed"] == 0
+    assert report["reindexed_documents"] == 1
+    assert len(lifecycle.search_client.documents) == 1
+    # 원본에서 다시 추출한 텍스트로 사이드카를 만들어 둠
+    (remaining,) = lifecycle.search_client.documents
+    promoted = next(d for d in revisions[1:] if chunk_key(d, 0) == remaining)
+    assert f"{promoted}/extracted.txt.gz" in blobs
+
+
+def test_delete_document_is_idempotent(lifecycle):
+    document_id = add_document(lifecycle, "a.txt", "온보딩 문서 본문 " * 50)
+
+    first = asyncio.run(lifecycle.delete_documents([document_id]))
+    second = asyncio.run(lifecycle.delete_documents([document_id]))
+
+    assert (first["deleted_chunks"], first["deleted_blobs"]) == (1, 2)
+    assert (second["deleted_chunks"], second["deleted_blobs"], second["failed"]) == (0, 0, 0)
+    assert lifecycle.search_client.documents == {}
+
+
+def test_delete_report_totals_missing_blobs(lifecycle):
+    document_id = add_document(lifecycle, "a.txt", "온보딩 문서 본문 " * 50)
+    lifecycle.container_client.ghosts.add(f"{document_id}/old.txt")
+
+    report = asyncio.run(lifecycle.delete_documents([document_id]))
+
+    assert report["missing_blobs"] == 1
+    assert report["missing_blobs"] == sum(r["missing_blobs"] for r in report["results"])
+
+
+def test_find_chunk_keys_probes_past_empty_windows(lifecycle):
+    lifecycle.processor.search_schema = SCHEMA_LEGACY
+    document_id = str(uuid.uuid4())
+    chunk_count = KEY_PROBE_WINDOW * 2 + 50
+    keys = [chunk_key(document_id, i) for i in range(chunk_count)]
+    chunk_deduplicator.register_document(
+        document_id, keys, [f"청크 {i} 본문" for i in range(chunk_count)]
+    )
+    # 앞쪽 두 구간은 중복으로 인덱싱되지 않았고 원본 blob도 없는 문서
+    index = lifecycle.search_client.documents
+    for key in keys[KEY_PROBE_WINDOW * 2 :]:
+        index[key] = {"metadata_storage_name": "a.txt"}
+
+    found = asyncio.run(lifecycle.find_chunk_keys(document_id))
+
+    assert sorted(found) == sorted(keys[KEY_PROBE_WINDOW * 2 :])
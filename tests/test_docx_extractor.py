@@ -0,0 +1,42 @@
+# tests/test_docx_extractor.py
+from io import BytesIO
+
+import docx
+from docx.shared import Inches
+
+from docx_extractor import extract_docx_text
+
+
+def save(document):
+    buffer = BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_extracts_paragraphs_and_tables_in_order():
+    document = docx.Document()
+    document.add_paragraph("첫 문단")
+    table = document.add_table(rows=2, cols=2)
+    for r in range(2):
+        for c in range(2):
+            table.cell(r, c).text = f"셀{r}{c}"
+    document.add_paragraph("마지막 문단")
+
+    assert extract_docx_text(save(document)) == (
+        "첫 문단\n셀00 | 셀01\n셀10 | 셀11\n마지막 문단"
+    )
+
+
+def test_tab_stop_definitions_are_not_text():
+    document = docx.Document()
+    document.add_paragraph("First")
+    paragraph = document.add_paragraph()
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    paragraph.add_run("Second")
+    paragraph.add_run().add_tab()
+    paragraph.add_run("Value")
+
+    # 탭 위치 정의(w:pPr/w:tabs/w:tab)는 무시하고 실행(w:r) 안의 탭만 남김
+    assert extract_docx_text(save(document)) == "First\nSecond\tValue"
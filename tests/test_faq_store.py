@@ -0,0 +1,25 @@
+# tests/test_faq_store.py
+from faq_store import group_similar_questions
+
+
+def test_group_similar_questions_merges_rephrased_questions():
+    questions = [
+        "신규 투입자가 먼저 읽어야 할 문서는 무엇인가요?",
+        "빌드와 배포는 어떻게 진행하나요?",
+        "신규 투입자가 가장 먼저 읽어야 할 문서는 무엇인가요?",
+        "빌드와 배포는 어떻게 진행 하나요",
+    ]
+
+    representatives, groups = group_similar_questions(questions, 0.8)
+
+    assert representatives == questions[:2]
+    assert groups == [0, 1, 0, 1]
+
+
+def test_group_similar_questions_keeps_different_questions_apart():
+    questions = ["빌드는 어떻게 하나요?", "테스트는 어떻게 하나요?", "?"]
+
+    representatives, groups = group_similar_questions(questions, 0.8)
+
+    assert representatives == questions
+    assert groups == [0, 1, 2]
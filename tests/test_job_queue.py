@@ -0,0 +1,76 @@
+# tests/test_job_queue.py
+import os
+import time
+
+import pytest
+
+from document_uploader import LocalFile
+from job_queue import JobQueue, JobWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(
+        str(tmp_path / "jobs.sqlite3"), str(tmp_path / "spool"), max_attempts=3, retry_delay=0
+    )
+
+
+def test_failed_attempt_is_requeued_until_max_attempts(queue):
+    job_id = queue.enqueue(LocalFile("a.txt", b"hello"))
+
+    for attempt in range(1, 3):
+        job = queue.claim("worker")
+        assert job["id"] == job_id
+        assert queue.retry_or_fail(job, "429 Too Many Requests") == "queued"
+        assert queue.get_jobs([job_id])[0]["status"] == "queued"
+        assert os.path.exists(job["spool_path"])
+
+    job = queue.claim("worker")
+    assert queue.retry_or_fail(job, "429 Too Many Requests") == "failed"
+
+    failed = queue.get_jobs([job_id])[0]
+    assert failed["status"] == "failed"
+    assert failed["attempts"] == 3
+    assert not os.path.exists(job["spool_path"])
+    assert queue.claim("worker") is None
+
+
+def test_requeued_job_waits_for_retry_delay(queue):
+    queue.retry_delay = 60
+    queue.enqueue(LocalFile("a.txt", b"hello"))
+    queue.retry_or_fail(queue.claim("worker"), "network error")
+
+    assert queue.claim("worker") is None
+
+
+def test_extracted_text_keeps_page_offsets_across_attempts(queue):
+    queue.enqueue(LocalFile("a.pdf", b"%PDF"))
+    job = queue.claim("worker")
+    assert queue.load_extracted_text(job) is None
+
+    queue.save_extracted_text(job, "1페이지\n2페이지", [0, 5])
+    queue.retry_or_fail(job, "network error")
+
+    assert queue.load_extracted_text(queue.claim("worker")) == ("1페이지\n2페이지", [0, 5])
+
+
+def test_faq_rebuild_is_debounced_until_uploads_settle(queue):
+    worker = JobWorker(queue, faq_rebuild_delay=60)
+    assert not worker._claim_faq_rebuild()
+
+    worker.schedule_faq_rebuild()
+    assert not worker._claim_faq_rebuild()
+
+    # 예약 시각이 지나면 한 번만 실행 권한을 얻음
+    worker._faq_due = time.time() - 1
+    assert worker._claim_faq_rebuild()
+    worker.schedule_faq_rebuild()
+    worker._faq_due = time.time() - 1
+    assert not worker._claim_faq_rebuild()
+
+
+def test_faq_rebuild_disabled_without_delay(queue):
+    worker = JobWorker(queue)
+    worker.schedule_faq_rebuild()
+
+    assert worker._faq_due is None
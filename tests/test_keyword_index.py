@@ -0,0 +1,112 @@
+# tests/test_keyword_index.py
+import json
+import threading
+
+import pytest
+
+from keyword_index import KeywordIndex, _index_paths
+
+
+@pytest.fixture
+def index(tmp_path):
+    return KeywordIndex(str(tmp_path / "keyword_index.sqlite3"))
+
+
+def test_add_lookup_and_replace_document(index):
+    index.add_document("doc1", "a.md", ["Kafka", "K8s"], ["Kafka 설정", "k8s 배포와 Kafka를"])
+
+    assert index.lookup("kafka") == [
+        {"document_id": "doc1", "file_name": "a.md", "chunks": [0, 1], "mentions": 2}
+    ]
+    assert index.lookup("Kubernetes")[0]["chunks"] == [1]
+
+    # 같은 문서를 다시 넣으면 이전 키워드는 사라짐
+    index.add_document("doc1", "a.md", ["Redis"], ["Redis 캐시"])
+    assert index.lookup("kafka") == []
+    assert [k["keyword"] for k in index.top_keywords()] == ["redis"]
+
+
+def test_remove_document_drops_unused_keywords(index):
+    index.add_document("doc1", "a.md", ["Kafka"], ["Kafka"])
+    index.add_document("doc2", "b.md", ["Kafka", "Redis"], ["Kafka", "Redis"])
+
+    assert index.remove_document("doc2")
+    assert not index.remove_document("doc2")
+    assert not index.has_document("doc2")
+    assert index.top_keywords() == [
+        {"keyword": "kafka", "name": "Kafka", "document_frequency": 1, "mentions": 1}
+    ]
+
+
+def test_top_keywords_scoped_to_documents(index):
+    index.add_document("doc1", "a.md", ["Kafka"], ["Kafka"])
+    index.add_document("doc2", "b.md", ["Kafka", "Redis"], ["Kafka", "Redis Redis"])
+
+    assert [k["keyword"] for k in index.top_keywords()] == ["kafka", "redis"]
+    assert index.top_keywords(["doc2"], limit=1)[0]["keyword"] == "redis"
+    assert index.top_keywords([]) == []
+
+
+def test_ambiguous_forms_are_matched_only_as_written(index):
+    chunks = [
+        "Go로 작성한 API 서버",
+        "let's go live. node 3개로 구성",
+        "Node.js 런타임, config.go 파일, go-live 일정",
+    ]
+    index.add_document("doc1", "a.md", ["Go", "Node.js"], chunks)
+
+    assert index.lookup("golang")[0]["chunks"] == [0]
+    assert index.lookup("go")[0]["mentions"] == 1
+    assert index.lookup("node")[0]["chunks"] == [2]
+
+
+def test_concurrent_updates_are_all_kept(index):
+    threads = [
+        threading.Thread(
+            target=index.add_document, args=(f"doc{i}", f"{i}.md", ["Kafka"], ["Kafka"])
+        )
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert index.top_keywords()[0]["document_frequency"] == 8
+
+
+def test_imports_previous_json_index_once(tmp_path):
+    json_path = tmp_path / "keyword_index.json"
+    json_path.write_text(
+        json.dumps(
+            {
+                "keywords": {
+                    "kafka": {
+                        "name": "Kafka",
+                        "documents": {
+                            "doc1": {"file_name": "a.md", "chunks": [0, 2], "mentions": 3}
+                        },
+                    }
+                },
+                "documents": {"doc1": {"file_name": "a.md", "keywords": ["kafka"]}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    db_path = str(tmp_path / "keyword_index.sqlite3")
+
+    index = KeywordIndex(db_path, legacy_json_path=str(json_path))
+    assert index.lookup("Kafka")[0]["chunks"] == [0, 2]
+
+    index.remove_document("doc1")
+    index.add_document("doc2", "b.md", ["Redis"], ["Redis"])
+    reopened = KeywordIndex(db_path, legacy_json_path=str(json_path))
+    assert reopened.lookup("kafka") == []
+
+
+def test_json_index_path_setting_moves_to_sqlite():
+    assert _index_paths("data/keyword_index.json") == (
+        "data/keyword_index.sqlite3",
+        "data/keyword_index.json",
+    )
+    assert _index_paths("data/keywords.sqlite3") == ("data/keywords.sqlite3", "data/keywords.json")
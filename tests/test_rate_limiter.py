@@ -0,0 +1,81 @@
+# tests/test_rate_limiter.py
+import threading
+import time
+
+from rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, TokenBucketRateLimiter
+
+
+def saturate_with_background(limiter, workers=4, cost=2000):
+    """백그라운드 호출이 버킷을 계속 비우도록 스레드를 띄움"""
+    stop = threading.Event()
+
+    def work():
+        while not stop.is_set():
+            limiter.acquire(cost, PRIORITY_BACKGROUND)
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    return stop, threads
+
+
+def stop_background(limiter, stop, threads):
+    """남은 백그라운드 대기자가 빨리 끝나도록 버킷을 채우며 종료"""
+    stop.set()
+    for thread in threads:
+        while thread.is_alive():
+            limiter.release_unused(limiter.tokens_per_minute)
+            thread.join(timeout=0.05)
+
+
+def interactive_wait(limiter, cost=2000):
+    started_at = time.monotonic()
+    limiter.acquire(cost, PRIORITY_INTERACTIVE)
+    return time.monotonic() - started_at
+
+
+def run_saturated(interactive_reserve, calls=3):
+    # 초당 1,000토큰 - 대화형 2,000토큰 호출은 빈 버킷에서 2초를 기다려야 함
+    limiter = TokenBucketRateLimiter(60000, 60000, interactive_reserve)
+    stop, threads = saturate_with_background(limiter)
+    try:
+        time.sleep(0.5)
+        return [interactive_wait(limiter) for _ in range(calls)], limiter
+    finally:
+        stop_background(limiter, stop, threads)
+
+
+def test_interactive_latency_stays_bounded_while_background_is_saturated():
+    waits, limiter = run_saturated(interactive_reserve=0.2)
+
+    assert max(waits) < 0.5
+    assert limiter.get_metrics()["acquired"] > 20
+
+
+def test_background_saturation_starves_interactive_without_reserve():
+    waits, _ = run_saturated(interactive_reserve=0.0, calls=1)
+
+    assert max(waits) > 1.0
+
+
+def test_background_never_uses_reserved_share():
+    limiter = TokenBucketRateLimiter(60000, 60000, interactive_reserve=0.2)
+    stop, threads = saturate_with_background(limiter)
+    time.sleep(0.5)
+    available_tokens = limiter.get_metrics()["available_tokens"]
+    stop_background(limiter, stop, threads)
+
+    assert available_tokens >= 12000
+
+
+def test_background_cost_is_capped_below_the_reserve():
+    # 예약분을 빼면 채울 수 없는 크기의 호출도 영원히 기다리지 않음
+    limiter = TokenBucketRateLimiter(1000, 60000, interactive_reserve=0.5)
+
+    done = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (limiter.acquire(5000, PRIORITY_BACKGROUND), done.set()), daemon=True
+    )
+    thread.start()
+
+    assert done.wait(timeout=2)
@@ -0,0 +1,32 @@
+# tests/test_reranker.py
+import numpy as np
+
+from records import SearchHit
+from reranker import LexicalReranker, rerank_results
+
+
+def test_count_matrix_rows_match_texts():
+    counts = LexicalReranker()._count_matrix(["배포 절차", "abc def"])
+
+    assert counts.shape == (2, 2**12)
+    assert counts[0].sum() > 0 and counts[1].sum() > 0
+
+
+def test_count_matrix_handles_text_whose_length_changes_when_lowercased():
+    # "İ".lower()는 두 글자가 되므로 원문 길이로 행을 나누면 어긋남
+    reranker = LexicalReranker()
+    counts = reranker._count_matrix(["İİİİ abc", "def"])
+
+    np.testing.assert_array_equal(counts[1], reranker._count_matrix(["def"])[0])
+
+
+def test_rerank_results_with_non_ascii_hit():
+    results = [
+        SearchHit(f"doc_a_chunk_{i}", "a.txt", 1.0 - i * 0.1, content=content)
+        for i, content in enumerate(["İİ 배포 가이드", "배포 절차 정리", "무관한 내용"])
+    ]
+
+    reranked = rerank_results("배포 절차", results, top_n=2)
+
+    assert len(reranked) == 2
+    assert reranked[0].storage_path == "doc_a_chunk_1"
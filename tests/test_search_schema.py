@@ -0,0 +1,62 @@
+# tests/test_search_schema.py
+import asyncio
+import uuid
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from async_document_processor import AsyncDocumentProcessor
+from search_schema import (
+    SCHEMA_COMPACT,
+    SCHEMA_LEGACY,
+    build_search_filter,
+    chunk_count,
+    chunk_key,
+)
+
+
+@pytest.mark.parametrize("length", [0, 1, 1500, 1501, 2850, 2851, 4200, 4201, 10000])
+def test_chunk_count_matches_chunk_text(length):
+    chunks = AsyncDocumentProcessor().chunk_text("a" * length)
+
+    assert chunk_count(length) == len(chunks)
+
+
+def test_legacy_scope_uses_chunk_keys_not_file_names():
+    # 같은 파일명의 다른 문서가 섞이지 않도록 문서 ID 기반 키로 한정
+    document_id = str(uuid.uuid4())
+
+    search_filter = build_search_filter(SCHEMA_LEGACY, [document_id], chunk_counts=[2])
+
+    assert search_filter == (
+        "search.in(metadata_storage_path, "
+        f"'{chunk_key(document_id, 0)}|{chunk_key(document_id, 1)}', '|')"
+    )
+
+
+def test_legacy_scope_requires_chunk_counts():
+    with pytest.raises(ValueError):
+        build_search_filter(SCHEMA_LEGACY, [str(uuid.uuid4())])
+
+
+def test_compact_scope_uses_document_id():
+    assert build_search_filter(SCHEMA_COMPACT, ["a", "b"]) == "search.in(document_id, 'a|b', '|')"
+
+
+class NotFilterableSearchClient:
+    async def search(self, **kwargs):
+        raise HttpResponseError(
+            message="Invalid expression: 'metadata_storage_path' is not a filterable field."
+        )
+
+
+def test_search_fails_clearly_when_scope_field_is_not_filterable():
+    processor = AsyncDocumentProcessor()
+    processor._search_client = NotFilterableSearchClient()
+
+    result = asyncio.run(
+        processor.search_documents("배포", search_filter="metadata_storage_path eq 'x'")
+    )
+
+    assert not result["success"]
+    assert "filterable" in result["error"] and "검색 범위를 적용할 수 없습니다" in result["error"]